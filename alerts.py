@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Alert Pipeline
+Deduplicates, debounces and groups threat-log changes, then dispatches them to sinks off-thread
+"""
+
+import os
+import shutil
+import socket
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+import threats
+
+PENDING_SECONDS = 10        # a condition must hold this long before it notifies
+CLEAR_SECONDS = 30          # ...and stay clear this long before its resolve notifies
+GROUP_SECONDS = 10          # notifications from one source within this window go out together
+FLAP_WINDOW = 600
+FLAP_TRANSITIONS = 6        # state changes within FLAP_WINDOW that mark an alert as flapping
+REPEAT_SECONDS = 4 * 3600   # still-firing alerts are re-sent this often
+STALE_SECONDS = threats.ACTIVE_WINDOW   # a condition nobody re-reported for this long is over
+MAX_ALERTS = 5000           # tracked fingerprints; resolved ones are forgotten first
+TICK_SECONDS = 1.0
+
+SINK_QUEUE = 256            # batches waiting per sink; past this the oldest is dropped
+MAX_ATTEMPTS = 5
+RETRY_BASE = 1.0            # seconds, doubled per attempt
+RETRY_MAX = 60.0
+SINK_TIMEOUT = 5.0
+
+PENDING, FIRING, CLEARING, RESOLVED = "pending", "firing", "clearing", "resolved"
+
+# RFC 5424 severities, facility "user"
+_SYSLOG_SEVERITY = {'CRITICAL': 2, 'HIGH': 3, 'MEDIUM': 4, 'LOW': 5}
+_SYSLOG_FACILITY = 1
+
+
+class Alert:
+    """Pipeline state for one fingerprint (the threat log key)"""
+
+    __slots__ = ("fingerprint", "source", "severity", "title", "detail", "count", "last_seen", "condition",
+                 "state", "since", "notified", "notified_at", "transitions", "flapping")
+
+    def __init__(self, event, now: float):
+        self.fingerprint = event.key
+        self.source = event.source
+        self.severity = event.severity
+        self.title = event.title
+        self.detail = event.detail
+        self.count = 1
+        self.last_seen = now
+        self.condition = True               # the detector's latest word
+        self.state = PENDING
+        self.since = now                    # when the current state was entered
+        self.notified = False               # the last notification sent said "firing"
+        self.notified_at = 0.0
+        self.transitions: Deque[float] = deque()
+        self.flapping = False
+
+    def notification(self, status: str, now: float) -> Dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'status': status,
+            'severity': self.severity,
+            'source': self.source,
+            'title': self.title,
+            'detail': self.detail,
+            'count': self.count,
+            'since': round(self.since, 3),
+            'time': round(now, 3),
+        }
+
+
+# === SINKS ===
+
+class Sink:
+    """Delivers batches on its own thread with retries; submit() never blocks the caller"""
+
+    kind = "sink"
+
+    def __init__(self, target: str = ""):
+        self.target = target
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.last_error = ""
+        self._queue: Deque[Dict] = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f"securenet-alerts-{self.kind}", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: Dict):
+        with self._cond:
+            if len(self._queue) >= SINK_QUEUE:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(batch)
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    @property
+    def backlog(self) -> int:
+        return len(self._queue)
+
+    def deliver(self, batch: Dict):
+        """Send one batch; raise on failure to have it retried"""
+        raise NotImplementedError
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                batch = self._queue.popleft()
+            for attempt in range(MAX_ATTEMPTS):
+                try:
+                    self.deliver(batch)
+                    self.sent += 1
+                    break
+                except Exception as e:
+                    self.last_error = str(e) or type(e).__name__
+                    if attempt == MAX_ATTEMPTS - 1:
+                        self.failed += 1
+                        print(f"Alert sink error ({self.kind}): {self.last_error}")
+                        break
+                    self.retries += 1
+                    with self._cond:
+                        self._cond.wait_for(lambda: self._stopped, min(RETRY_MAX, RETRY_BASE * 2 ** attempt))
+                        if self._stopped:
+                            return
+
+
+class FileSink(Sink):
+    """Appends each batch as one JSON line"""
+
+    kind = "file"
+
+    def deliver(self, batch: Dict):
+        import json
+        directory = os.path.dirname(os.path.abspath(self.target))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.target, "a", encoding="utf-8") as f:
+            f.write(json.dumps(batch, separators=(",", ":")) + "\n")
+
+
+class WebhookSink(Sink):
+    """POSTs each batch as JSON; any non-2xx answer is retried"""
+
+    kind = "webhook"
+
+    def deliver(self, batch: Dict):
+        import json
+        import urllib.request       # pulls in http.client, email and ssl; sinks run off the GUI thread
+        request = urllib.request.Request(
+            self.target, data=json.dumps(batch).encode("utf-8"), method="POST",
+            headers={'Content-Type': "application/json", 'User-Agent': "SecureNet-Monitor"}
+        )
+        with urllib.request.urlopen(request, timeout=SINK_TIMEOUT) as response:
+            if not 200 <= response.status < 300:
+                raise OSError(f"HTTP {response.status}")
+
+
+class SyslogSink(Sink):
+    """One RFC 3164 datagram per alert, to /dev/log or host:port over UDP"""
+
+    kind = "syslog"
+
+    def deliver(self, batch: Dict):
+        if self.target.startswith("/"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            address = self.target
+        else:
+            host, _, port = self.target.rpartition(":")
+            if not host:
+                host, port = port, ""
+            sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_DGRAM)
+            address = (host.strip("[]"), int(port or 514))
+        with sock:
+            sock.settimeout(SINK_TIMEOUT)
+            for alert in batch['alerts']:
+                severity = 6 if alert['status'] == RESOLVED else _SYSLOG_SEVERITY.get(alert['severity'], 5)
+                message = (f"<{_SYSLOG_FACILITY * 8 + severity}>securenet[{os.getpid()}]: "
+                           f"{alert['status'].upper()} {alert['severity']} {alert['title']}")
+                if alert['detail']:
+                    message += f" - {alert['detail']}"
+                sock.sendto(message.encode("utf-8", "replace")[:2048], address)
+
+
+class DesktopSink(Sink):
+    """Desktop notifications through notify-send"""
+
+    kind = "desktop"
+
+    def deliver(self, batch: Dict):
+        import subprocess
+        command = shutil.which("notify-send")
+        if command is None:
+            raise OSError("notify-send not found")
+        alerts = batch['alerts']
+        urgent = any(a['severity'] in ("HIGH", "CRITICAL") and a['status'] != RESOLVED for a in alerts)
+        summary = alerts[0]['title'] if len(alerts) == 1 else f"{len(alerts)} {batch['group']} alerts"
+        body = "\n".join(f"{a['status']}: {a['title']}" for a in alerts[:10])
+        subprocess.run([command, "-a", "SecureNet Monitor", "-u", "critical" if urgent else "normal",
+                        summary, body], check=True, timeout=SINK_TIMEOUT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+SINK_TYPES = {cls.kind: cls for cls in (FileSink, WebhookSink, SyslogSink, DesktopSink)}
+
+
+def parse_sink(spec: str) -> Sink:
+    """'file:PATH', 'webhook:URL', 'syslog[:HOST:PORT]' or 'desktop'"""
+    kind, _, target = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind not in SINK_TYPES:
+        raise ValueError(f"unknown alert sink {spec!r}")
+    if kind in ("file", "webhook") and not target:
+        raise ValueError(f"alert sink {spec!r} needs a target")
+    if kind == "syslog" and not target:
+        target = "/dev/log"
+    return SINK_TYPES[kind](target)
+
+
+def build_sinks(specs: Iterable[str]) -> List[Sink]:
+    sinks = []
+    for spec in specs:
+        try:
+            sinks.append(parse_sink(spec))
+        except ValueError as e:
+            print(f"Alert config error: {e}")
+    return sinks
+
+
+# === PIPELINE ===
+
+class AlertPipeline:
+    """Turns threat-log reports and resolves into notifications.
+
+    observe()/clear() are called from collector threads and only update a dict;
+    debouncing, flap detection, grouping and dispatch run on the pipeline's own thread.
+    """
+
+    def __init__(self, sinks: Iterable[Sink] = (), pending_seconds: float = PENDING_SECONDS,
+                 clear_seconds: float = CLEAR_SECONDS, group_seconds: float = GROUP_SECONDS,
+                 flap_transitions: int = FLAP_TRANSITIONS):
+        self.sinks = list(sinks)
+        self.pending_seconds = pending_seconds
+        self.clear_seconds = clear_seconds
+        self.group_seconds = group_seconds
+        self.flap_transitions = flap_transitions
+        self.alerts: Dict[str, Alert] = {}
+        self.groups: Dict[str, List[Dict]] = {}
+        self.group_opened: Dict[str, float] = {}
+        self.alert_count = 0                # firing notifications sent
+        self.suppressed = 0                 # notifications held back while flapping
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, settings: Dict, sinks: Optional[List[Sink]] = None):
+        """Apply the 'alerts' config section, and replace the sinks if given"""
+        self.pending_seconds = float(settings.get('pending_seconds', PENDING_SECONDS))
+        self.clear_seconds = float(settings.get('clear_seconds', CLEAR_SECONDS))
+        self.group_seconds = float(settings.get('group_seconds', GROUP_SECONDS))
+        self.flap_transitions = int(settings.get('flap_transitions', FLAP_TRANSITIONS))
+        if sinks is not None:
+            old, self.sinks = self.sinks, sinks
+            for sink in old:
+                sink.stop()
+
+    # === INPUT (any thread) ===
+
+    def observe(self, event, now: Optional[float] = None):
+        """A detector (re)reported a condition"""
+        now = now or time.time()
+        with self._lock:
+            alert = self.alerts.get(event.key)
+            if alert is None:
+                self.alerts[event.key] = Alert(event, now)
+                return
+            alert.severity = event.severity
+            alert.title = event.title
+            alert.detail = event.detail
+            alert.count += 1
+            alert.last_seen = now
+            if alert.condition:
+                return
+            alert.condition = True
+            alert.transitions.append(now)
+            if alert.state == CLEARING:
+                # Came back before the clear delay ran out: nothing was sent, nothing to send
+                alert.state = FIRING
+                alert.since = now
+            elif alert.state == RESOLVED:
+                alert.state = PENDING
+                alert.since = now
+
+    def clear(self, key: str, now: Optional[float] = None):
+        """A detector reported the condition gone"""
+        now = now or time.time()
+        with self._lock:
+            alert = self.alerts.get(key)
+            if alert is None or not alert.condition:
+                return
+            alert.condition = False
+            alert.transitions.append(now)
+            if alert.state == PENDING:
+                alert.state = RESOLVED      # cleared before it was ever announced
+                alert.since = now
+            elif alert.state == FIRING:
+                alert.state = CLEARING
+                alert.since = now
+
+    # === EVALUATION (pipeline thread) ===
+
+    def tick(self, now: Optional[float] = None):
+        """Advance timers, emit notifications and flush due groups"""
+        now = now or time.time()
+        emitted: List[Dict] = []
+        with self._lock:
+            flap_cutoff = now - FLAP_WINDOW
+            forget = []
+            for key, alert in self.alerts.items():
+                transitions = alert.transitions
+                while transitions and transitions[0] < flap_cutoff:
+                    transitions.popleft()
+                status = self._advance(alert, now)
+                if status is not None:
+                    emitted.append(alert.notification(status, now))
+                if alert.state == RESOLVED and not transitions and now - alert.since > FLAP_WINDOW:
+                    forget.append(key)
+            for key in forget:
+                del self.alerts[key]
+            if len(self.alerts) > MAX_ALERTS:
+                resolved = sorted((a.since, k) for k, a in self.alerts.items() if a.state == RESOLVED)
+                for _since, key in resolved[:len(self.alerts) - MAX_ALERTS]:
+                    del self.alerts[key]
+        for notification in emitted:
+            group = notification['source']
+            if group not in self.groups:
+                self.groups[group] = []
+                self.group_opened[group] = now
+            self.groups[group].append(notification)
+        for group in [g for g, opened in self.group_opened.items() if now - opened >= self.group_seconds]:
+            self._dispatch(group, self.groups.pop(group), now)
+            del self.group_opened[group]
+
+    def next_due(self) -> Optional[float]:
+        """Earliest time a tick() could change anything (replay skips ahead to it)"""
+        times = []
+        with self._lock:
+            for alert in self.alerts.values():
+                if alert.state == PENDING:
+                    times.append(alert.since + self.pending_seconds)
+                elif alert.state == CLEARING:
+                    times.append(alert.since + self.clear_seconds)
+                elif alert.state == FIRING and alert.notified:
+                    times.append(alert.notified_at + REPEAT_SECONDS)
+                elif alert.state == RESOLVED and not alert.transitions:
+                    times.append(alert.since + FLAP_WINDOW)
+                if alert.condition:
+                    times.append(alert.last_seen + STALE_SECONDS)
+                if alert.transitions:
+                    times.append(alert.transitions[0] + FLAP_WINDOW)
+            times.extend(opened + self.group_seconds for opened in self.group_opened.values())
+        return min(times) if times else None
+
+    def _advance(self, alert: Alert, now: float) -> Optional[str]:
+        """Move one alert along its state machine; the notification status to send, if any"""
+        flapping = len(alert.transitions) >= self.flap_transitions
+        if not flapping and alert.flapping and len(alert.transitions) >= self.flap_transitions // 2:
+            flapping = True     # hysteresis: leave the flapping state only once it has calmed down
+        if alert.condition and now - alert.last_seen > STALE_SECONDS:
+            # One-shot detections (a brute-force burst) are never resolved by their detector
+            alert.condition = False
+            alert.state = CLEARING
+            alert.since = now - self.clear_seconds
+        changed = False
+        if alert.state == PENDING and now - alert.since >= self.pending_seconds:
+            alert.state = FIRING
+            alert.since = now
+            changed = True
+        elif alert.state == CLEARING and now - alert.since >= self.clear_seconds:
+            alert.state = RESOLVED
+            alert.since = now
+            changed = True
+
+        if flapping != alert.flapping:
+            alert.flapping = flapping
+            if flapping:
+                return "flapping"
+            # Calmed down: receivers were last told it flaps, so always say how it settled
+            alert.notified = alert.state in (FIRING, CLEARING)
+            alert.notified_at = now
+            return FIRING if alert.notified else RESOLVED
+        if alert.flapping:
+            self.suppressed += changed
+            return None
+        if alert.state == FIRING and (not alert.notified or now - alert.notified_at >= REPEAT_SECONDS):
+            alert.notified = True
+            alert.notified_at = now
+            return FIRING
+        if alert.state == RESOLVED and alert.notified:
+            alert.notified = False
+            return RESOLVED
+        return None
+
+    def _dispatch(self, group: str, notifications: List[Dict], now: float):
+        self.alert_count += sum(1 for n in notifications if n['status'] == FIRING)
+        batch = {'group': group, 'alerts': notifications, 'sent_at': round(now, 3)}
+        for sink in self.sinks:
+            sink.submit(batch)
+
+    # === LIFECYCLE ===
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="securenet-alerts", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for sink in self.sinks:
+            sink.stop()
+
+    def _run(self):
+        while not self._stop.wait(TICK_SECONDS):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Alert pipeline error: {e}")
+
+    # === VIEWS ===
+
+    def active(self) -> List[Alert]:
+        with self._lock:
+            return [a for a in self.alerts.values() if a.state in (FIRING, CLEARING)]
+
+    def format_table(self) -> str:
+        """Pipeline status block for the threat view"""
+        with self._lock:
+            states: Dict[str, int] = {}
+            for alert in self.alerts.values():
+                states[alert.state] = states.get(alert.state, 0) + 1
+            flapping = [a.title for a in self.alerts.values() if a.flapping]
+        lines = [
+            f"Alerts: {self.alert_count} sent | {states.get(FIRING, 0)} firing, {states.get(PENDING, 0)} pending, "
+            f"{states.get(CLEARING, 0)} clearing | {self.suppressed} suppressed while flapping"
+        ]
+        if flapping:
+            lines.append(f"  Flapping: {', '.join(flapping[:5])}{' ...' if len(flapping) > 5 else ''}")
+        if not self.sinks:
+            lines.append("  No alert sinks configured (alert_sinks)")
+        for sink in self.sinks:
+            error = f"  last error: {sink.last_error}" if sink.failed or sink.backlog else ""
+            lines.append(f"  {sink.kind:<8} {sink.target[:40]:<40} sent {sink.sent:>5}  queued {sink.backlog:>3}  "
+                         f"failed {sink.failed:>3}  dropped {sink.dropped:>3}{error}")
+        return "\n".join(lines)
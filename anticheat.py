@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Anti-Cheat Scanner
+Incremental process and memory-map inspection driven by process start/exit events
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+import procevents
+
+# Memory editors, debuggers and instrumentation frameworks (comm is cut at 15 chars)
+TOOL_PATTERN = re.compile(
+    r"^(cheatengine|scanmem|gameconqueror|pince|artmoney|x64dbg|x32dbg|ollydbg|"
+    r"frida|frida-server|gdb|lldb|ida|ida64|ghidra|ghidrarun)([-._ ].*)?$"
+)
+FEED_LENGTH = 200
+SCAN_BUDGET_MS = 5.0        # CPU time one scan() pass may spend before yielding
+
+# Shared objects loaded from here are expected; so is anything next to the executable
+TRUSTED_LIB_DIRS = ("/lib/", "/lib32/", "/lib64/", "/usr/lib/", "/usr/lib32/", "/usr/lib64/",
+                    "/usr/local/lib/", "/opt/", "/snap/", "/nix/store/", "/gnu/store/")
+UNTRUSTED_DIRS = ("/tmp/", "/dev/shm/", "/var/tmp/", "/run/user/")
+
+
+class ProcInfo:
+    """What the scanner knows about one live process"""
+
+    __slots__ = ("pid", "name", "exe", "started", "tool", "watched")
+
+    def __init__(self, pid: int, name: str, exe: str):
+        self.pid = pid
+        self.name = name
+        self.exe = exe
+        self.started = time.time()
+        self.tool = ""
+        self.watched = False
+
+
+def _read_status_field(pid: int, field: str) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith(field):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return None
+
+
+def _is_shared_object(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.endswith(".so") or ".so." in name
+
+
+class Mapping:
+    """One executable or writable+executable region from /proc/<pid>/maps"""
+
+    __slots__ = ("start", "end", "perms", "path")
+
+    def __init__(self, start: int, end: int, perms: str, path: str):
+        self.start = start
+        self.end = end
+        self.perms = perms
+        self.path = path
+
+
+def parse_maps(raw: bytes) -> List[Mapping]:
+    """Executable mappings only; data and read-only regions are not interesting here"""
+    mappings = []
+    for line in raw.decode("utf-8", "replace").splitlines():
+        parts = line.split(None, 5)
+        if len(parts) < 5 or "x" not in parts[1]:
+            continue
+        start, _, end = parts[0].partition("-")
+        path = parts[5] if len(parts) == 6 else ""
+        mappings.append(Mapping(int(start, 16), int(end, 16), parts[1], path))
+    return mappings
+
+
+class MapsState:
+    """Cached parse of one process's maps; raw bytes decide whether to re-parse"""
+
+    __slots__ = ("raw", "modules", "rwx", "flagged", "parses", "hits", "baseline")
+
+    def __init__(self):
+        self.raw = b""
+        self.modules: frozenset = frozenset()
+        self.rwx: List[Mapping] = []
+        self.flagged: set = set()       # threat keys raised for this pid
+        self.parses = 0
+        self.hits = 0
+        self.baseline: Optional[frozenset] = None
+
+
+def _preloads(pid: int) -> List[str]:
+    try:
+        with open(f"/proc/{pid}/environ", "rb") as f:
+            for item in f.read().split(b"\0"):
+                if item.startswith(b"LD_PRELOAD="):
+                    return [p for p in re.split(r"[\s:]+", item[11:].decode(errors="replace")) if p]
+    except OSError:
+        pass
+    return []
+
+
+class AntiCheatScanner:
+    """Keeps a process table up to date from events and reports cheat indicators"""
+
+    def __init__(self, threats, watch: Iterable[str] = ()):
+        self.threats = threats
+        self.watch = {name.lower() for name in watch}
+        self.processes: Dict[int, ProcInfo] = {}
+        self.feed = deque(maxlen=FEED_LENGTH)
+        self.execs = 0
+        self.exits = 0
+        self.maps: Dict[int, MapsState] = {}
+        self.budget_ms = SCAN_BUDGET_MS
+        self.last_scan_ms = 0.0
+        self.deferred = 0
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def set_watch(self, names: Iterable[str]):
+        """Replace the protected process names and re-evaluate live processes"""
+        with self._lock:
+            self.watch = {name.lower() for name in names}
+            infos = list(self.processes.values())
+        for info in infos:
+            info.watched = self._is_watched(info)
+
+    def _is_watched(self, info: ProcInfo) -> bool:
+        return info.name.lower() in self.watch or os.path.basename(info.exe).lower() in self.watch
+
+    # === EVENTS ===
+
+    def bootstrap(self):
+        """Rebuild the table from /proc (startup, or after the event feed overflowed)"""
+        current = procevents.list_pids()
+        with self._lock:
+            known = set(self.processes)
+        for pid in known - current:
+            self._exited(pid, log=False)
+        for pid in current - known:
+            name, exe = procevents.describe(pid)
+            if name:
+                self._started(ProcInfo(pid, name, exe), log=False)
+
+    def handle(self, event: procevents.ProcEvent):
+        """Apply one exec/exit event"""
+        if event.kind == "exec":
+            self.execs += 1
+            if not event.name:
+                return      # already gone; nothing left to inspect
+            self._started(ProcInfo(event.pid, event.name, event.exe), log=True)
+        elif event.kind == "exit":
+            self.exits += 1
+            self._exited(event.pid, log=True)
+
+    def _started(self, info: ProcInfo, log: bool):
+        # exec replaces the program of an existing pid
+        if info.pid in self.processes:
+            self._exited(info.pid, log=False)
+        match = TOOL_PATTERN.match(info.name.lower()) or TOOL_PATTERN.match(os.path.basename(info.exe).lower())
+        if match:
+            info.tool = match.group(1)
+        info.watched = self._is_watched(info)
+        with self._lock:
+            self.processes[info.pid] = info
+            if log:
+                self.feed.append((info.started, f"exec  {info.pid:>7}  {info.name}"))
+        if info.tool:
+            self.threats.report("anticheat", "HIGH", f"Cheat tool running: {info.name}",
+                                f"pid {info.pid} {info.exe}", key=f"anticheat:tool:{info.tool}")
+            self._log(f"FLAG  {info.pid:>7}  {info.name}: known cheat/debug tool")
+        if info.watched:
+            self._log(f"WATCH {info.pid:>7}  {info.name} started")
+            self.inspect_watched(info)
+
+    def _exited(self, pid: int, log: bool):
+        with self._lock:
+            info = self.processes.pop(pid, None)
+            if info is None:
+                return
+            still_running = info.tool and any(p.tool == info.tool for p in self.processes.values())
+        if info.tool and not still_running:
+            self.threats.resolve(f"anticheat:tool:{info.tool}")
+        if info.watched:
+            self.threats.resolve(f"anticheat:traced:{info.pid}")
+            self.threats.resolve(f"anticheat:preload:{info.pid}")
+        state = self.maps.pop(pid, None)
+        if state is not None:
+            for key in state.flagged:
+                self.threats.resolve(key)
+        if log and (info.tool or info.watched):
+            self._log(f"exit  {pid:>7}  {info.name}")
+
+    def _log(self, text: str):
+        with self._lock:
+            self.feed.append((time.time(), text))
+
+    # === INSPECTION ===
+
+    def inspect_watched(self, info: ProcInfo):
+        """Checks for a protected process: debugger attached, libraries preloaded"""
+        tracer = _read_status_field(info.pid, "TracerPid")
+        if tracer and tracer != "0":
+            name, _ = procevents.describe(int(tracer))
+            self.threats.report("anticheat", "HIGH", f"Debugger attached to {info.name}",
+                                f"pid {info.pid} traced by {tracer} ({name or '?'})",
+                                key=f"anticheat:traced:{info.pid}")
+        else:
+            self.threats.resolve(f"anticheat:traced:{info.pid}")
+        preloads = _preloads(info.pid)
+        if preloads:
+            self.threats.report("anticheat", "HIGH", f"Library preloaded into {info.name}",
+                                ", ".join(preloads), key=f"anticheat:preload:{info.pid}")
+
+    def scan_maps(self, info: ProcInfo) -> bool:
+        """Check a watched process's executable mappings; False if the cache was current"""
+        try:
+            with open(f"/proc/{info.pid}/maps", "rb") as f:
+                raw = f.read()
+        except OSError:
+            return False
+        state = self.maps.get(info.pid)
+        if state is None:
+            state = self.maps[info.pid] = MapsState()
+        # procfs reports size 0, so compare the content itself (a memcmp) before parsing
+        if raw == state.raw:
+            state.hits += 1
+            return False
+        state.raw = raw
+        state.parses += 1
+        mappings = parse_maps(raw)
+        # /dev/zero and /SYSV* are anonymous shared memory, not modules
+        state.modules = frozenset(m.path for m in mappings if m.path.startswith("/")
+                                  and not m.path.startswith(("/dev/", "/SYSV")))
+        state.rwx = [m for m in mappings if "w" in m.perms]
+        if state.baseline is None:
+            state.baseline = state.modules
+
+        exe_dir = os.path.dirname(info.exe) + "/" if info.exe else None
+        for path in state.modules:
+            if path == info.exe:
+                continue
+            reason = self._module_reason(path, exe_dir, path in state.baseline)
+            key = f"anticheat:module:{info.pid}:{path}"
+            if reason:
+                if key not in state.flagged:
+                    state.flagged.add(key)
+                    self._log(f"FLAG  {info.pid:>7}  {info.name}: {reason} {path}")
+                self.threats.report("anticheat", "HIGH", f"Unexpected module in {info.name}",
+                                    f"{reason}: {path}", key=key)
+        for key in [k for k in state.flagged if k.startswith(f"anticheat:module:{info.pid}:")]:
+            if key.split(":", 3)[3] not in state.modules:
+                state.flagged.discard(key)
+                self.threats.resolve(key)
+
+        key = f"anticheat:rwx:{info.pid}"
+        if state.rwx:
+            first = state.rwx[0]
+            self.threats.report("anticheat", "MEDIUM", f"Writable+executable memory in {info.name}",
+                                f"{len(state.rwx)} region(s), e.g. {first.start:x}-{first.end:x} "
+                                f"{first.path or '[anon]'}", key=key)
+            state.flagged.add(key)
+        elif key in state.flagged:
+            state.flagged.discard(key)
+            self.threats.resolve(key)
+        return True
+
+    @staticmethod
+    def _module_reason(path: str, exe_dir: Optional[str], in_baseline: bool) -> str:
+        # The kernel shows these as "/memfd:NAME (deleted)"; flagged even when present from the start
+        if path.startswith("/memfd:"):
+            return "executable memfd"
+        # Libraries replaced by a package upgrade show up as deleted in long-running processes
+        if path.endswith(" (deleted)") and not in_baseline:
+            return "deleted file"
+        if path.startswith(UNTRUSTED_DIRS):
+            return "loaded from a temporary directory"
+        if not _is_shared_object(path) or path.startswith(TRUSTED_LIB_DIRS):
+            return ""
+        if exe_dir and path.startswith(exe_dir):
+            return ""
+        # Unusual locations are tolerated if present from the start (bundled runtimes)
+        return "" if in_baseline else "loaded after start from outside the system library paths"
+
+    def scan(self):
+        """Periodic pass over watched processes (attach is not an exec event), within a CPU budget"""
+        start = time.process_time()
+        with self._lock:
+            watched = sorted(p.pid for p in self.processes.values() if p.watched)
+            infos = {p.pid: p for p in self.processes.values() if p.watched}
+        if not watched:
+            self.last_scan_ms = 0.0
+            return
+        # Round-robin from where the last pass ran out of budget
+        order = [pid for pid in watched if pid >= self._cursor] + [pid for pid in watched if pid < self._cursor]
+        for done, pid in enumerate(order):
+            if (time.process_time() - start) * 1000 > self.budget_ms:
+                self._cursor = pid
+                self.deferred += len(order) - done
+                break
+            info = infos[pid]
+            self.inspect_watched(info)
+            self.scan_maps(info)
+        else:
+            self._cursor = 0
+        self.last_scan_ms = (time.process_time() - start) * 1000
+
+    # === REPORTING ===
+
+    def format_view(self, mode: str = "", events_seen: int = 0, limit: int = 40) -> str:
+        """Live text for the Anti-Cheat view"""
+        with self._lock:
+            tools = [p for p in self.processes.values() if p.tool]
+            watched = [p for p in self.processes.values() if p.watched]
+            feed = list(self.feed)[-limit:]
+            total = len(self.processes)
+        lines = [
+            f"Process feed: {mode or 'stopped'} | {total} processes tracked | "
+            f"{self.execs} exec / {self.exits} exit events",
+            "",
+            f"Protected processes ({', '.join(sorted(self.watch)) or 'none configured'}):",
+        ]
+        for p in watched:
+            lines.append(f"  {p.pid:>7}  {p.name}  {p.exe}")
+            state = self.maps.get(p.pid)
+            if state is not None:
+                lines.append(f"           {len(state.modules)} executable modules, {len(state.rwx)} RWX regions, "
+                             f"maps parsed {state.parses}x / unchanged {state.hits}x")
+        if not watched:
+            lines.append("  (not running)")
+        else:
+            lines.append(f"  last scan {self.last_scan_ms:.2f} ms CPU (budget {self.budget_ms:.0f} ms), "
+                         f"{self.deferred} checks deferred")
+        lines.append("")
+        lines.append("Cheat / debug tools running:")
+        lines.extend(f"  {p.pid:>7}  {p.name}  {p.exe}" for p in tools)
+        if not tools:
+            lines.append("  none")
+        lines.append("")
+        lines.append("Recent activity:")
+        for ts, text in reversed(feed):
+            lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(ts))}  {text}")
+        return "\n".join(lines)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Mocked Widget Layer
+Stand-in for customtkinter so UI flush cost can be measured without a display
+"""
+
+import sys
+import types
+from collections import deque
+
+
+class _FakeBase:
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        self._children = []
+        self._alive = True
+        if args and isinstance(args[0], _FakeBase):
+            args[0]._children.append(self)
+
+    def _noop(self, *args, **kwargs):
+        _FakeBase.calls += 1
+
+    configure = pack = grid = _noop
+    grid_columnconfigure = grid_rowconfigure = _noop
+
+    def winfo_children(self):
+        return list(self._children)
+
+    def winfo_exists(self):
+        return self._alive
+
+    def destroy(self):
+        self._alive = False
+        self._children = []
+
+
+class FakeWidget(_FakeBase):
+    """Accepts any widget call and counts it"""
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._noop
+
+
+class FakeCTk(_FakeBase):
+    """Root window whose after() queue is drained explicitly by the benchmark
+
+    Unlike child widgets it has no catch-all attributes, so the app's
+    hasattr() checks behave as they do under real Tk.
+    """
+
+    title = geometry = minsize = _FakeBase._noop
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.pending = deque()
+
+    def after(self, ms, func=None, *args):
+        if func is not None and ms == 0:
+            self.pending.append((func, args))
+        return "after#0"
+
+    def drain(self, limit: int = 10000) -> int:
+        """Run queued after(0, ...) callbacks, returning how many ran"""
+        ran = 0
+        while self.pending and ran < limit:
+            func, args = self.pending.popleft()
+            func(*args)
+            ran += 1
+        return ran
+
+    def mainloop(self):
+        pass
+
+
+class FakeVar:
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+def install():
+    """Register a fake customtkinter module; must run before importing main"""
+    module = types.ModuleType("customtkinter")
+    module.CTk = FakeCTk
+    for name in ("CTkFrame", "CTkLabel", "CTkButton", "CTkProgressBar", "CTkScrollableFrame",
+                 "CTkTextbox", "CTkCheckBox", "CTkSlider", "CTkEntry", "CTkOptionMenu"):
+        setattr(module, name, type(name, (FakeWidget,), {}))
+    module.BooleanVar = FakeVar
+    module.StringVar = FakeVar
+    module.IntVar = FakeVar
+    module.set_appearance_mode = lambda *a, **k: None
+    module.set_default_color_theme = lambda *a, **k: None
+    sys.modules["customtkinter"] = module
+    return module
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Benchmark Suite
+Offline benchmarks for collectors, probes, UI flushes and long-run memory
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json   # exit 1 on regression
+    xvfb-run python benchmarks/run_benchmarks.py --widgets tk    # real Tk widgets
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from stub_servers import StubHTTPServer, StubTCPServer  # noqa: E402
+
+
+class SyntheticPsutil:
+    """Deterministic psutil stand-in for the simulated long run"""
+
+    class _Usage:
+        def __init__(self, percent):
+            self.percent = percent
+
+    def __init__(self):
+        self._tick = 0
+
+    def cpu_percent(self, interval=None):
+        self._tick += 1
+        return 20.0 + (self._tick * 7919 % 400) / 10
+
+    def virtual_memory(self):
+        return self._Usage(55.0 + (self._tick % 50) / 10)
+
+    def disk_usage(self, path):
+        return self._Usage(61.2)
+
+
+def _timeit(func: Callable, repeat: int) -> Dict[str, float]:
+    """Run func repeat times, returning wall/CPU stats in milliseconds"""
+    walls, cpus = [], []
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        func()
+        walls.append((time.perf_counter() - wall) * 1000)
+        cpus.append((time.process_time() - cpu) * 1000)
+    walls.sort()
+    return {
+        'min': round(walls[0], 4),
+        'median': round(statistics.median(walls), 4),
+        'p90': round(walls[min(len(walls) - 1, int(len(walls) * 0.9))], 4),
+        'max': round(walls[-1], 4),
+        'cpu_median': round(statistics.median(cpus), 4),
+        'runs': repeat,
+    }
+
+
+class BenchmarkRun:
+    """Owns the stub servers, the app instance and the collected results"""
+
+    def __init__(self, widgets: str):
+        self.widgets = widgets
+        self.results: List[Dict[str, object]] = []
+        self.http = StubHTTPServer().start()
+        self.tcp = StubTCPServer().start()
+
+        if widgets == "mock":
+            import fake_widgets
+            fake_widgets.install()
+        import main as app_module
+        self.app_module = app_module
+
+        # Point probes at the local stubs and keep the background loop off
+        app_module.IP_INTEL_URL = self.http.ip_intel_url
+        app_module.INTERNET_CHECK_ADDR = self.tcp.address
+        app_module.SecureNetMonitor.start_monitoring_thread = lambda self: None
+
+        self.app = app_module.SecureNetMonitor()
+        self.app.monitored_sites = [
+            {'url': self.http.site_url(i), 'name': f"Site {i}", 'status': 'Unknown'}
+            for i in range(3)
+        ]
+        self.app.switch_view("dashboard")
+        # Probes run inline so each measurement covers the whole probe
+        self.app.run_in_background = lambda section, target: target()
+
+    def close(self):
+        self.http.stop()
+        self.tcp.stop()
+
+    def drain(self):
+        """Process pending UI callbacks"""
+        if self.widgets == "mock":
+            self.app.drain()
+        else:
+            self.app.update()
+
+    def add(self, name: str, unit: str, value: float, better: str = "lower", **extra):
+        self.results.append({'name': name, 'unit': unit, 'value': round(value, 4), 'better': better, **extra})
+        print(f"  {name:<40} {value:>12.3f} {unit}", file=sys.stderr)
+
+    # === BENCHMARKS ===
+
+    def bench_collection(self, repeat: int):
+        app = self.app
+        stats = _timeit(lambda: app.update_all_data(), repeat)
+        self.add("collect.update_all_data.wall", "ms", stats['median'], **stats)
+        self.add("collect.update_all_data.cpu", "ms", stats['cpu_median'])
+        self.drain()
+
+        encoded = app.encode_history()
+        samples = len(app.history_data['cpu'])
+        size = sum(len(v) for k, v in encoded.items() if k in ('cpu', 'memory'))
+        if samples:
+            self.add("collect.wire_bytes_per_sample", "bytes", size / (2 * samples))
+
+    def bench_ui(self, repeat: int):
+        app = self.app
+        app.stats['total_scans'] = 1   # keep periodic probes out of the flush
+        stats = _timeit(lambda: app.update_ui_data(42.0, 63.5, 71.2), repeat)
+        self.add("ui.update_ui_data", "ms", stats['median'], **stats)
+
+        for view in ("dashboard", "network", "analytics", "health"):
+            stats = _timeit(lambda: (app.switch_view(view), self.drain()), max(3, repeat // 10))
+            self.add(f"ui.build_view.{view}", "ms", stats['median'], **stats)
+        app.switch_view("dashboard")
+
+    def bench_vpn(self, repeat: int):
+        app = self.app
+        stats = _timeit(lambda: (app.check_vpn_status(), self.drain()), repeat)
+        self.add("probe.check_vpn_status", "ms", stats['median'], **stats)
+
+    def bench_sites(self, sizes: List[int]):
+        app = self.app
+        original = app.monitored_sites
+        for size in sizes:
+            app.monitored_sites = [
+                {'url': self.http.site_url(i), 'name': f"Site {i}", 'status': 'Unknown'}
+                for i in range(size)
+            ]
+            app.switch_view("dashboard")
+            self.drain()
+            start = time.perf_counter()
+            app.check_websites()
+            self.drain()
+            elapsed = time.perf_counter() - start
+            self.add(f"probe.check_websites.{size}.throughput", "sites/s", size / elapsed, better="higher")
+            self.add(f"probe.check_websites.{size}.cycle", "ms", elapsed * 1000)
+        app.monitored_sites = original
+        app.switch_view("dashboard")
+
+    def bench_synthetic(self, count: int):
+        import synthetic
+        app = self.app
+        base = self.http.base_url
+        # Three-step login flow: scrape a CSRF token, log in for a bearer token, call the API with it
+        raw = [{
+            'name': f"Login {i}",
+            'variables': {'user': f"bench{i}"},
+            'steps': [
+                {'name': "form", 'url': f"{base}/app/login",
+                 'expect': {'status': 200, 'body': r'name="csrf" value="(?P<csrf>[^"]+)"'}},
+                {'name': "login", 'method': "POST", 'url': f"{base}/api/login",
+                 'json': {'user': "${user}", 'csrf': "${csrf}"},
+                 'expect': {'status': 200, 'max_ms': 1000}, 'extract': {'token': "$.token"}},
+                {'name': "profile", 'url': f"{base}/api/me", 'headers': {'Authorization': "Bearer ${token}"},
+                 'expect': {'status': 200, 'headers': {'Content-Type': "json"},
+                            'json': {'$.user': f"bench{i}", '$.active': True}}},
+            ],
+        } for i in range(count)]
+        original = app.monitored_sites
+        app.monitored_sites = []
+        app.synthetic_checks = synthetic.load_checks(raw)
+        app.sync_site_groups(force=True)
+        for _ in range(2):      # the first round opens the connections
+            start = time.perf_counter()
+            app.check_websites()
+            elapsed = time.perf_counter() - start
+        steps = sum(len(check['steps']) for check in app.synthetic_checks)
+        passed = sum(1 for check in app.synthetic_checks if check.get('up'))
+        self.add(f"synthetic.{count}_checks.steps_per_min", "steps/min", steps / elapsed * 60, better="higher",
+                 passed=passed, cycle_ms=round(elapsed * 1000, 1))
+        app.synthetic_checks = []
+        app.monitored_sites = original
+        app.sync_site_groups(force=True)
+
+    def bench_pinger(self, count: int):
+        import pinger
+        # Closed ports on loopback aliases answer with a RST, so no listener is needed
+        targets = [f"127.0.{i // 250}.{i % 250 + 1}:9" for i in range(count)]
+        prober = pinger.Pinger(targets, interval=1.0)
+        prober.run_once()
+        stats = _timeit(prober.run_once, 5)
+        self.add(f"probe.latency_round.{count}", "ms", stats['median'], **stats)
+        self.add(f"probe.latency_round.{count}.cpu", "ms", stats['cpu_median'])
+
+    def bench_logwatch(self, megabytes: int):
+        import logwatch
+        # Mostly benign sshd/cron/access lines with ~0.1% attack lines, as on a busy host
+        rng = random.Random(7)
+        benign = [
+            "Oct 19 10:00:{0:02d} host sshd[1234]: Accepted publickey for deploy from 10.0.0.{1} port 5{2:03d} ssh2\n",
+            "Oct 19 10:00:{0:02d} host CRON[99{1:02d}]: pam_unix(cron:session): session opened for user root(uid=0)\n",
+            '203.0.113.{1} - - [19/Oct/2026:10:00:{0:02d} +0000] "GET /static/app.{2}.js HTTP/1.1" 200 5120 '
+            '"https://example.com/" "Mozilla/5.0 (X11; Linux x86_64)"\n',
+        ]
+        hostile = [
+            "Oct 19 10:00:{0:02d} host sshd[77]: Failed password for invalid user admin from 198.51.100.{1} port 4{2:03d} ssh2\n",
+            '198.51.100.{1} - - [19/Oct/2026:10:00:{0:02d} +0000] "GET /.env HTTP/1.1" 404 153 "-" "zgrab/0.x"\n',
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mixed.log")
+            with open(path, "w", encoding="utf-8") as f:
+                written = 0
+                while written < megabytes * 1_000_000:
+                    pool = hostile if rng.random() < 0.001 else benign
+                    line = rng.choice(pool).format(rng.randrange(60), rng.randrange(1, 255), rng.randrange(1000))
+                    written += f.write(line)
+
+            class _Sink:
+                def report(self, *args, **kwargs):
+                    pass
+
+            watcher = logwatch.LogWatcher([], _Sink())
+            st = os.stat(path)
+            watcher.files[path] = logwatch.LogFile(path, (st.st_dev, st.st_ino, 0))
+            start = time.perf_counter()
+            consumed = watcher.poll()
+            elapsed = time.perf_counter() - start
+            watcher.files[path].close()
+        self.add("logwatch.throughput", "MB/s", consumed / 1e6 / elapsed, better="higher")
+
+    def bench_flows(self, count: int):
+        import flows
+        # count concurrent flows from count // 4 remotes with a long-tailed byte distribution
+        rng = random.Random(11)
+        table = flows.FlowTable()
+        now = time.time()
+        remotes = [bytes([203, 0, i >> 8 & 0xFF, i & 0xFF]) for i in range(max(count // 4, 1))]
+        for i in range(count):
+            entry = table.entry((6, b"\xc0\xa8\x01\x0a", 1024 + i % 60000, remotes[i % len(remotes)], 443), now)
+            entry[flows.PACKETS] += 10
+            entry[flows.DOWN] += int(1500 * rng.paretovariate(1.2))
+        start = time.perf_counter()
+        table.expire(now)
+        self.add(f"flows.housekeeping.{count}", "ms", (time.perf_counter() - start) * 1000)
+        # The next second with every flow open but quiet: only recently active flows are visited
+        start = time.perf_counter()
+        table.expire(now + 1)
+        self.add(f"flows.housekeeping_idle.{count}", "ms", (time.perf_counter() - start) * 1000)
+        stats = _timeit(lambda: table.format_table(20), 20)
+        self.add(f"flows.render_top20.{count}", "ms", stats['median'], **stats)
+
+    def bench_alerts(self, reports: int):
+        import alerts
+        import threats
+        # Collectors report through the pipeline while the only sink is failing and slow
+        sink = alerts.WebhookSink(self.http.webhook_url(503))
+        pipeline = alerts.AlertPipeline([sink], pending_seconds=0, group_seconds=0)
+        log = threats.ThreatLog(on_report=pipeline.observe, on_resolve=pipeline.clear)
+        timings = []
+        for i in range(reports):
+            key = f"bench:{i % 200}"
+            start = time.perf_counter()
+            if i % 3:
+                log.report("bench", "MEDIUM", f"condition {i % 200}", key=key)
+            else:
+                log.resolve(key)
+            timings.append(time.perf_counter() - start)
+            if i % 100 == 0:
+                pipeline.tick()
+        sink.stop()
+        timings.sort()
+        self.add("alerts.report_p99", "us", timings[int(len(timings) * 0.99)] * 1e6,
+                 median_us=round(statistics.median(timings) * 1e6, 2), dropped=sink.dropped)
+
+    def bench_sla(self, probes: int):
+        import alerts
+        import sla
+        # 100 sites probed every 10 s, ~1% failures; record + burn check per probe
+        rng = random.Random(7)
+        tracker = sla.SLATracker()
+        pipeline = alerts.AlertPipeline()
+        now = time.time() - probes / 10
+        timings = []
+        for i in range(probes):
+            key = f"https://site{i % 100}.example"
+            now += 0.1
+            start = time.perf_counter()
+            tracker.record(key, now, rng.random() > 0.01, rng.choice((80, 120, 1500)))
+            tracker.check(pipeline, key, key, now)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        self.add("sla.probe_p99", "us", timings[int(len(timings) * 0.99)] * 1e6,
+                 median_us=round(statistics.median(timings) * 1e6, 2))
+
+    def bench_collector(self, reads: int):
+        import collector_proc
+        # GUI-side snapshot reads from the shared-memory ring, then a real child's first sample
+        ring = collector_proc.SampleRing.create()
+        try:
+            for i in range(ring.capacity + 10):
+                ring.publish((time.time(), 40.0, 60.0, 70.0, 1.0))
+            timings = []
+            for _ in range(reads):
+                start = time.perf_counter()
+                ring.latest()
+                timings.append(time.perf_counter() - start)
+        finally:
+            ring.close()
+        timings.sort()
+        self.add("collector.read_p99", "us", timings[int(len(timings) * 0.99)] * 1e6,
+                 median_us=round(statistics.median(timings) * 1e6, 2))
+
+        supervisor = collector_proc.CollectorSupervisor(interval=0.5)
+        start = time.perf_counter()
+        supervisor.start()
+        try:
+            while supervisor.latest() is None and time.perf_counter() - start < 10:
+                time.sleep(0.005)
+            self.add("collector.first_sample", "ms", (time.perf_counter() - start) * 1000)
+        finally:
+            supervisor.stop()
+
+    @staticmethod
+    def fill_history(store, days: float, end_ms: int):
+        """days of 1 s CPU samples: a random walk with occasional spikes"""
+        rng = random.Random(13)
+        count = int(days * 86400)
+        value = 40.0
+        for i in range(count):
+            value = min(100.0, max(0.0, value + rng.gauss(0, 1.5) + (50 - value) * 0.01))
+            if rng.random() < 0.0005:
+                value = 97.0
+            store.append('cpu', end_ms - (count - i) * 1000, value)
+        store.flush()
+        return count
+
+    def bench_replay(self, days: float):
+        import history
+        import replay
+        end_ms = int(time.time() * 1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = history.HistoryStore(tmp)
+            count = self.fill_history(store, days, end_ms)
+            engine = replay.ReplayEngine(store)
+            start = time.perf_counter()
+            results = engine.evaluate('max_cpu_threshold', [80, 85, 90, 95], end_ms - count * 1000, end_ms)
+            elapsed = time.perf_counter() - start
+        self.add(f"replay.cpu_{days:g}d_4_limits", "s", elapsed,
+                 samples=results[0].samples, alerts=[r.alerts for r in results])
+
+    def bench_export(self, days: float):
+        import export
+        import history
+        end_ms = int(time.time() * 1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = history.HistoryStore(os.path.join(tmp, "history"))
+            self.fill_history(store, days, end_ms)
+            for fmt in ("csv", "jsonl", "columnar"):
+                tracemalloc.start()
+                job = export.ExportJob(store, os.path.join(tmp, "out" + export.EXTENSIONS[fmt]), fmt).run()
+                _current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                # Timed separately: tracemalloc slows the export several times over
+                job = export.ExportJob(store, os.path.join(tmp, "out" + export.EXTENSIONS[fmt]), fmt).run()
+                self.add(f"export.{fmt}_rows_per_s", "rows/s", job.rows / job.elapsed, better="higher",
+                         rows=job.rows, peak_mb=round(peak / 1e6, 2),
+                         file_mb=round(os.path.getsize(job.path) / 1e6, 2))
+            start = time.perf_counter()
+            export.daily_report(store, store.days('cpu')[-1], {'max_cpu_threshold': 85})
+            self.add("export.daily_report", "s", time.perf_counter() - start)
+
+    def bench_memory(self, hours: float):
+        app_module, app = self.app_module, self.app
+        real_psutil = app_module.psutil
+        app_module.psutil = SyntheticPsutil()
+        cycles = int(hours * 3600 / 2)
+        checkpoints = []
+        try:
+            gc.collect()
+            tracemalloc.start()
+            base_traced = tracemalloc.get_traced_memory()[0]
+            base_rss = app_module.selfmon.process_rss_bytes()
+            ts = int(time.time() * 1000)
+            start = time.perf_counter()
+            for cycle in range(1, cycles + 1):
+                app.update_all_data(ts + cycle * 2000)
+                self.drain()
+                if cycle % 1800 == 0:
+                    gc.collect()
+                    checkpoints.append({
+                        'hour': cycle // 1800,
+                        'traced_kb': round((tracemalloc.get_traced_memory()[0] - base_traced) / 1024, 1),
+                        'rss_kb': round((app_module.selfmon.process_rss_bytes() - base_rss) / 1024, 1),
+                    })
+            elapsed = time.perf_counter() - start
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] - base_traced
+            tracemalloc.stop()
+        finally:
+            app_module.psutil = real_psutil
+
+        self.add(f"memory.simulated_{hours:g}h.traced_growth", "KiB", traced / 1024,
+                 cycles=cycles, checkpoints=checkpoints)
+        self.add(f"memory.simulated_{hours:g}h.cycle_cost", "ms", elapsed * 1000 / max(cycles, 1))
+
+
+def _metadata(widgets: str) -> Dict[str, object]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'widgets': widgets,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results: List[Dict[str, object]], baseline_path: str, tolerance: float) -> List[str]:
+    """Return descriptions of results that regressed beyond tolerance"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r['name']: r for r in json.load(f)['results']}
+    regressions = []
+    for result in results:
+        old = baseline.get(result['name'])
+        if not old or not old['value']:
+            continue
+        ratio = result['value'] / old['value']
+        worse = ratio < 1 - tolerance if result['better'] == "higher" else ratio > 1 + tolerance
+        if worse:
+            regressions.append(f"{result['name']}: {old['value']} -> {result['value']} {result['unit']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SecureNet Monitor benchmarks")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--widgets", choices=("mock", "tk"), default="mock",
+                        help="mock the widget layer or use real Tk (needs a display, e.g. xvfb-run)")
+    parser.add_argument("--sites", default="10,100,1000", help="site counts for probe throughput")
+    parser.add_argument("--ping-targets", type=int, default=1000, help="targets per latency probe round")
+    parser.add_argument("--log-mb", type=int, default=200, help="size of the synthetic log for log matching")
+    parser.add_argument("--flows", type=int, default=100000, help="concurrent flows for the flow table")
+    parser.add_argument("--replay-days", type=float, default=7, help="days of 1 s history for the replay")
+    parser.add_argument("--sim-hours", type=float, default=24, help="simulated hours for the memory run")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions and a 1 hour memory run")
+    args = parser.parse_args(argv)
+
+    repeat = 5 if args.quick else 20
+    hours = 1 if args.quick else args.sim_hours
+    sizes = [int(s) for s in args.sites.split(",") if s]
+
+    run = BenchmarkRun(args.widgets)
+    try:
+        run.bench_collection(repeat)
+        run.bench_ui(repeat * 10)
+        run.bench_vpn(repeat)
+        run.bench_sites(sizes)
+        run.bench_pinger(args.ping_targets)
+        run.bench_logwatch(20 if args.quick else args.log_mb)
+        run.bench_flows(args.flows)
+        run.bench_alerts(20000)
+        run.bench_synthetic(100 if args.quick else 500)
+        run.bench_sla(20000 if args.quick else 200000)
+        run.bench_collector(100000)
+        run.bench_replay(1 if args.quick else args.replay_days)
+        run.bench_export(0.25 if args.quick else 1)
+        run.bench_memory(hours)
+    finally:
+        run.close()
+
+    document = {'meta': _metadata(args.widgets), 'results': run.results}
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(run.results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
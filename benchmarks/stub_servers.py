@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Benchmark Stub Servers
+Local HTTP/TCP endpoints, webhook receivers and a recorded IP-intel provider for offline runs
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, keep-alive
+    # clients stall on Nagle + delayed ACK for ~40 ms per response
+    disable_nagle_algorithm = True
+    ip_intel_body = b"{}"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/ipapi/json/":
+            body = self.ip_intel_body
+            status = 200
+            content_type = "application/json"
+        elif path.startswith("/status/"):
+            status = int(path.rsplit("/", 1)[1])
+            body = b"status"
+            content_type = "text/plain"
+        elif path == "/app/login":
+            status = 200
+            body = b'<form><input type="hidden" name="csrf" value="c5rf-7ok3n"></form>'
+            content_type = "text/html"
+        elif path == "/api/me":
+            # Bearer tokens from /api/login are "tok-<user>"
+            auth = self.headers.get("Authorization") or ""
+            user = auth[len("Bearer tok-"):] if auth.startswith("Bearer tok-") else None
+            status = 200 if user else 401
+            body = json.dumps({'user': user, 'active': True} if user else {'error': "unauthorized"}).encode()
+            content_type = "application/json"
+        else:
+            status = 200
+            body = b"<html><body>ok</body></html>"
+            content_type = "text/html"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # /webhook records the body; /webhook/status/503 fails; /webhook/slow/2.5 answers late;
+        # /webhook/flaky/3 answers 503 to the first three posts, then succeeds
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/api/login":
+            self._login(body)
+            return
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        status = 200
+        if len(parts) == 3 and parts[1] == "status":
+            status = int(parts[2])
+        elif len(parts) == 3 and parts[1] == "slow":
+            time.sleep(float(parts[2]))
+        elif len(parts) == 3 and parts[1] == "flaky":
+            with self.server.lock:
+                self.server.flaky_posts += 1
+                if self.server.flaky_posts <= int(parts[2]):
+                    status = 503
+        if status == 200:
+            self.server.received.append(body)
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _login(self, body: bytes):
+        """Synthetic-check fixture: {"user", "csrf"} in, {"token"} out"""
+        try:
+            request = json.loads(body)
+            ok = bool(request.get('user')) and request.get('csrf') == "c5rf-7ok3n"
+        except (ValueError, AttributeError):
+            ok = False
+        reply = json.dumps({'token': f"tok-{request['user']}"} if ok else {'error': "bad login"}).encode()
+        self.send_response(200 if ok else 403)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer:
+    """Threaded HTTP server serving sites, status codes and the IP-intel fixture"""
+
+    def __init__(self, fixture: str = "ipapi.json"):
+        with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+            body = f.read()
+        handler = type("StubHandler", (_StubHandler,), {"ip_intel_body": body})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._server.received = []
+        self._server.flaky_posts = 0
+        self._server.lock = threading.Lock()
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def ip_intel_url(self) -> str:
+        return f"{self.base_url}/ipapi/json/"
+
+    def site_url(self, index: int) -> str:
+        return f"{self.base_url}/site/{index}"
+
+    def webhook_url(self, status: int = 200, delay: float = 0.0, fail_first: int = 0) -> str:
+        if delay:
+            return f"{self.base_url}/webhook/slow/{delay}"
+        if fail_first:
+            return f"{self.base_url}/webhook/flaky/{fail_first}"
+        return f"{self.base_url}/webhook" + (f"/status/{status}" if status != 200 else "")
+
+    @property
+    def webhook_posts(self) -> list:
+        """Bodies of successful webhook POSTs, oldest first"""
+        return self._server.received
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubTCPServer:
+    """Accepts and immediately closes TCP connections (internet check target)"""
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(1024)
+        self.address = self._sock.getsockname()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def _serve(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            conn.close()
+
+    def stop(self):
+        self._running = False
+        self._sock.close()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Packet Capture
+AF_PACKET TPACKET_V3 ring behind a kernel BPF filter, parsed in place into flow, protocol and DNS counters
+"""
+
+import functools
+import select
+import socket
+import struct
+import threading
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+import flows
+
+if TYPE_CHECKING:
+    import mmap     # imported by open() once capture actually starts
+
+SOL_PACKET = 263
+PACKET_RX_RING = 5
+PACKET_STATISTICS = 6
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+ETH_P_ALL = 0x0003
+SO_ATTACH_FILTER = 26
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+PACKET_OUTGOING = 4
+
+BLOCK_SIZE = 1 << 20
+BLOCK_COUNT = 32                # 32 MiB ring: ~0.25 s of line rate at 1 Gbps
+FRAME_SIZE = 2048
+BLOCK_TIMEOUT_MS = 100          # the kernel hands over partly filled blocks after this long
+SNAPLEN = 256                   # headers plus a DNS question; byte counts still use the wire length
+MAX_DNS_NAMES = 2000
+VPN_PREFIXES = ("tun", "tap", "wg", "ppp", "utun", "ipsec", "nordlynx", "proton")
+
+PROTOCOL_NAMES = {1: "ICMP", 6: "TCP", 17: "UDP", 41: "IPv6-in-IP", 47: "GRE", 50: "ESP", 58: "ICMPv6"}
+
+# Classic BPF (linux/filter.h)
+BPF_LD_W_ABS = 0x20
+BPF_JEQ_K = 0x15
+BPF_RET_K = 0x06
+SKF_AD_OFF = -0x1000
+SKF_AD_PROTOCOL = 0
+SKF_AD_IFINDEX = 8
+
+_REQ3 = struct.Struct("=IIIIIII")
+_U32 = struct.Struct("=I")
+# One unpack per header: tpacket3_hdr (next_offset, snaplen, len, mac, net) and the sockaddr_ll
+# after it at +48 (ifindex, pkttype); IPv4 (ver/ihl, frag, proto, src, dst); IPv6 (next, src, dst)
+_FRAME = struct.Struct("=I8xII4xHH24xi2xB")
+_IPV4 = struct.Struct("!B5xHxB2x4s4s")
+_IPV6 = struct.Struct("!6xBx16s16s")
+_TCP = struct.Struct("!HH9xB")
+_UDP = struct.Struct("!HH")
+
+
+def build_filter(snaplen: int = SNAPLEN, exclude_ifindex: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+    """IPv4/IPv6 only, optionally not on one interface, truncated to snaplen"""
+    # Entries are (code, jump-if-true, jump-if-false, k) with symbolic targets resolved below
+    program = []
+    if exclude_ifindex:
+        program += [(BPF_LD_W_ABS, 0, 0, SKF_AD_OFF + SKF_AD_IFINDEX),
+                    (BPF_JEQ_K, "drop", 0, exclude_ifindex)]
+    program += [
+        (BPF_LD_W_ABS, 0, 0, SKF_AD_OFF + SKF_AD_PROTOCOL),
+        (BPF_JEQ_K, "accept", 0, 0x0800),
+        (BPF_JEQ_K, "accept", "drop", 0x86DD),
+    ]
+    labels = {"accept": len(program), "drop": len(program) + 1}
+    program += [(BPF_RET_K, 0, 0, snaplen), (BPF_RET_K, 0, 0, 0)]
+    resolved = []
+    for pc, (code, jt, jf, k) in enumerate(program):
+        jt = labels[jt] - pc - 1 if isinstance(jt, str) else jt
+        jf = labels[jf] - pc - 1 if isinstance(jf, str) else jf
+        resolved.append((code, jt, jf, k & 0xFFFFFFFF))
+    return resolved
+
+
+def attach_filter(sock: socket.socket, program: List[Tuple[int, int, int, int]]):
+    """SO_ATTACH_FILTER; the kernel copies the program, so the buffer only has to outlive the call"""
+    import ctypes
+    code = b"".join(struct.pack("=HBBI", *insn) for insn in program)
+    buf = ctypes.create_string_buffer(code, len(code))
+    fprog = struct.pack("HL", len(program), ctypes.addressof(buf))
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+
+
+def _qname(buf, pos: int, end: int) -> Optional[str]:
+    labels = []
+    while pos < end:
+        n = buf[pos]
+        if n == 0:
+            return b".".join(labels).decode("ascii", "replace").lower()
+        if n & 0xC0 or pos + 1 + n > end:
+            return None
+        labels.append(buf[pos + 1:pos + 1 + n])
+        pos += 1 + n
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _interface_name(index: int) -> str:
+    try:
+        return socket.if_indextoname(index)
+    except OSError:
+        return f"if{index}"
+
+
+class PacketCapture:
+    """Receives packets from a memory-mapped ring on a background thread"""
+
+    def __init__(self, interface: Optional[str] = None, snaplen: int = SNAPLEN, include_loopback: bool = False,
+                 on_syn: Optional[Callable[[str, int, float], None]] = None,
+                 on_dns_leak: Optional[Callable[[str, str], None]] = None):
+        self.interface = interface or None
+        self.snaplen = snaplen
+        self.include_loopback = include_loopback
+        self.on_syn = on_syn
+        self.on_dns_leak = on_dns_leak
+        self.sock: Optional[socket.socket] = None
+        self.ring: Optional["mmap.mmap"] = None
+        self.error = ""
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self):
+        self.packets = 0
+        self.up_bytes = 0
+        self.down_bytes = 0
+        self.kernel_drops = 0
+        self.busy_seconds = 0.0
+        self.flows = flows.FlowTable()
+        self.protocol_bytes: Counter = Counter()
+        self.interface_bytes: Counter = Counter()
+        self.interface_seen: Dict[int, Tuple[int, float]] = {}     # ifindex -> (bytes, when they last grew)
+        self.dns_counts: Counter = Counter()
+        self.dns_recent: Deque[Tuple[float, str, str]] = deque(maxlen=50)
+
+    # === RING ===
+
+    def open(self):
+        """Create the socket, filter and ring; raises OSError (e.g. EPERM without CAP_NET_RAW)"""
+        import mmap
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_DGRAM, socket.htons(ETH_P_ALL))
+        try:
+            # SOCK_DGRAM hands over packets from the network header, so tun/wg links parse the same as Ethernet
+            lo = None if self.include_loopback or self.interface else socket.if_nametoindex("lo")
+            attach_filter(sock, build_filter(self.snaplen, lo))
+            sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            frames = BLOCK_SIZE * BLOCK_COUNT // FRAME_SIZE
+            sock.setsockopt(SOL_PACKET, PACKET_RX_RING,
+                            _REQ3.pack(BLOCK_SIZE, BLOCK_COUNT, FRAME_SIZE, frames, BLOCK_TIMEOUT_MS, 0, 0))
+            self.ring = mmap.mmap(sock.fileno(), BLOCK_SIZE * BLOCK_COUNT, mmap.MAP_SHARED,
+                                  mmap.PROT_READ | mmap.PROT_WRITE)
+            if self.interface:
+                sock.bind((self.interface, ETH_P_ALL))
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def close(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def start(self) -> bool:
+        """Open the ring and start the reader; False (with .error set) if capture is not permitted"""
+        if self._thread is not None and self._thread.is_alive():
+            self.error = "previous capture thread still running"
+            return False
+        self.reset()
+        try:
+            self.open()
+        except OSError as e:
+            self.error = str(e)
+            return False
+        self.error = ""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="securenet-capture", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the reader and wait for it, so a restart never shares the ring with it"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self):
+        poller = select.poll()
+        poller.register(self.sock.fileno(), select.POLLIN | select.POLLERR)
+        block = 0
+        last_expire = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                offset = block * BLOCK_SIZE
+                if not _U32.unpack_from(self.ring, offset + 8)[0] & TP_STATUS_USER:
+                    poller.poll(200)
+                    continue
+                start = time.perf_counter()
+                self._process_block(offset, time.time())
+                # Hand the block back to the kernel
+                _U32.pack_into(self.ring, offset + 8, TP_STATUS_KERNEL)
+                block = (block + 1) % BLOCK_COUNT
+                self.busy_seconds += time.perf_counter() - start
+                if time.monotonic() - last_expire > 1.0:
+                    self._housekeeping(time.time())
+                    last_expire = time.monotonic()
+        except Exception as e:
+            self.error = str(e)
+            print(f"Packet capture error: {e}")
+        finally:
+            self.close()
+
+    def _process_block(self, offset: int, now: float):
+        ring = self.ring
+        count = _U32.unpack_from(ring, offset + 12)[0]
+        pkt = offset + _U32.unpack_from(ring, offset + 16)[0]
+        table = self.flows.flows
+        recent = self.flows.recent
+        since = self.flows.last_expire
+        frame, ipv4, ipv6, tcp, udp = (s.unpack_from for s in (_FRAME, _IPV4, _IPV6, _TCP, _UDP))
+        mix: Dict[Tuple[int, int], int] = {}
+        up = down = 0
+        syns = []
+        for _ in range(count):
+            next_offset, snaplen, length, mac, net, ifindex, pkttype = frame(ring, pkt)
+            ip = pkt + net
+            end = pkt + mac + snaplen
+            sport = dport = flags = 0
+            if ring[ip] >> 4 == 4:
+                vihl, fragment, proto, src, dst = ipv4(ring, ip)
+                l4 = ip + (vihl & 0x0F) * 4
+                fragment &= 0x1FFF
+            else:
+                proto, src, dst = ipv6(ring, ip)
+                l4 = ip + 40
+                fragment = 0
+            if not fragment:
+                if proto == 6 and l4 + 14 <= end:
+                    sport, dport, flags = tcp(ring, l4)
+                elif proto == 17 and l4 + 4 <= end:
+                    sport, dport = udp(ring, l4)
+            if pkttype == PACKET_OUTGOING:
+                up += length
+                key = (proto, src, sport, dst, dport)
+                index = 1       # flows.UP
+                if dport == 53 and proto == 17:
+                    self._dns_query(ring, l4 + 20, end, ifindex, now)
+            else:
+                down += length
+                key = (proto, dst, dport, src, sport)
+                index = 2       # flows.DOWN
+                if flags & 0x12 == 0x02:    # SYN without ACK
+                    syns.append((src, dport))
+            flow = table.get(key)
+            if flow is None:
+                flow = self.flows.entry(key, now)
+            elif flow[4] < since:
+                recent.append(key)      # first packet since the last expire
+            flow[0] += 1
+            flow[index] += length
+            flow[4] = now
+            mix_key = (proto, ifindex)
+            mix[mix_key] = mix.get(mix_key, 0) + length
+            pkt += next_offset
+        for (proto, ifindex), size in mix.items():
+            self.protocol_bytes[proto] += size
+            self.interface_bytes[ifindex] += size
+        self.packets += count
+        self.up_bytes += up
+        self.down_bytes += down
+        if syns and self.on_syn is not None:
+            for src, port in syns:
+                family = socket.AF_INET if len(src) == 4 else socket.AF_INET6
+                self.on_syn(socket.inet_ntop(family, src), port, now)
+
+    def _dns_query(self, ring, pos: int, end: int, ifindex: int, now: float):
+        # UDP header (8) + DNS header (12) precede the question
+        name = _qname(ring, pos, end)
+        if not name:
+            return
+        interface = _interface_name(ifindex)
+        self.dns_counts[name] += 1
+        self.dns_recent.append((now, name, interface))
+        if self.on_dns_leak is not None and not interface.startswith(VPN_PREFIXES) and self.vpn_active(now):
+            self.on_dns_leak(name, interface)
+
+    def _housekeeping(self, now: float):
+        self.flows.expire(now)
+        if len(self.dns_counts) > MAX_DNS_NAMES:
+            self.dns_counts = Counter(dict(self.dns_counts.most_common(MAX_DNS_NAMES // 2)))
+        for ifindex, count in list(self.interface_bytes.items()):
+            if self.interface_seen.get(ifindex, (0, 0.0))[0] != count:
+                self.interface_seen[ifindex] = (count, now)
+        if self.sock is not None:
+            _packets, drops, _freezes = struct.unpack("=III", self.sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, 12))
+            self.kernel_drops += drops      # the kernel resets these counters on every read
+
+    def vpn_active(self, now: float) -> bool:
+        """A tunnel interface carried traffic in the last minute"""
+        return any(_interface_name(i).startswith(VPN_PREFIXES) and now - seen < 60
+                   for i, (_count, seen) in self.interface_seen.items())
+
+    # === VIEWS ===
+
+    def format_table(self) -> str:
+        """Traffic summary for the network view"""
+        if not self.running:
+            return f"Packet capture: off{' (' + self.error + ')' if self.error else ''}"
+        pps = self.packets / self.busy_seconds if self.busy_seconds else 0
+        lines = [
+            f"Packet capture: {self.interface or 'all interfaces'} | {self.packets} packets "
+            f"| kernel drops {self.kernel_drops} | parser capacity ~{pps / 1000:.0f}k pkt/s",
+            "",
+            "Protocol mix:",
+        ]
+        total = sum(self.protocol_bytes.values()) or 1
+        for proto, count in self.protocol_bytes.most_common(6):
+            lines.append(f"  {PROTOCOL_NAMES.get(proto, str(proto)):<10} {count / 1e6:>10.2f} MB  {100 * count / total:5.1f}%")
+        lines += ["", self.flows.format_table()]
+        lines += ["", "DNS queries (most frequent):"]
+        for name, count in self.dns_counts.most_common(10):
+            lines.append(f"  {count:>6}  {name}")
+        return "\n".join(lines)
+
+    def format_interfaces(self) -> str:
+        """Per-interface traffic and recent DNS queries, for the VPN view"""
+        if not self.running:
+            return ""
+        now = time.time()
+        lines = ["Traffic by interface:"]
+        for ifindex, count in self.interface_bytes.most_common():
+            name = _interface_name(ifindex)
+            tag = "  (tunnel)" if name.startswith(VPN_PREFIXES) else ""
+            lines.append(f"  {name:<16} {count / 1e6:>10.2f} MB{tag}")
+        lines += ["", "Recent DNS queries:"]
+        for when, name, interface in list(self.dns_recent)[-15:][::-1]:
+            lines.append(f"  {now - when:>5.0f}s ago  {interface:<10} {name}")
+        return "\n".join(lines)
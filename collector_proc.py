@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Collector Process
+System sampling and file integrity hashing in a supervised child process, exchanged through shared-memory seqlock rings
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import integrity
+
+SAMPLE_MAGIC = b"SNR1"
+MESSAGE_MAGIC = b"SNM1"
+VERSION = 1
+CAPACITY = 256                  # samples kept in the ring (~8 minutes at 2 s)
+MESSAGE_CAPACITY = 32
+MESSAGE_SIZE = 65536            # bytes per message slot; change batches are split to fit
+STALL_SAMPLES = 5               # a child this many intervals behind is restarted
+MIN_STALL_SECONDS = 10
+RESTART_BACKOFF = (1, 2, 5, 10, 30)
+HEALTHY_SECONDS = 60            # a child that lived this long resets the backoff
+READ_RETRIES = 8
+POLL_SECONDS = 0.2              # how often the supervisor drains messages and checks the child
+STATUS_SECONDS = 2.0            # job status messages are sent at most this often
+PUBLISH_WAIT = 5.0              # a full message ring holds the child back this long for the reader
+STOP_WAIT = 3.0
+
+# Records are published with plain stores and no fences, which readers in another
+# process see in program order only on x86 (TSO); elsewhere the work stays in process
+SEQLOCK_MACHINES = ("x86_64", "amd64", "i386", "i486", "i586", "i686")
+
+SAMPLE_FIELDS = ("timestamp", "cpu", "memory", "disk", "collect_ms")
+
+# Header: magic, version, record size, capacity, then the words both sides update
+_HEADER = struct.Struct("<4sIII")
+_WRITE_SEQ = 16                 # Q: records published so far
+_STOP = 24                      # Q: non-zero asks the child to exit (sample ring)
+_INTERVAL = 32                  # d: sample period, re-read by the child every cycle (sample ring)
+_PID = 40                       # Q: child pid (sample ring)
+_READ_SEQ = 48                  # Q: records the reader has consumed (message ring)
+_SLOTS = 64
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_F64 = struct.Struct("<d")
+
+
+class Sample(NamedTuple):
+    timestamp: float
+    cpu: float
+    memory: float
+    disk: float
+    collect_ms: float
+
+
+def supported() -> bool:
+    """True where the rings' store ordering holds"""
+    return os.uname().machine.lower() in SEQLOCK_MACHINES
+
+
+class _SeqlockRing:
+    """Fixed-size records in shared memory, one writer and any number of lock-free readers
+
+    Every slot starts with a sequence word: odd while the writer is inside the
+    slot, 2n + 2 once record n is complete. A reader copies the record out and
+    accepts it only if the word was even, belonged to the record it wanted and
+    did not change across the copy. Stores go straight to the mapping in
+    program order, which x86's memory model keeps visible in that order to the
+    other process (see supported()).
+    """
+
+    MAGIC = b""
+
+    def __init__(self, shm, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        magic, version, record_size, capacity = _HEADER.unpack_from(self.buf, 0)
+        if magic != self.MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name}: not a SecureNet {type(self).__name__}")
+        self.record_size = record_size
+        self.capacity = capacity
+        self.slot_size = 8 + record_size
+
+    @classmethod
+    def _create(cls, record_size: int, capacity: int):
+        # multiprocessing is only loaded once a collector is actually started
+        from multiprocessing import shared_memory
+        size = _SLOTS + capacity * (8 + record_size)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        _HEADER.pack_into(shm.buf, 0, cls.MAGIC, VERSION, record_size, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        from multiprocessing import resource_tracker, shared_memory
+        shm = shared_memory.SharedMemory(name=name)
+        # The creator owns the segment; without this the child's resource tracker
+        # would unlink it when the child exits
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        return _U64.unpack_from(self.buf, _WRITE_SEQ)[0]
+
+    def get_word(self, offset: int) -> int:
+        return _U64.unpack_from(self.buf, offset)[0]
+
+    def set_word(self, offset: int, value: int):
+        _U64.pack_into(self.buf, offset, value)
+
+    def _pack(self, offset: int, record):
+        raise NotImplementedError
+
+    def _unpack(self, offset: int):
+        raise NotImplementedError
+
+    def publish(self, record) -> int:
+        """Writer side: store one record, returning its sequence number"""
+        seq = self.write_seq
+        offset = _SLOTS + (seq % self.capacity) * self.slot_size
+        _U64.pack_into(self.buf, offset, 2 * seq + 1)
+        self._pack(offset + 8, record)
+        _U64.pack_into(self.buf, offset, 2 * seq + 2)
+        _U64.pack_into(self.buf, _WRITE_SEQ, seq + 1)
+        return seq
+
+    def read(self, seq: int):
+        """Record seq if it is still in the ring and was read without tearing"""
+        offset = _SLOTS + (seq % self.capacity) * self.slot_size
+        for _ in range(READ_RETRIES):
+            before = _U64.unpack_from(self.buf, offset)[0]
+            if before != 2 * seq + 2:
+                if before > 2 * seq + 2:
+                    return None         # overwritten by a newer record
+                continue                # being written
+            record = self._unpack(offset + 8)
+            if _U64.unpack_from(self.buf, offset)[0] == before:
+                return record
+        return None
+
+    def latest(self) -> Optional[Tuple[int, object]]:
+        """(seq, record) of the newest complete record"""
+        for _ in range(READ_RETRIES):
+            count = self.write_seq
+            if not count:
+                return None
+            record = self.read(count - 1)
+            if record is not None:
+                return count - 1, record
+        return None
+
+    def read_since(self, seq: int) -> List[Tuple[int, object]]:
+        """Every record from seq on that is still in the ring, oldest first"""
+        count = self.write_seq
+        records = []
+        for n in range(max(seq, count - self.capacity), count):
+            record = self.read(n)
+            if record is not None:
+                records.append((n, record))
+        return records
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SampleRing(_SeqlockRing):
+    """Ring of float records, read in place with struct.unpack_from"""
+
+    MAGIC = SAMPLE_MAGIC
+
+    def __init__(self, shm, owner: bool):
+        super().__init__(shm, owner)
+        self.record = struct.Struct(f"<{self.record_size // 8}d")
+
+    @classmethod
+    def create(cls, fields: int = len(SAMPLE_FIELDS), capacity: int = CAPACITY) -> "SampleRing":
+        return cls._create(8 * fields, capacity)
+
+    @property
+    def interval(self) -> float:
+        return _F64.unpack_from(self.buf, _INTERVAL)[0]
+
+    @interval.setter
+    def interval(self, seconds: float):
+        _F64.pack_into(self.buf, _INTERVAL, seconds)
+
+    def _pack(self, offset: int, values):
+        self.record.pack_into(self.buf, offset, *values)
+
+    def _unpack(self, offset: int) -> Tuple[float, ...]:
+        return self.record.unpack_from(self.buf, offset)
+
+
+class MessageRing(_SeqlockRing):
+    """Ring of length-prefixed byte messages for one consumer, which reports its position back
+
+    Writer threads in the child serialise on a lock; a writer that finds the ring
+    full waits for the reader before overwriting anything it has not consumed.
+    """
+
+    MAGIC = MESSAGE_MAGIC
+
+    def __init__(self, shm, owner: bool):
+        super().__init__(shm, owner)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, size: int = MESSAGE_SIZE, capacity: int = MESSAGE_CAPACITY) -> "MessageRing":
+        return cls._create(size, capacity)
+
+    def send(self, data: bytes, timeout: float = PUBLISH_WAIT) -> int:
+        """Publish one message, waiting up to timeout for the reader to make room"""
+        if len(data) > self.record_size - _U32.size:
+            raise ValueError(f"message of {len(data)} bytes does not fit a {self.record_size} byte slot")
+        with self._lock:
+            deadline = time.monotonic() + timeout
+            while (self.write_seq - self.get_word(_READ_SEQ) >= self.capacity
+                   and time.monotonic() < deadline):
+                time.sleep(0.01)
+            return self.publish(data)
+
+    def consumed(self, seq: int):
+        """Reader side: every message before seq has been handled"""
+        self.set_word(_READ_SEQ, seq)
+
+    def _pack(self, offset: int, data: bytes):
+        _U32.pack_into(self.buf, offset, len(data))
+        self.buf[offset + 4:offset + 4 + len(data)] = data
+
+    def _unpack(self, offset: int) -> bytes:
+        length = min(_U32.unpack_from(self.buf, offset)[0], self.record_size - _U32.size)
+        return bytes(self.buf[offset + 4:offset + 4 + length])
+
+
+# === CHILD ===
+
+def _send(messages: MessageRing, message: Dict):
+    import json
+    messages.send(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+
+
+def send_changes(messages: MessageRing, changes: List[integrity.Change]):
+    """Split one batch of integrity changes over as many messages as it needs"""
+    import json
+    limit = messages.record_size - 256
+    chunk: List[List[str]] = []
+    size = 0
+    for change in changes:
+        entry = [change.kind, change.path, change.detail]
+        cost = len(json.dumps(entry)) + 1
+        if chunk and size + cost > limit:
+            _send(messages, {'type': "integrity_changes", 'changes': chunk, 'more': True})
+            chunk, size = [], 0
+        chunk.append(entry)
+        size += cost
+    _send(messages, {'type': "integrity_changes", 'changes': chunk, 'more': False})
+
+
+def collect_forever(samples: SampleRing, messages: MessageRing, parent_pid: int, settings: Dict):
+    """Child main loop: sample on a fixed grid, with any configured jobs on their own threads,
+    until told to stop or orphaned"""
+    import psutil
+    psutil.cpu_percent(interval=None)       # prime; later calls measure since the previous one
+    samples.set_word(_PID, os.getpid())
+    monitor = None
+    job = settings.get('integrity')
+    if job:
+        monitor = integrity.IntegrityMonitor(job['paths'], job['baseline'],
+                                             lambda changes: send_changes(messages, changes))
+        monitor.start()
+    last_status = None
+    status_due = 0.0
+    next_tick = time.time()
+    try:
+        while not samples.get_word(_STOP) and os.getppid() == parent_pid:
+            started = time.perf_counter()
+            samples.publish((
+                time.time(),
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory().percent,
+                psutil.disk_usage('/').percent,
+                (time.perf_counter() - started) * 1000,
+            ))
+            if monitor is not None and time.monotonic() >= status_due:
+                status = monitor.status()
+                if status != last_status:
+                    _send(messages, {'type': "integrity_status", 'status': status})
+                    last_status = status
+                status_due = time.monotonic() + STATUS_SECONDS
+            next_tick += max(0.2, samples.interval)
+            delay = next_tick - time.time()
+            if delay < 0:
+                next_tick = time.time()
+            time.sleep(max(0.0, delay))
+    finally:
+        if monitor is not None:
+            monitor.stop()
+            monitor.join(STOP_WAIT - 1)     # lets it save the baseline
+
+
+# === SUPERVISOR ===
+
+class CollectorSupervisor:
+    """Runs the collector child, restarting it with backoff when it dies or stalls
+
+    Jobs for the child are configured by name (see configure()); messages it sends
+    back are handed to handlers[message type] on the supervisor thread.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.samples: Optional[SampleRing] = None
+        self.messages: Optional[MessageRing] = None
+        self.process = None
+        self.settings: Dict[str, Dict] = {}
+        self.handlers: Dict[str, Callable[[Dict], None]] = {}
+        self.restarts = 0
+        self.lost_messages = 0
+        self.last_exit: Optional[int] = None
+        self.error = ""
+        self._read_seq = 0
+        self._respawn = False
+        self._started_at = 0.0
+        self._failures = 0
+        self._restart_due = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._settings_lock = threading.Lock()     # never held across a child stop, so the GUI never waits
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start supervising; the rings and the child are created on the supervisor thread"""
+        if self.running:
+            return
+        if not supported():
+            self.error = f"shared-memory rings need x86 store ordering, not {os.uname().machine}"
+            return
+        self.error = ""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._supervise, daemon=True, name="securenet-collector-supervisor")
+        self._thread.start()
+
+    def set_interval(self, seconds: float):
+        self.interval = seconds
+        if self.samples is not None:
+            self.samples.interval = seconds
+
+    def configure(self, job: str, settings: Optional[Dict]):
+        """Settings for a job the child runs (None drops it); a change restarts the child"""
+        with self._settings_lock:
+            if self.settings.get(job) == settings:
+                return
+            if settings is None:
+                self.settings.pop(job, None)
+            else:
+                self.settings[job] = settings
+            self._respawn = True
+
+    def _open(self) -> bool:
+        try:
+            self.samples = SampleRing.create()
+            self.messages = MessageRing.create()
+        except OSError as e:
+            self.error = str(e)
+            print(f"Collector process error: {e}")
+            self._close()
+            return False
+        self._read_seq = 0
+        self.samples.interval = self.interval
+        return True
+
+    def _close(self):
+        for ring in (self.samples, self.messages):
+            if ring is not None:
+                ring.close()
+        self.samples = self.messages = None
+
+    def _spawn(self):
+        import json
+        import subprocess
+        self.samples.set_word(_STOP, 0)
+        with self._settings_lock:
+            settings = json.dumps(self.settings)
+            self._respawn = False
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), self.samples.name, self.messages.name,
+                 str(os.getpid()), settings],
+                stdin=subprocess.DEVNULL,
+            )
+            self._started_at = time.monotonic()
+            self.error = ""
+        except OSError as e:
+            self.process = None
+            self.error = str(e)
+            print(f"Collector process error: {e}")
+
+    def _terminate(self):
+        import subprocess
+        self.samples.set_word(_STOP, 1)
+        try:
+            self.process.wait(timeout=STOP_WAIT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def _supervise(self):
+        with self._lock:
+            if not self._open():
+                return
+            self._spawn()
+        while not self._stop.wait(POLL_SECONDS):
+            self._drain()
+            with self._lock:
+                self._check_child()
+
+    def _check_child(self):
+        process = self.process
+        if process is not None:
+            if self._respawn:
+                self._terminate()
+                self._spawn()
+                return
+            if process.poll() is None:
+                if not self._stalled():
+                    if time.monotonic() - self._started_at >= HEALTHY_SECONDS:
+                        self._failures = 0
+                    return
+                self.error = "collector stalled"
+                process.kill()
+                process.wait()
+            self.last_exit = process.returncode
+            self.process = None
+            self._back_off()
+            print(f"Collector process exited ({self.last_exit}); restarting")
+        if time.monotonic() >= self._restart_due:
+            self.restarts += 1
+            self._spawn()
+            if self.process is None:
+                self._back_off()
+
+    def _back_off(self):
+        self._restart_due = time.monotonic() + RESTART_BACKOFF[min(self._failures, len(RESTART_BACKOFF) - 1)]
+        self._failures += 1
+
+    def _stalled(self) -> bool:
+        latest = self.samples.latest()
+        limit = max(MIN_STALL_SECONDS, STALL_SAMPLES * self.interval)
+        since = time.time() - latest[1][0] if latest is not None else time.monotonic() - self._started_at
+        return since > limit and time.monotonic() - self._started_at > limit
+
+    def _drain(self):
+        """Hand new messages to their handlers, then tell the child they are consumed"""
+        messages = self.messages
+        count = messages.write_seq
+        if count == self._read_seq:
+            return
+        import json
+        first = max(self._read_seq, count - messages.capacity)
+        self.lost_messages += first - self._read_seq
+        for seq in range(first, count):
+            data = messages.read(seq)
+            try:
+                message = json.loads(data) if data is not None else None
+            except ValueError:
+                message = None
+            if message is None:
+                self.lost_messages += 1
+                continue
+            handler = self.handlers.get(message.get('type'))
+            if handler is not None:
+                try:
+                    handler(message)
+                except Exception as e:
+                    print(f"Collector message error: {e}")
+        self._read_seq = count
+        messages.consumed(count)
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Sample]:
+        """Newest sample, or None if there is none younger than max_age seconds"""
+        ring = self.samples
+        if ring is None:
+            return None
+        latest = ring.latest()
+        if latest is None:
+            return None
+        sample = Sample(*latest[1])
+        if max_age is not None and time.time() - sample.timestamp > max_age:
+            return None
+        return sample
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = self.process
+        return process.pid if process is not None else None
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        with self._lock:
+            if self.process is not None:
+                self._terminate()
+            self._close()
+
+    def format_status(self) -> str:
+        """One line for the health view"""
+        if self.samples is None:
+            return f"Collector process: off{f' ({self.error})' if self.error else ''}"
+        sample = self.latest()
+        age = f"{time.time() - sample.timestamp:.1f} s ago, {sample.collect_ms:.1f} ms" if sample else "no samples yet"
+        state = f"pid {self.pid}" if self.pid else "restarting"
+        jobs = f", jobs: {', '.join(sorted(self.settings))}" if self.settings else ""
+        lost = f", {self.lost_messages} messages lost" if self.lost_messages else ""
+        error = f", last error: {self.error}" if self.error else ""
+        return (f"Collector process: {state}, {self.samples.write_seq} samples, last {age}, "
+                f"{self.restarts} restarts{jobs}{lost}{error}")
+
+
+class RemoteIntegrity:
+    """IntegrityMonitor stand-in whose walking and hashing run in the collector process"""
+
+    def __init__(self, supervisor: CollectorSupervisor, paths: List[str], baseline_path: str,
+                 on_changes: Callable[[List[integrity.Change]], None]):
+        self.supervisor = supervisor
+        self.paths = integrity.normalize_paths(paths)
+        self.baseline_path = baseline_path
+        self.on_changes = on_changes
+        self.status: Optional[Dict] = None
+        self._pending: List[integrity.Change] = []
+
+    def start(self):
+        self.supervisor.handlers['integrity_changes'] = self._on_changes
+        self.supervisor.handlers['integrity_status'] = self._on_status
+        self.supervisor.configure('integrity', {'paths': self.paths, 'baseline': self.baseline_path})
+
+    def stop(self):
+        self.supervisor.configure('integrity', None)
+        for kind, handler in (('integrity_changes', self._on_changes), ('integrity_status', self._on_status)):
+            if self.supervisor.handlers.get(kind) == handler:
+                del self.supervisor.handlers[kind]
+
+    def _on_changes(self, message: Dict):
+        self._pending.extend(integrity.Change(*entry) for entry in message['changes'])
+        if not message['more']:
+            changes, self._pending = self._pending, []
+            if changes:
+                self.on_changes(changes)
+
+    def _on_status(self, message: Dict):
+        self.status = message['status']
+
+    def format_table(self) -> str:
+        """Status block for the threat view"""
+        if self.status is None:
+            return "File integrity: starting in the collector process"
+        return integrity.format_status(self.status, " in the collector process")
+
+
+if __name__ == "__main__":
+    import json
+    sample_ring = SampleRing.attach(sys.argv[1])
+    message_ring = MessageRing.attach(sys.argv[2])
+    try:
+        collect_forever(sample_ring, message_ring, int(sys.argv[3]), json.loads(sys.argv[4]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sample_ring.close()
+        message_ring.close()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Persistent Configuration
+JSON/TOML config file with hot reload (inotify, polling fallback)
+"""
+
+import copy
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import inotify
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".config", "securenet", "config.json")
+
+DEFAULT_CONFIG = {
+    'security': {
+        'vpn_check_enabled': True,
+        'anticheat_enabled': True,
+        'threat_detection': True,
+        'max_cpu_threshold': 85,
+        'max_memory_threshold': 90,
+        'max_latency_ms': 500,
+        'metrics_port': None,
+        'path_probe': True,
+        'anticheat_watch': [],      # process names to protect (debugger / LD_PRELOAD checks)
+        'scan_port_threshold': 20,      # distinct local ports one source may touch per minute
+        'scan_conn_threshold': 200,     # new inbound connections one source may open per minute
+        'packet_capture': False,        # AF_PACKET capture for traffic stats (needs CAP_NET_RAW)
+        'capture_interface': None,      # None captures every interface except loopback
+        'collector_process': True,      # system sampling and integrity hashing in a supervised child process (x86)
+    },
+    # Alert pipeline: debounce, flap suppression and grouping before notifications go to alert_sinks
+    'alerts': {
+        'pending_seconds': 10,      # a condition must hold this long before it notifies
+        'clear_seconds': 30,        # ...and stay clear this long before its resolve does
+        'group_seconds': 10,        # notifications from one source within this window are sent together
+        'flap_transitions': 6,      # state changes per 10 minutes that mark an alert as flapping
+    },
+    # Site SLOs behind the dashboard's rolling 1h/24h/30d uptime and the error-budget burn alerts
+    'slo': {
+        'availability': 99.9,       # percent of probes that must succeed
+        'latency_ms': 1000,         # successful probes at or under this count as fast
+        'latency': 99.0,            # percent of successful probes that must be fast
+    },
+    'intervals': {
+        'sample_seconds': 2,
+        'vpn_every': 10,
+        'sites_every': 5,
+        'tls_every': 15,
+        'site_timeout': 5,
+        'ping_seconds': 1,
+        'history_days': 90,         # days of sample history kept on disk for replay and reports
+    },
+    'sites': [
+        {'url': 'https://google.com', 'name': 'Google'},
+        {'url': 'https://github.com', 'name': 'GitHub'},
+        {'url': 'https://cloudflare.com', 'name': 'Cloudflare'},
+    ],
+    # Latency probe targets: "host:port" (TCP connect) or "host" (ICMP echo where permitted);
+    # empty probes the internet check address
+    'latency_targets': [],
+    # Bulk site lists (.csv, .json/.jsonl or one URL per line), merged with 'sites'
+    'site_sources': [],
+    # Per-group overrides keyed by group name or host, e.g. {"example.com": {"interval": 60, "timeout": 10}}
+    'site_groups': {},
+    # File integrity monitoring: files or directory trees to baseline and watch (empty disables)
+    'integrity_paths': [],
+    # Logs tailed for brute-force and scanning signatures (syslog/journal text, combined access logs);
+    # missing files are picked up when they appear
+    'log_sources': ['/var/log/auth.log', '/var/log/secure', '/var/log/nginx/access.log'],
+    # Scripted multi-step HTTP checks run alongside the sites, e.g.
+    # {"name": "API login", "interval": 60, "variables": {"user": "probe"}, "steps": [
+    #   {"name": "login", "method": "POST", "url": "https://api.example.com/login", "json": {"user": "${user}"},
+    #    "expect": {"status": 200, "max_ms": 800}, "extract": {"token": "$.token"}},
+    #   {"name": "profile", "url": "https://api.example.com/me", "headers": {"Authorization": "Bearer ${token}"},
+    #    "expect": {"status": 200, "json": {"$.user": "probe"}, "body": "\"active\":\\s*true"}}]}
+    'synthetic_checks': [],
+    # Where alerts go: "file:PATH" (JSON lines), "webhook:URL" (JSON POST), "syslog" or
+    # "syslog:HOST:PORT", "desktop" (notify-send)
+    'alert_sinks': [],
+}
+
+
+def config_path() -> str:
+    """Config location, overridable with SECURENET_CONFIG"""
+    return os.environ.get("SECURENET_CONFIG") or DEFAULT_PATH
+
+
+def data_path(name: str, path: Optional[str] = None) -> str:
+    """A state file stored alongside the config file in use (path, else config_path())"""
+    return os.path.join(os.path.dirname(os.path.abspath(path or config_path())), name)
+
+
+def defaults() -> Dict:
+    """A fresh copy of the built-in configuration"""
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+
+def _merge(defaults: Dict, loaded: Dict) -> Dict:
+    merged = copy.deepcopy(defaults)
+    for key, value in loaded.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+_OBJECT_LISTS = ('sites', 'synthetic_checks')     # every other list holds strings
+_OPTIONAL_NUMBERS = ('security.metrics_port',)     # default None, else a number
+
+
+def _check_types(path: str, loaded: Dict):
+    """Raise ValueError unless each known section and setting has its default's type"""
+    for section, default in DEFAULT_CONFIG.items():
+        if section not in loaded:
+            continue
+        value = loaded[section]
+        if isinstance(default, dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"{path}: {section} must be an object")
+            for key, setting in value.items():
+                _check_setting(path, f"{section}.{key}", default.get(key), setting)
+            if section == 'site_groups' and not all(isinstance(group, dict) for group in value.values()):
+                raise ValueError(f"{path}: site_groups must map names to objects")
+        elif isinstance(default, list):
+            _check_setting(path, section, default, value)
+            kind = dict if section in _OBJECT_LISTS else str
+            if not all(isinstance(item, kind) for item in value):
+                raise ValueError(f"{path}: {section} must hold only {'objects' if kind is dict else 'strings'}")
+
+
+def _check_setting(path: str, name: str, default, value):
+    if name in _OPTIONAL_NUMBERS:
+        default = 0
+    if value is None or default is None:
+        return      # unset optional, or a setting without a typed default
+    if isinstance(default, bool):
+        ok = isinstance(value, bool)
+    elif isinstance(default, (int, float)):
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+    else:
+        ok = isinstance(value, type(default))
+    if not ok:
+        expected = {bool: "true or false", list: "a list", dict: "an object", str: "a string"}.get(type(default), "a number")
+        raise ValueError(f"{path}: {name} must be {expected}")
+
+
+def load(path: Optional[str] = None) -> Dict:
+    """Load the config file merged over the defaults (defaults if missing)"""
+    path = path or config_path()
+    try:
+        if path.endswith(".toml"):
+            import tomllib
+            with open(path, "rb") as f:
+                loaded = tomllib.load(f)
+        else:
+            import json
+            with open(path, encoding="utf-8") as f:
+                loaded = json.load(f)
+    except FileNotFoundError:
+        return defaults()
+    if not isinstance(loaded, dict):
+        raise ValueError(f"{path}: top level must be an object")
+    security = loaded.get('security', {})
+    if isinstance(security, dict):
+        # TOML has no null; an empty string disables optional values
+        for key, value in list(security.items()):
+            if value == "":
+                security[key] = None
+    _check_types(path, loaded)
+    return _merge(DEFAULT_CONFIG, loaded)
+
+
+def _toml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return '""'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, list):
+        return f"[{', '.join(_toml_value(item) for item in value)}]"
+    import json
+    return json.dumps(str(value))
+
+
+def _toml_table(name: str, values: Dict, lines: List[str]):
+    lines.append(f"[{name}]")
+    nested = []
+    for key, value in values.items():
+        if isinstance(value, dict):
+            nested.append((key, value))
+        else:
+            lines.append(f"{key} = {_toml_value(value)}")
+    lines.append("")
+    for key, value in nested:
+        _toml_table(f"{name}.{_toml_value(key)}", value, lines)
+
+
+def dumps_toml(data: Dict) -> str:
+    """Serialise the config schema (tables, array of site tables, lists of strings)"""
+    lines = []
+    # Plain arrays are top-level keys and must come before any table
+    for section, values in data.items():
+        if isinstance(values, list) and not any(isinstance(item, dict) for item in values):
+            lines.append(f"{section} = {_toml_value(values)}")
+    if lines:
+        lines.append("")
+    for section, values in data.items():
+        if isinstance(values, dict):
+            _toml_table(section, values, lines)
+        elif isinstance(values, list) and any(isinstance(item, dict) for item in values):
+            for item in values:
+                lines.append(f"[[{section}]]")
+                lines.extend(f"{key} = {_toml_value(value)}" for key, value in item.items())
+                lines.append("")
+    return "\n".join(lines)
+
+
+def save(data: Dict, path: Optional[str] = None):
+    """Atomically write the config file"""
+    path = path or config_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".toml"):
+        text = dumps_toml(data)
+    else:
+        import json
+        text = json.dumps(data, indent=2) + "\n"
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def site_key(site: Dict) -> str:
+    return site['url'].strip().rstrip("/").lower()
+
+
+def diff_sites(current: List[Dict], desired: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Tuple[Dict, Dict]]]:
+    """Compare site lists by URL: returns (added, removed, changed) without touching either"""
+    current_by_key = {site_key(s): s for s in current}
+    desired_by_key = {}
+    for site in desired:
+        desired_by_key.setdefault(site_key(site), site)
+
+    added = [s for k, s in desired_by_key.items() if k not in current_by_key]
+    removed = [s for k, s in current_by_key.items() if k not in desired_by_key]
+    changed = []
+    for key, new in desired_by_key.items():
+        old = current_by_key.get(key)
+        if old is not None and any(old.get(f) != v for f, v in new.items() if f != 'status'):
+            changed.append((old, new))
+    return added, removed, changed
+
+
+class ConfigWatcher:
+    """Calls on_change(config) whenever the file changes on disk"""
+
+    def __init__(self, path: str, on_change: Callable[[Dict], None], poll_interval: float = 1.0,
+                 debounce: float = 0.2):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        # Confirmed by the watcher thread, which is the first to load libc
+        self.mode = "inotify" if sys.platform.startswith("linux") else "polling"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except OSError:
+            return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="securenet-config", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        if self.mode == "inotify" and not inotify.available():
+            self.mode = "polling"
+        if self.mode == "inotify":
+            try:
+                self._watch_inotify()
+                return
+            except OSError as e:
+                print(f"Config watcher: inotify unavailable ({e}), polling instead")
+                self.mode = "polling"
+        while not self._stop.wait(self.poll_interval):
+            self._check()
+
+    def _watch_inotify(self):
+        directory, name = os.path.split(self.path)
+        os.makedirs(directory, exist_ok=True)
+        mask = inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_CREATE | inotify.IN_DELETE
+        with inotify.Inotify() as watcher:
+            # Watch the directory: editors and save() replace the file by rename
+            watcher.add_watch(directory, mask | inotify.IN_ONLYDIR)
+            while not self._stop.is_set():
+                events = watcher.read_events(timeout=1.0)
+                if any(e.name == name or e.mask & inotify.IN_Q_OVERFLOW for e in events):
+                    time.sleep(self.debounce)
+                    watcher.read_events(timeout=0)
+                    self._check()
+
+    def _check(self):
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            data = load(self.path)
+        except (ValueError, OSError) as e:
+            print(f"Config reload error: {e}")
+            return
+        try:
+            self.on_change(data)
+        except Exception as e:
+            print(f"Config apply error: {e}")
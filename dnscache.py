@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - DNS Cache & Resolver Health
+TTL-respecting stub resolver with parallel A/AAAA queries and per-resolver metrics
+"""
+
+import ipaddress
+import secrets
+import select
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+QTYPE_A = 1
+QTYPE_CNAME = 5
+QTYPE_AAAA = 28
+
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+MIN_TTL = 5
+MAX_TTL = 3600
+NEGATIVE_TTL = 30
+FALLBACK_TTL = 60       # getaddrinfo() exposes no TTL
+DEFAULT_TIMEOUT = 2.0
+MAX_ENTRIES = 10000
+
+Address = Tuple[int, str]   # (family, ip)
+
+
+def read_nameservers(path: str = "/etc/resolv.conf") -> List[str]:
+    """Nameserver addresses from resolv.conf (empty if unavailable)"""
+    servers = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    servers.append(parts[1].split("%", 1)[0])
+    except OSError:
+        pass
+    return servers
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+# === WIRE PROTOCOL ===
+
+def build_query(qid: int, name: str, qtype: int) -> bytes:
+    """Encode a recursive query for name/qtype"""
+    header = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    qname = b"".join(
+        bytes([len(label)]) + label
+        for label in (part.encode("idna") for part in name.rstrip(".").split("."))
+        if label
+    )
+    return header + qname + b"\x00" + struct.pack(">HH", qtype, 1)
+
+
+def _read_name(buf: bytes, pos: int) -> Tuple[str, int]:
+    """Lower-cased name at pos (following compression pointers) and the offset just past it"""
+    labels = []
+    end = None
+    for _ in range(128):        # bounds pointer loops
+        length = buf[pos]
+        if length == 0:
+            return b".".join(labels).decode("ascii", "replace").lower(), pos + 1 if end is None else end
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = pos + 2
+            pos = ((length & 0x3F) << 8) | buf[pos + 1]
+            continue
+        labels.append(buf[pos + 1:pos + 1 + length])
+        pos += 1 + length
+    raise ValueError("name compression loop")
+
+
+def parse_question(buf: bytes) -> Tuple[str, int]:
+    """(name, qtype) of the first question in a query or response"""
+    if struct.unpack_from(">H", buf, 4)[0] < 1:
+        raise ValueError("no question section")
+    name, pos = _read_name(buf, 12)
+    return name, struct.unpack_from(">H", buf, pos)[0]
+
+
+def _skip_name(buf: bytes, pos: int) -> int:
+    while True:
+        length = buf[pos]
+        if length == 0:
+            return pos + 1
+        if length & 0xC0 == 0xC0:
+            return pos + 2
+        pos += 1 + length
+
+
+def parse_response(buf: bytes) -> Tuple[int, int, List[Address], int]:
+    """Decode a response into (id, rcode, addresses, min_ttl)"""
+    qid, flags, qdcount, ancount, nscount, _ = struct.unpack_from(">HHHHHH", buf, 0)
+    rcode = flags & 0x000F
+    if flags & 0x0200:
+        raise ValueError("truncated response")
+    pos = 12
+    for _ in range(qdcount):
+        pos = _skip_name(buf, pos) + 4
+
+    addresses: List[Address] = []
+    ttl = MAX_TTL
+    for _ in range(ancount + nscount):
+        pos = _skip_name(buf, pos)
+        rtype, _, rttl, rdlength = struct.unpack_from(">HHIH", buf, pos)
+        pos += 10
+        if rtype == QTYPE_A and rdlength == 4:
+            addresses.append((socket.AF_INET, socket.inet_ntop(socket.AF_INET, buf[pos:pos + 4])))
+        elif rtype == QTYPE_AAAA and rdlength == 16:
+            addresses.append((socket.AF_INET6, socket.inet_ntop(socket.AF_INET6, buf[pos:pos + 16])))
+        ttl = min(ttl, rttl)
+        pos += rdlength
+    return qid, rcode, addresses, ttl
+
+
+# === RESOLVER ===
+
+class ResolverStats:
+    """Outcome counters for one upstream resolver"""
+
+    __slots__ = ("queries", "answers", "nxdomain", "servfail", "timeouts", "errors")
+
+    def __init__(self):
+        self.queries = 0
+        self.answers = 0
+        self.nxdomain = 0
+        self.servfail = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def rate(self, count: int) -> float:
+        return count / self.queries if self.queries else 0.0
+
+
+class ResolveResult:
+    """Outcome of a lookup"""
+
+    __slots__ = ("host", "addresses", "ttl", "rcode", "cached", "seconds", "resolver")
+
+    def __init__(self, host, addresses, ttl, rcode=RCODE_NOERROR, cached=False, seconds=0.0, resolver=""):
+        self.host = host
+        self.addresses = addresses
+        self.ttl = ttl
+        self.rcode = rcode
+        self.cached = cached
+        self.seconds = seconds
+        self.resolver = resolver
+
+
+class DNSCache:
+    """Caching stub resolver
+
+    Queries the resolv.conf nameservers directly so answer TTLs are known,
+    sends A and AAAA together, and records per-resolver latency into a
+    latency.LatencyRecorder under the 'dns_lookup' probe type.
+    """
+
+    def __init__(self, recorder=None, nameservers: Optional[List[str]] = None,
+                 timeout: float = DEFAULT_TIMEOUT, max_entries: int = MAX_ENTRIES):
+        self.recorder = recorder
+        self.nameservers = read_nameservers() if nameservers is None else nameservers
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.stats: Dict[str, ResolverStats] = {ns: ResolverStats() for ns in self.nameservers}
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Tuple[float, List[Address], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._original_getaddrinfo = None
+
+    # --- cache ---
+
+    def lookup_cached(self, host: str) -> Optional[ResolveResult]:
+        """Fresh cache entry for host, or None"""
+        key = host.lower().rstrip(".")
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, addresses, rcode = entry
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return ResolveResult(host, addresses, int(remaining), rcode, cached=True)
+
+    def _store(self, host: str, addresses: List[Address], ttl: int, rcode: int):
+        key = host.lower().rstrip(".")
+        ttl = NEGATIVE_TTL if not addresses else max(MIN_TTL, min(MAX_TTL, ttl))
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, addresses, rcode)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def flush(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    # --- resolution ---
+
+    def resolve(self, host: str) -> ResolveResult:
+        """Resolve host, answering from the cache while the TTL lasts"""
+        if is_ip_address(host):
+            family = socket.AF_INET6 if ":" in host else socket.AF_INET
+            return ResolveResult(host, [(family, host)], MAX_TTL)
+
+        cached = self.lookup_cached(host)
+        if cached is not None:
+            return cached
+        with self._lock:
+            self.misses += 1
+
+        result = None
+        if "." in host.strip(".") and self.nameservers:
+            for server in self.nameservers:
+                result = self.query(server, host)
+                if result is not None and result.rcode in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                    break
+        if result is None or not result.addresses:
+            # /etc/hosts and other NSS sources only answer through getaddrinfo; a name is
+            # cached as missing only once the system resolver has not found it either
+            result = self._resolve_system(host)
+
+        self._store(host, result.addresses, result.ttl, result.rcode)
+        return result
+
+    def query(self, server: str, host: str) -> Optional[ResolveResult]:
+        """Send A and AAAA queries to one server in parallel; None on timeout"""
+        stats = self.stats.setdefault(server, ResolverStats())
+        stats.queries += 1
+        family = socket.AF_INET6 if ":" in server else socket.AF_INET
+        ids = {secrets.randbits(16): QTYPE_A}
+        while len(ids) < 2:
+            ids.setdefault(secrets.randbits(16), QTYPE_AAAA)
+
+        start = time.perf_counter()
+        try:
+            with socket.socket(family, socket.SOCK_DGRAM) as sock:
+                sock.connect((server, 53))
+                questions = {}
+                for qid, qtype in ids.items():
+                    packet = build_query(qid, host, qtype)
+                    questions[qid] = parse_question(packet)
+                    sock.send(packet)
+
+                addresses: List[Address] = []
+                ttl = MAX_TTL
+                rcode = RCODE_NOERROR
+                deadline = start + self.timeout
+                pending = set(ids)
+                while pending:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                        stats.timeouts += 1
+                        return None
+                    buf = sock.recv(4096)
+                    try:
+                        qid = struct.unpack_from(">H", buf, 0)[0]
+                        # An answer only counts if it echoes the question it claims to answer
+                        if qid not in pending or parse_question(buf) != questions[qid]:
+                            continue
+                        qid, answer_rcode, answer_addrs, answer_ttl = parse_response(buf)
+                    except (ValueError, struct.error, IndexError):
+                        continue        # malformed or spoofed datagram: keep waiting for the real answer
+                    pending.discard(qid)
+                    addresses.extend(answer_addrs)
+                    ttl = min(ttl, answer_ttl)
+                    if answer_rcode != RCODE_NOERROR:
+                        rcode = answer_rcode
+        except (OSError, ValueError, struct.error, IndexError):
+            stats.errors += 1
+            return None
+
+        elapsed = time.perf_counter() - start
+        if rcode == RCODE_NXDOMAIN:
+            stats.nxdomain += 1
+        elif rcode == RCODE_SERVFAIL:
+            stats.servfail += 1
+        else:
+            stats.answers += 1
+        if self.recorder is not None:
+            self.recorder.record('dns_lookup', server, elapsed)
+        # IPv4 first: many networks still lack working IPv6 routes
+        addresses.sort(key=lambda addr: addr[0] != socket.AF_INET)
+        return ResolveResult(host, addresses, ttl, rcode, seconds=elapsed, resolver=server)
+
+    def _resolve_system(self, host: str) -> ResolveResult:
+        start = time.perf_counter()
+        try:
+            infos = self._getaddrinfo(host, None, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            return ResolveResult(host, [], NEGATIVE_TTL, RCODE_NXDOMAIN, seconds=time.perf_counter() - start,
+                                 resolver="system")
+        elapsed = time.perf_counter() - start
+        addresses: List[Address] = []
+        for family, _, _, _, sockaddr in infos:
+            addr = (family, sockaddr[0])
+            if addr not in addresses:
+                addresses.append(addr)
+        if self.recorder is not None:
+            self.recorder.record('dns_lookup', "system", elapsed)
+        return ResolveResult(host, addresses, FALLBACK_TTL, seconds=elapsed, resolver="system")
+
+    def probe_resolvers(self, host: str) -> Dict[str, Optional[ResolveResult]]:
+        """Query every resolver directly (bypassing the cache) to measure its health"""
+        if is_ip_address(host):
+            return {}
+        return {server: self.query(server, host) for server in self.nameservers}
+
+    # --- socket.getaddrinfo integration ---
+
+    def _getaddrinfo(self, *args, **kwargs):
+        return (self._original_getaddrinfo or socket.getaddrinfo)(*args, **kwargs)
+
+    def install(self):
+        """Route socket.getaddrinfo through the cache so HTTP clients skip repeat lookups"""
+        if self._original_getaddrinfo is not None:
+            return
+        original = self._original_getaddrinfo = socket.getaddrinfo
+
+        def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+            if (not isinstance(host, str) or is_ip_address(host) or host == "localhost"
+                    or flags & (socket.AI_NUMERICHOST | socket.AI_CANONNAME)):
+                return original(host, port, family, type, proto, flags)
+            try:
+                result = self.resolve(host)
+                if not result.addresses:
+                    return original(host, port, family, type, proto, flags)
+                if isinstance(port, str):
+                    port = int(port) if port.isdigit() else socket.getservbyname(port)
+                port = port or 0
+                socktypes = [type] if type else [socket.SOCK_STREAM, socket.SOCK_DGRAM]
+                infos = []
+                for addr_family, ip in result.addresses:
+                    if family not in (0, addr_family):
+                        continue
+                    sockaddr = (ip, port) if addr_family == socket.AF_INET else (ip, port, 0, 0)
+                    for socktype in socktypes:
+                        sock_proto = proto or (socket.IPPROTO_TCP if socktype == socket.SOCK_STREAM
+                                               else socket.IPPROTO_UDP)
+                        infos.append((addr_family, socktype, sock_proto, "", sockaddr))
+                return infos or original(host, port, family, type, proto, flags)
+            except Exception:
+                return original(host, port, family, type, proto, flags)
+
+        socket.getaddrinfo = getaddrinfo
+
+    def uninstall(self):
+        if self._original_getaddrinfo is not None:
+            socket.getaddrinfo = self._original_getaddrinfo
+            self._original_getaddrinfo = None
+
+    # --- reporting ---
+
+    def format_table(self) -> str:
+        """Resolver health table"""
+        total = self.hits + self.misses
+        lines = [
+            f"DNS cache: {len(self)} entries, hit rate {self.hits / total * 100 if total else 0:.1f}% "
+            f"({self.hits} hits / {self.misses} misses)",
+            f"{'Resolver':<28}{'Queries':>9}{'NXDOMAIN':>10}{'SERVFAIL':>10}{'Timeout':>9}{'Errors':>8}",
+        ]
+        for server, s in self.stats.items():
+            lines.append(f"{server:<28}{s.queries:>9}{s.rate(s.nxdomain) * 100:>9.1f}%"
+                         f"{s.rate(s.servfail) * 100:>9.1f}%{s.rate(s.timeouts) * 100:>8.1f}%{s.errors:>8}")
+        if not self.stats:
+            lines.append("No resolvers in /etc/resolv.conf; using the system resolver.")
+        return "\n".join(lines)
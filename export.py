@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - History Export
+Streaming CSV/JSON Lines/columnar export and daily summary reports read from the history store
+"""
+
+import csv
+import heapq
+import json
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:     # optional; "columnar" gives the same layout with the standard library
+    pyarrow = None
+
+import alerts
+import history
+import rules
+import wire_format
+
+FORMATS = ("csv", "jsonl", "columnar", "parquet")
+EXTENSIONS = {'csv': ".csv", 'jsonl': ".jsonl", 'columnar': ".snc", 'parquet': ".parquet"}
+BATCH_ROWS = 4096               # rows written per call; cancellation is checked between batches
+ROW_GROUP_ROWS = 65536          # samples of one series per columnar row group
+COLUMNAR_MAGIC = b"SNC1"
+PERCENTILES = (50, 95, 99)
+MAX_INCIDENTS = 50
+REPORT_SERIES = ('cpu', 'memory', 'latency', 'network_in', 'network_out')
+
+_FOOTER = struct.Struct("<I4s")
+
+
+def format_for(path: str) -> str:
+    """Export format implied by a file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, known in EXTENSIONS.items():
+        if ext == known:
+            return fmt
+    raise ValueError(f"unknown export extension: {ext or path}")
+
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in FORMATS if fmt != "parquet" or pyarrow is not None]
+
+
+@lru_cache(maxsize=256)
+def _iso_second(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def iso_time(timestamp_ms: int) -> str:
+    # Rows arrive in time order, so consecutive samples mostly share the formatted second
+    return f"{_iso_second(timestamp_ms // 1000)}.{timestamp_ms % 1000:03d}Z"
+
+
+def iter_rows(store, series: List[str], start_ms: Optional[int] = None,
+              end_ms: Optional[int] = None) -> Iterator[Tuple[int, str, float]]:
+    """(timestamp_ms, series, value) across series in time order, one frame per series in memory"""
+    def rows(name):
+        for timestamps, values in store.read(name, start_ms, end_ms):
+            for ts, value in zip(timestamps, values):
+                yield ts, name, value
+
+    return heapq.merge(*(rows(name) for name in series))
+
+
+def iter_row_groups(store, series: List[str], start_ms: Optional[int] = None, end_ms: Optional[int] = None,
+                    rows: int = ROW_GROUP_ROWS) -> Iterator[Tuple[str, List[int], List[float]]]:
+    """(series, timestamps, values) blocks of up to `rows` samples, one series after another"""
+    for name in series:
+        timestamps: List[int] = []
+        values: List[float] = []
+        for chunk_ts, chunk_values in store.read(name, start_ms, end_ms):
+            timestamps.extend(chunk_ts)
+            values.extend(chunk_values)
+            if len(timestamps) >= rows:
+                yield name, timestamps, values
+                timestamps, values = [], []
+        if timestamps:
+            yield name, timestamps, values
+
+
+# === EXPORT ===
+
+class ExportJob:
+    """One export of a time range to a file; run() blocks, progress and cancel() are thread-safe"""
+
+    def __init__(self, store, path: str, fmt: Optional[str] = None, series: Optional[List[str]] = None,
+                 start_ms: Optional[int] = None, end_ms: Optional[int] = None):
+        self.fmt = fmt or format_for(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"unknown export format: {self.fmt}")
+        if self.fmt == "parquet" and pyarrow is None:
+            raise ValueError("parquet export needs pyarrow; use 'columnar' instead")
+        self.store = store
+        self.path = path
+        self.series = series
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.rows = 0
+        self.done = False
+        self.error = ""
+        self.elapsed = 0.0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self) -> "ExportJob":
+        """Write to <path>.part and move it into place only once complete"""
+        started = time.perf_counter()
+        series = self.series if self.series is not None else self.store.series()
+        partial = self.path + ".part"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            getattr(self, f"_write_{self.fmt}")(partial, series)
+            if self.cancelled:
+                self.error = "cancelled"
+                os.remove(partial)
+            else:
+                os.replace(partial, self.path)
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            print(f"Export error: {e}")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+        finally:
+            self.elapsed = time.perf_counter() - started
+            self.done = True
+        return self
+
+    def _batches(self, series: List[str]) -> Iterator[List[Tuple[int, str, float]]]:
+        batch = []
+        for row in iter_rows(self.store, series, self.start_ms, self.end_ms):
+            batch.append(row)
+            if len(batch) >= BATCH_ROWS:
+                yield batch
+                self.rows += len(batch)
+                batch = []
+                if self.cancelled:
+                    return
+        if batch:
+            yield batch
+            self.rows += len(batch)
+
+    def _write_csv(self, path: str, series: List[str]):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("timestamp_ms", "time", "series", "value"))
+            for batch in self._batches(series):
+                writer.writerows((ts, iso_time(ts), name, value) for ts, name, value in batch)
+
+    def _write_jsonl(self, path: str, series: List[str]):
+        names = {name: json.dumps(name) for name in series}
+        with open(path, "w", encoding="utf-8") as f:
+            for batch in self._batches(series):
+                f.write("".join(
+                    f'{{"timestamp_ms": {ts}, "time": "{iso_time(ts)}", "series": {names[name]}, '
+                    f'"value": {json.dumps(value)}}}\n'
+                    for ts, name, value in batch
+                ))
+
+    def _write_columnar(self, path: str, series: List[str]):
+        """Row groups of wire-format frames with per-group statistics in a JSON footer
+
+        Like Parquet, a reader finds the footer from the end of the file and can
+        skip whole row groups by series and time range without decoding them.
+        """
+        groups = []
+        with open(path, "wb") as f:
+            f.write(COLUMNAR_MAGIC)
+            for name, timestamps, values in iter_row_groups(self.store, series, self.start_ms, self.end_ms):
+                data = wire_format.encode_series(timestamps, values, precision=None)
+                groups.append({
+                    'series': name, 'offset': f.tell(), 'length': len(data), 'rows': len(values),
+                    'min_ts': timestamps[0], 'max_ts': timestamps[-1],
+                    'min': min(values), 'max': max(values),
+                })
+                f.write(data)
+                self.rows += len(values)
+                if self.cancelled:
+                    return
+            footer = json.dumps({'version': 1, 'columns': ["timestamp_ms", "value"],
+                                 'row_groups': groups}).encode()
+            f.write(footer)
+            f.write(_FOOTER.pack(len(footer), COLUMNAR_MAGIC))
+
+    def _write_parquet(self, path: str, series: List[str]):
+        schema = pyarrow.schema([("timestamp_ms", pyarrow.int64()), ("series", pyarrow.string()),
+                                 ("value", pyarrow.float64())])
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            for name, timestamps, values in iter_row_groups(self.store, series, self.start_ms, self.end_ms):
+                writer.write_table(pyarrow.table(
+                    {"timestamp_ms": timestamps, "series": [name] * len(values), "value": values},
+                    schema=schema))
+                self.rows += len(values)
+                if self.cancelled:
+                    return
+
+
+def read_columnar(path: str, series: Optional[str] = None, start_ms: Optional[int] = None,
+                  end_ms: Optional[int] = None) -> Iterator[Tuple[str, List[int], List[float]]]:
+    """Yield (series, timestamps, values) row groups from a columnar export, skipping by footer stats"""
+    with open(path, "rb") as f:
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        length, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError("not a SecureNet columnar export")
+        f.seek(-_FOOTER.size - length, os.SEEK_END)
+        footer = json.loads(f.read(length))
+        for group in footer['row_groups']:
+            if ((series is not None and group['series'] != series)
+                    or (start_ms is not None and group['max_ts'] < start_ms)
+                    or (end_ms is not None and group['min_ts'] >= end_ms)):
+                continue
+            f.seek(group['offset'])
+            timestamps, values = wire_format.decode_series(f.read(group['length']))
+            if start_ms is not None or end_ms is not None:
+                keep = [i for i, ts in enumerate(timestamps)
+                        if (start_ms is None or ts >= start_ms) and (end_ms is None or ts < end_ms)]
+                timestamps, values = [timestamps[i] for i in keep], [values[i] for i in keep]
+            yield group['series'], timestamps, values
+
+
+# === DAILY REPORT ===
+
+def scan_series(store, series: str, start_ms: int, end_ms: int,
+                test: Optional[Callable[[float], bool]] = None) -> Optional[Dict]:
+    """Summary statistics of one series in a single streaming pass
+
+    Stored values are quantised by their precision, so a Counter of values gives
+    exact percentiles in memory bounded by the distinct values, not the samples.
+    Stretches where test(value) holds are collected as (start_ms, end_ms).
+    """
+    counts: Counter = Counter()
+    total = 0.0
+    first = last = None
+    stretches = []
+    opened = None
+    for timestamps, values in store.read(series, start_ms, end_ms):
+        counts.update(values)
+        total += sum(values)
+        if first is None:
+            first = values[0]
+        last = values[-1]
+        if test is not None:
+            for ts, value in zip(timestamps, values):
+                if test(value):
+                    if opened is None:
+                        opened = ts
+                elif opened is not None:
+                    stretches.append((opened, ts))
+                    opened = None
+    samples = sum(counts.values())
+    if not samples:
+        return None
+    if opened is not None:
+        stretches.append((opened, end_ms))
+    summary = {'samples': samples, 'mean': total / samples, 'min': min(counts), 'max': max(counts),
+               'first': first, 'last': last, 'stretches': stretches}
+    summary.update(percentiles(counts, samples))
+    return summary
+
+
+def percentiles(counts: Counter, samples: int, wanted=PERCENTILES) -> Dict[str, float]:
+    """Nearest-rank percentiles from a value histogram"""
+    result = {}
+    targets = [(p, max(1, -(-p * samples // 100))) for p in wanted]
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        while targets and seen >= targets[0][1]:
+            result[f"p{targets[0][0]}"] = value
+            targets.pop(0)
+        if not targets:
+            break
+    return result
+
+
+def site_ids(store) -> List[str]:
+    """IDs of sites with stored probe results"""
+    suffix = ".up"
+    return [name[len(history.SITE_PREFIX):-len(suffix)] for name in store.series()
+            if name.startswith(history.SITE_PREFIX) and name.endswith(suffix)]
+
+
+def daily_report(store, day: str, limits: Optional[Dict[str, float]] = None,
+                 alert_settings: Optional[Dict] = None) -> Dict:
+    """Percentiles, per-site uptime and incidents for one UTC day
+
+    Incidents are site outages and threshold breaches that lasted at least the
+    alert pipeline's pending time, i.e. the ones that would have notified.
+    """
+    start_ms = history.day_start(day)
+    end_ms = start_ms + 86400 * 1000
+    limits = limits or {}
+    min_ms = (alert_settings or {}).get('pending_seconds', alerts.PENDING_SECONDS) * 1000
+    report = {'day': day, 'generated': iso_time(int(time.time() * 1000)),
+              'series': {}, 'sites': {}, 'stats': {}, 'incidents': []}
+    incidents = []
+
+    rules_by_series = {rule.series: rule for rule in rules.THRESHOLD_RULES}
+    for series in REPORT_SERIES:
+        rule = rules_by_series.get(series)
+        limit = limits.get(rule.setting) if rule is not None else None
+        test = (lambda value, rule=rule, limit=limit: rule.breached(value, limit)) if limit is not None else None
+        summary = scan_series(store, series, start_ms, end_ms, test)
+        if summary is None:
+            continue
+        for opened, closed in summary.pop('stretches'):
+            if closed - opened >= min_ms:
+                incidents.append({'kind': "threshold", 'name': rule.title(), 'start': opened, 'end': closed,
+                                  'detail': f"above {limit}{rule.unit}"})
+        report['series'][series] = summary
+
+    labels = store.site_labels()
+    for site in site_ids(store):
+        up = scan_series(store, history.site_series(site, "up"), start_ms, end_ms, test=lambda value: value < 1)
+        if up is None:
+            continue
+        # Series from before site IDs were named after the site itself
+        label = labels.get(site, {})
+        entry = {'name': label.get('name', site), 'url': label.get('url', ""),
+                 'probes': up['samples'], 'uptime_percent': up['mean'] * 100}
+        response = scan_series(store, history.site_series(site, "response_ms"), start_ms, end_ms)
+        if response is not None:
+            response.pop('stretches')
+            entry['response_ms'] = {key: response[key] for key in ('mean', 'p50', 'p95', 'p99', 'max')}
+        for opened, closed in up['stretches']:
+            if closed - opened >= min_ms:
+                incidents.append({'kind': "site", 'name': f"{entry['name']} down", 'start': opened, 'end': closed,
+                                  'detail': ""})
+        report['sites'][site] = entry
+
+    for name in store.series():
+        if name.startswith(history.STATS_PREFIX):
+            summary = scan_series(store, name, start_ms, end_ms)
+            if summary is not None:
+                report['stats'][name[len(history.STATS_PREFIX):]] = {
+                    'last': summary['last'], 'change': summary['last'] - summary['first']}
+
+    incidents.sort(key=lambda incident: incident['start'])
+    for incident in incidents[:MAX_INCIDENTS]:
+        incident['seconds'] = (incident.pop('end') - incident['start']) / 1000
+        incident['start'] = iso_time(incident['start'])
+        report['incidents'].append(incident)
+    report['incident_count'] = len(incidents)
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text daily report"""
+    lines = [f"Daily report for {report['day']} (UTC)", ""]
+    if report['series']:
+        lines.append(f"{'Series':<14}{'Mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'Max':>9}{'Samples':>9}")
+        for name, s in report['series'].items():
+            lines.append(f"{name:<14}{s['mean']:>9.1f}{s['p50']:>9g}{s['p95']:>9g}{s['p99']:>9g}"
+                         f"{s['max']:>9g}{s['samples']:>9}")
+        lines.append("")
+    if report['sites']:
+        lines.append(f"{'Site':<24}{'Uptime':>9}{'Probes':>8}{'p50 ms':>8}{'p95 ms':>8}")
+        for entry in sorted(report['sites'].values(), key=lambda entry: entry['uptime_percent']):
+            response = entry.get('response_ms')
+            p50, p95 = (f"{response['p50']:g}", f"{response['p95']:g}") if response else ("-", "-")
+            lines.append(f"{entry['name'][:23]:<24}{entry['uptime_percent']:>8.2f}%{entry['probes']:>8}{p50:>8}{p95:>8}")
+        lines.append("")
+    if report['stats']:
+        lines.append("Counters: " + ", ".join(f"{name} {int(s['last'])} (+{int(s['change'])})"
+                                              for name, s in report['stats'].items()))
+        lines.append("")
+    lines.append(f"Incidents: {report['incident_count']}")
+    for incident in report['incidents']:
+        detail = f" {incident['detail']}" if incident['detail'] else ""
+        lines.append(f"  {incident['start']}  {incident['seconds'] / 60:>7.1f} min  {incident['name']}{detail}")
+    if report['incident_count'] > len(report['incidents']):
+        lines.append(f"  ... {report['incident_count'] - len(report['incidents'])} more")
+    return "\n".join(lines)
+
+
+def write_daily_report(store, directory: str, day: str, limits: Optional[Dict[str, float]] = None,
+                       alert_settings: Optional[Dict] = None) -> str:
+    """Write <day>.json and <day>.txt into directory, returning the text path"""
+    report = daily_report(store, day, limits, alert_settings)
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, day)
+    for path, text in ((base + ".json", json.dumps(report, indent=2)), (base + ".txt", format_report(report))):
+        with open(path + ".part", "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(path + ".part", path)
+    return base + ".txt"
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Prometheus / OpenMetrics Exporter
+Optional embedded HTTP endpoint serving cached exposition text
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Probe latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricFamily:
+    """One metric family; keeps its own rendered text until a value changes"""
+
+    def __init__(self, name: str, kind: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.samples: Dict[LabelKey, object] = {}
+        self._rendered: Dict[bool, str] = {}
+
+    def set(self, key: LabelKey, value: float) -> bool:
+        if self.samples.get(key) == value:
+            return False
+        self.samples[key] = value
+        self._rendered.clear()
+        return True
+
+    def observe(self, key: LabelKey, value: float):
+        state = self.samples.get(key)
+        if state is None:
+            state = self.samples[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts, _, _ = state
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[idx] += 1
+                break
+        state[1] += value
+        state[2] += 1
+        self._rendered.clear()
+
+    def remove(self, key: LabelKey) -> bool:
+        if self.samples.pop(key, None) is None:
+            return False
+        self._rendered.clear()
+        return True
+
+    def render(self, openmetrics: bool) -> str:
+        cached = self._rendered.get(openmetrics)
+        if cached is not None:
+            return cached
+
+        name = self.name
+        lines = []
+        if self.kind == "counter":
+            family = name if openmetrics else name + "_total"
+            lines.append(f"# HELP {family} {self.help}")
+            lines.append(f"# TYPE {family} counter")
+            for key, value in self.samples.items():
+                lines.append(f"{name}_total{_format_labels(key)} {_format_value(value)}")
+        elif self.kind == "histogram":
+            lines.append(f"# HELP {name} {self.help}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, (counts, total, count) in self.samples.items():
+                cumulative = 0
+                for bound, bucket in zip(self.buckets, counts):
+                    cumulative += bucket
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+        else:
+            lines.append(f"# HELP {name} {self.help}")
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in self.samples.items():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        text = "\n".join(lines) + "\n"
+        self._rendered[openmetrics] = text
+        return text
+
+
+class MetricsRegistry:
+    """Thread-safe metric store with a cached exposition document"""
+
+    def __init__(self, prefix: str = "securenet"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._families: Dict[str, MetricFamily] = {}
+        self._version = 0
+        self._cache: Dict[bool, Tuple[int, bytes]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str, buckets=DEFAULT_BUCKETS) -> MetricFamily:
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        family = self._families.get(full_name)
+        if family is None:
+            family = self._families[full_name] = MetricFamily(full_name, kind, help_text, buckets)
+        return family
+
+    def set_gauge(self, name: str, value: float, help_text: str = "", labels: Optional[Dict[str, str]] = None):
+        """Set a gauge value"""
+        with self._lock:
+            if self._family(name, "gauge", help_text).set(_label_key(labels), value):
+                self._version += 1
+
+    def set_counter(self, name: str, value: int, help_text: str = "", labels: Optional[Dict[str, str]] = None):
+        """Publish the current value of a monotonically increasing counter"""
+        with self._lock:
+            if self._family(name, "counter", help_text).set(_label_key(labels), value):
+                self._version += 1
+
+    def observe(self, name: str, value: float, help_text: str = "", labels: Optional[Dict[str, str]] = None,
+                buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Record an observation into a histogram"""
+        with self._lock:
+            self._family(name, "histogram", help_text, buckets).observe(_label_key(labels), value)
+            self._version += 1
+
+    def remove(self, name: str, labels: Optional[Dict[str, str]] = None):
+        """Drop one labelled series (e.g. a site that is no longer monitored)"""
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        with self._lock:
+            family = self._families.get(full_name)
+            if family is not None and family.remove(_label_key(labels)):
+                self._version += 1
+
+    def render(self, openmetrics: bool = False) -> bytes:
+        """Return the exposition document, rebuilding it only after a change"""
+        with self._lock:
+            cached = self._cache.get(openmetrics)
+            if cached is not None and cached[0] == self._version:
+                return cached[1]
+            text = "".join(family.render(openmetrics) for family in self._families.values())
+            if openmetrics:
+                text += "# EOF\n"
+            body = text.encode("utf-8")
+            self._cache[openmetrics] = (self._version, body)
+            return body
+
+
+def _make_handler(registry: MetricsRegistry):
+    # http.server is only imported once the exporter is actually enabled
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = registry.render(openmetrics)
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+class MetricsExporter:
+    """Background HTTP server exposing a MetricsRegistry on /metrics"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Bind and serve in a daemon thread"""
+        from http.server import ThreadingHTTPServer
+        self._server = ThreadingHTTPServer((self.host, self.port), _make_handler(self.registry))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
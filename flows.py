@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Flow Table
+5-tuple flow aggregation with idle/active timeouts and Space-Saving heavy hitters
+"""
+
+import heapq
+import socket
+import threading
+import time
+from collections import deque
+from operator import itemgetter
+from typing import Deque, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+MAX_FLOWS = 131072              # ~300 bytes each: the table stays under ~40 MiB at the cap
+IDLE_TIMEOUT = 60.0             # a flow with no packets for this long is closed
+ACTIVE_TIMEOUT = 300.0          # a long-lived flow is exported and restarted this often
+TALKER_CAPACITY = 512           # Space-Saving counters per ranking
+TALKER_HALF_LIFE = 600.0        # heavy-hitter counts halve this often so rankings track recent traffic
+EXPORT_HISTORY = 1000           # closed flows kept for the view
+
+# (proto, local address, local port, remote address, remote port); addresses are packed bytes
+FlowKey = Tuple[int, bytes, int, bytes, int]
+
+# Flow entry slots: [packets, bytes up, bytes down, first seen, last seen, and the packets and
+# bytes already folded into the talker rankings]
+PACKETS, UP, DOWN, FIRST, LAST, RANKED_PACKETS, RANKED_BYTES = range(7)
+
+
+def format_ip(packed: bytes) -> str:
+    return socket.inet_ntop(socket.AF_INET if len(packed) == 4 else socket.AF_INET6, packed)
+
+
+class FlowRecord(NamedTuple):
+    """One exported flow: closed on idle, cut on active timeout, or still open in a snapshot"""
+    proto: int
+    local: str
+    lport: int
+    remote: str
+    rport: int
+    packets: int
+    up: int
+    down: int
+    first: float
+    last: float
+    reason: str
+
+    @classmethod
+    def from_entry(cls, key: FlowKey, entry: List, reason: str) -> "FlowRecord":
+        proto, local, lport, remote, rport = key
+        return cls(proto, format_ip(local), lport, format_ip(remote), rport,
+                   entry[PACKETS], entry[UP], entry[DOWN], entry[FIRST], entry[LAST], reason)
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in fixed memory (Metwally et al.); counts overestimate by at most `error`"""
+
+    def __init__(self, capacity: int = TALKER_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+
+    def update(self, batch: Dict[Hashable, int]):
+        """Merge a batch of counts, then keep the `capacity` largest.
+
+        A key that is not monitored may have been seen up to `floor` times before,
+        so it enters at floor + count with error floor, as in the one-at-a-time algorithm;
+        merging a whole batch costs one partial sort instead of an eviction per key.
+        """
+        counts, errors = self.counts, self.errors
+        floor = min(counts.values()) if len(counts) >= self.capacity else 0
+        for key, count in batch.items():
+            if key in counts:
+                counts[key] += count
+            else:
+                counts[key] = floor + count
+                errors[key] = floor
+            self.total += count
+        if len(counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity, counts.items(), key=itemgetter(1))
+            self.counts = dict(kept)
+            self.errors = {key: errors[key] for key, _count in kept}
+
+    def add(self, key: Hashable, count: int = 1):
+        self.update({key: count})
+
+    def decay(self, factor: float = 0.5):
+        """Scale every count down, so old heavy hitters give way to current ones"""
+        self.counts = {key: int(count * factor) for key, count in self.counts.items()}
+        self.errors = {key: int(error * factor) for key, error in self.errors.items()}
+        self.total = int(self.total * factor)
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """(key, count, error) for the n largest counts"""
+        ranked = heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class FlowTable:
+    """Bounded 5-tuple table; the capture thread updates entries, the UI reads rankings
+
+    flows is kept in order of last activity as of the previous expire(), so idle flows are
+    found at its front. entry() notes new flows in `recent`; a caller updating an existing
+    entry whose LAST is older than `last_expire` appends its key there too.
+    """
+
+    def __init__(self, max_flows: int = MAX_FLOWS, idle_timeout: float = IDLE_TIMEOUT,
+                 active_timeout: float = ACTIVE_TIMEOUT, talkers: int = TALKER_CAPACITY):
+        self.max_flows = max_flows
+        self.idle_timeout = idle_timeout
+        self.active_timeout = active_timeout
+        self.flows: Dict[FlowKey, List] = {}
+        self.recent: List[FlowKey] = []         # tracked flows with traffic since the last expire()
+        self.last_expire = time.time()
+        self.spill: Dict[bytes, List] = {}      # per-remote counters for flows past the cap
+        self.by_bytes = SpaceSaving(talkers)
+        self.by_packets = SpaceSaving(talkers)
+        self.exported: Deque[FlowRecord] = deque(maxlen=EXPORT_HISTORY)
+        self.overflow = 0
+        self.closed = 0
+        self.last_decay = time.time()
+        self._lock = threading.Lock()
+
+    def entry(self, key: FlowKey, now: float) -> List:
+        """The flow's counters, created on first sight; past the cap, shared per-remote counters"""
+        entry = self.flows.get(key)
+        if entry is None:
+            if len(self.flows) < self.max_flows:
+                entry = self.flows[key] = [0, 0, 0, now, now, 0, 0]
+                self.recent.append(key)
+            else:
+                # Untracked flows still count towards their remote's ranking
+                self.overflow += 1
+                entry = self.spill.get(key[3])
+                if entry is None:
+                    entry = self.spill[key[3]] = [0, 0, 0, now, now, 0, 0]
+        return entry
+
+    def expire(self, now: float) -> int:
+        """Fold new traffic into the talker rankings, close idle flows and cut long-lived ones.
+
+        Runs on the capture thread about once a second, so the per-packet path only
+        touches the flow entry. Only flows in `recent` are visited, plus the idle ones at
+        the front of the table; a long-lived flow is cut when it next sees traffic.
+        Returns how many records were exported.
+        """
+        idle_cutoff = now - self.idle_timeout
+        active_cutoff = now - self.active_timeout
+        idle, active = [], []
+        talkers: Dict[bytes, List[int]] = {}     # remote -> [new bytes, new packets]
+        flows = self.flows
+        recent, self.recent = self.recent, []
+        since, self.last_expire = self.last_expire, now
+        for key in recent:
+            entry = flows.get(key)
+            if entry is None:
+                continue
+            if entry[FIRST] <= since:
+                # Move to the back as most recently active; flows created since are already there
+                del flows[key]
+                flows[key] = entry
+            packets = entry[PACKETS] - entry[RANKED_PACKETS]
+            if packets:
+                size = entry[UP] + entry[DOWN] - entry[RANKED_BYTES]
+                entry[RANKED_PACKETS] = entry[PACKETS]
+                entry[RANKED_BYTES] += size
+                talker = talkers.get(key[3])
+                if talker is None:
+                    talkers[key[3]] = [size, packets]
+                else:
+                    talker[0] += size
+                    talker[1] += packets
+                if entry[FIRST] < active_cutoff:
+                    active.append(key)
+        for key, entry in flows.items():
+            if entry[LAST] >= idle_cutoff:
+                break
+            idle.append(key)
+        spill, self.spill = self.spill, {}
+        for remote, entry in spill.items():
+            talker = talkers.setdefault(remote, [0, 0])
+            talker[0] += entry[UP] + entry[DOWN]
+            talker[1] += entry[PACKETS]
+        if talkers:
+            with self._lock:
+                self.by_bytes.update({remote: talker[0] for remote, talker in talkers.items()})
+                self.by_packets.update({remote: talker[1] for remote, talker in talkers.items()})
+
+        exported = self.exported
+        for key in idle:
+            exported.append(FlowRecord.from_entry(key, flows.pop(key), "idle"))
+        for key in active:
+            entry = flows[key]
+            exported.append(FlowRecord.from_entry(key, entry, "active"))
+            entry[:] = [0, 0, 0, now, entry[LAST], 0, 0]
+        self.closed += len(idle)
+        if now - self.last_decay >= TALKER_HALF_LIFE:
+            with self._lock:
+                self.by_bytes.decay()
+                self.by_packets.decay()
+            self.last_decay = now
+        return len(idle) + len(active)
+
+    # === EXPORT ===
+
+    def top_talkers(self, n: int = 20, by: str = "bytes") -> List[Tuple[str, int, int]]:
+        """(remote address, count, error) by bytes or packets; cost depends on capacity, not flow count"""
+        with self._lock:
+            ranked = (self.by_bytes if by == "bytes" else self.by_packets).top(n)
+        return [(format_ip(remote), count, error) for remote, count, error in ranked]
+
+    def snapshot(self, limit: Optional[int] = None) -> List[FlowRecord]:
+        """Open flows as records; with a limit, only the largest (a partial sort)"""
+        items = list(self.flows.items())
+        if limit is not None:
+            items = heapq.nlargest(limit, items, key=lambda item: item[1][UP] + item[1][DOWN])
+        return [FlowRecord.from_entry(key, entry, "open") for key, entry in items]
+
+    def format_table(self, limit: int = 20) -> str:
+        """Top talkers and recently closed flows for the network view"""
+        with self._lock:
+            talkers = self.by_bytes.top(limit)
+            packets = [self.by_packets.counts.get(remote, 0) for remote, _count, _error in talkers]
+            total = self.by_bytes.total or 1
+        lines = [
+            f"Flows: {len(self.flows)} open (cap {self.max_flows}, {self.overflow} untracked) | {self.closed} closed",
+            "",
+            f"{'Top talkers':<40} {'Bytes':>10} {'Share':>6} {'Packets':>9}",
+        ]
+        for (remote, count, error), packet_count in zip(talkers, packets):
+            approx = "~" if error else " "
+            lines.append(f"  {format_ip(remote):<38} {approx}{count / 1e6:>8.2f}MB {100 * count / total:5.1f}% "
+                         f"{packet_count:>9}")
+        recent = list(self.exported)[-5:][::-1]
+        if recent:
+            lines += ["", "Recently exported flows:"]
+            for record in recent:
+                lines.append(f"  {record.remote}:{record.rport} <- :{record.lport}  {record.packets} pkts "
+                             f"{(record.up + record.down) / 1e6:.2f} MB  {record.last - record.first:.0f} s ({record.reason})")
+        return "\n".join(lines)
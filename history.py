@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - History Store
+Per-series day files of wire-format frames, appended live and read back in chunks
+"""
+
+import calendar
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import wire_format
+
+SUFFIX = ".snf"
+FLUSH_SECONDS = 300             # open frames are written out at least this often
+RETENTION_DAYS = 90
+SITE_PREFIX = "site."
+STATS_PREFIX = "stats."
+LABELS_FILE = "sites.json"      # site ID -> {"name", "url"}, for reports
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+_DAY_MS = 86400 * 1000
+
+
+def series_name(name: str) -> str:
+    """Series names double as directory names"""
+    return _UNSAFE.sub("_", name).strip("._") or "_"
+
+
+def day_of(timestamp_ms: int) -> str:
+    """UTC day a sample is filed under"""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp_ms // 1000))
+
+
+def day_start(day: str) -> int:
+    """Epoch milliseconds at the start of a UTC day"""
+    return calendar.timegm(time.strptime(day, "%Y-%m-%d")) * 1000
+
+
+def site_id(url: str) -> str:
+    """Stable series key for a site: a hash of its URL, so renames keep history and equal names never merge"""
+    import hashlib
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def site_series(site: str, field: str) -> str:
+    """Per-site series by site ID, e.g. site.<id>.up (1/0 per probe) and site.<id>.response_ms"""
+    return series_name(f"{SITE_PREFIX}{site}.{field}")
+
+
+def frame_start(frame: memoryview) -> int:
+    """First timestamp of a frame, without decoding the rest"""
+    _precision, _count, start, _end = wire_format.read_frame_header(frame)
+    return int.from_bytes(frame[start:start + 8], "big", signed=True)
+
+
+class _Writer:
+    __slots__ = ("encoder", "day", "last_flush")
+
+    def __init__(self, precision: Optional[int]):
+        self.encoder = wire_format.SeriesEncoder(precision)
+        self.day = ""
+        self.last_flush = time.monotonic()
+
+
+class HistoryStore:
+    """Append-only sample history: <directory>/<series>/<YYYY-MM-DD>.snf, one frame per write"""
+
+    def __init__(self, directory: str, retention_days: int = RETENTION_DAYS,
+                 flush_seconds: float = FLUSH_SECONDS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.flush_seconds = flush_seconds
+        self._writers: Dict[str, _Writer] = {}
+        self._labels: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        self.last_prune = ""
+        self.error = ""
+
+    # === WRITE ===
+
+    def append(self, series: str, timestamp_ms: int, value: float,
+               precision: Optional[int] = wire_format.DEFAULT_PRECISION):
+        """Record one sample; frames reach disk when full, on a new day, or every flush_seconds"""
+        series = series_name(series)
+        day = day_of(timestamp_ms)
+        with self._lock:
+            writer = self._writers.get(series)
+            if writer is None:
+                writer = self._writers[series] = _Writer(precision)
+            if writer.day != day:
+                if len(writer.encoder):
+                    self._write(series, writer, writer.encoder.flush())
+                writer.day = day
+                if day != self.last_prune:
+                    self.last_prune = day
+                    self._prune(timestamp_ms)
+            frame = writer.encoder.append(int(timestamp_ms), value)
+            if frame:
+                self._write(series, writer, frame)
+            elif time.monotonic() - writer.last_flush >= self.flush_seconds:
+                self._write(series, writer, writer.encoder.flush())
+
+    def label_site(self, site: str, name: str, url: str):
+        """Record the display name and URL behind a site ID; the file is rewritten only on change"""
+        with self._lock:
+            labels = self._read_labels()
+            if labels.get(site) == {'name': name, 'url': url}:
+                return
+            labels[site] = {'name': name, 'url': url}
+            import json
+            path = os.path.join(self.directory, LABELS_FILE)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                    json.dump(labels, f)
+                os.replace(f"{path}.tmp", path)
+            except OSError as e:
+                self.error = str(e)
+                print(f"History write error: {e}")
+
+    def flush(self, series: Optional[str] = None):
+        """Write out open frames (all series, or one) so readers see every sample"""
+        with self._lock:
+            for name, writer in self._writers.items():
+                if (series is None or name == series_name(series)) and len(writer.encoder):
+                    self._write(name, writer, writer.encoder.flush())
+
+    def _write(self, series: str, writer: _Writer, frame: bytes):
+        writer.last_flush = time.monotonic()
+        path = os.path.join(self.directory, series, writer.day + SUFFIX)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(frame)
+            self.bytes_written += len(frame)
+            self.error = ""
+        except OSError as e:
+            self.error = str(e)
+            print(f"History write error: {e}")
+
+    def _prune(self, now_ms: int):
+        cutoff = day_of(now_ms - self.retention_days * _DAY_MS)
+        for series in self._directories():
+            for day in self.days(series):
+                if day < cutoff:
+                    try:
+                        os.remove(os.path.join(self.directory, series, day + SUFFIX))
+                    except OSError:
+                        pass
+
+    # === READ ===
+
+    def series(self) -> List[str]:
+        """Stored series, including ones whose first frame has not been written yet"""
+        with self._lock:
+            pending = list(self._writers)
+        return sorted(set(self._directories()).union(pending))
+
+    def _directories(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.directory)
+                    if os.path.isdir(os.path.join(self.directory, name))]
+        except OSError:
+            return []
+
+    def _read_labels(self) -> Dict[str, Dict[str, str]]:
+        if self._labels is None:
+            import json
+            try:
+                with open(os.path.join(self.directory, LABELS_FILE), encoding="utf-8") as f:
+                    self._labels = dict(json.load(f))
+            except (OSError, ValueError, TypeError):
+                self._labels = {}
+        return self._labels
+
+    def site_labels(self) -> Dict[str, Dict[str, str]]:
+        """{site ID: {"name", "url"}} as last recorded"""
+        with self._lock:
+            return dict(self._read_labels())
+
+    def days(self, series: str) -> List[str]:
+        try:
+            names = os.listdir(os.path.join(self.directory, series_name(series)))
+        except OSError:
+            return []
+        return sorted(name[:-len(SUFFIX)] for name in names if name.endswith(SUFFIX))
+
+    def read(self, series: str, start_ms: Optional[int] = None,
+             end_ms: Optional[int] = None) -> Iterator[Tuple[List[int], List[float]]]:
+        """Yield (timestamps, values) one frame at a time, oldest first, limited to [start_ms, end_ms)
+
+        Only one day file and one decoded frame are held at a time, so any range
+        streams in bounded memory.
+        """
+        self.flush(series)
+        first_day = day_of(start_ms) if start_ms is not None else ""
+        last_day = day_of(end_ms) if end_ms is not None else "9999"
+        for day in self.days(series):
+            if not first_day <= day <= last_day:
+                continue
+            try:
+                with open(os.path.join(self.directory, series_name(series), day + SUFFIX), "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            frames = []
+            try:
+                for frame in wire_format.iter_frames(data):
+                    frames.append(frame)
+            except ValueError:
+                pass            # torn tail from a crash mid-write; the frames before it are intact
+            starts = [frame_start(frame) for frame in frames] + [None]
+            for index, frame in enumerate(frames):
+                if end_ms is not None and starts[index] >= end_ms:
+                    break
+                following = starts[index + 1]
+                if start_ms is not None and following is not None and following <= start_ms:
+                    continue    # the whole frame is before the range
+                samples = list(wire_format.decode_frame(frame))
+                if ((start_ms is not None and samples[0][0] < start_ms)
+                        or (end_ms is not None and samples[-1][0] >= end_ms)):
+                    samples = [(ts, value) for ts, value in samples
+                               if (start_ms is None or ts >= start_ms) and (end_ms is None or ts < end_ms)]
+                if samples:
+                    timestamps, values = zip(*samples)
+                    yield list(timestamps), list(values)
+
+    def bounds(self, series: str) -> Optional[Tuple[int, int]]:
+        """(first, last) timestamp stored for a series"""
+        days = self.days(series)
+        if not days:
+            return None
+        first = last = None
+        for timestamps, _values in self.read(series, start_ms=day_start(days[0])):
+            first = timestamps[0] if first is None else first
+            break
+        for timestamps, _values in self.read(series, start_ms=day_start(days[-1])):
+            last = timestamps[-1]
+        if first is None or last is None:
+            return None
+        return first, last
+
+    def size_bytes(self) -> int:
+        total = 0
+        for series in self.series():
+            for day in self.days(series):
+                try:
+                    total += os.path.getsize(os.path.join(self.directory, series, day + SUFFIX))
+                except OSError:
+                    pass
+        return total
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - File Integrity Monitor
+Parallel chunked hashing baseline, inotify-driven rehash and a compact on-disk baseline
+"""
+
+import errno
+import os
+import stat
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import inotify
+from wire_format import decode_varint, encode_varint
+
+CHUNK_SIZE = 1 << 20
+DIGEST_SIZE = 16
+MAX_IN_FLIGHT = 256             # queued hash jobs; keeps the walker from racing ahead
+SAVE_INTERVAL = 60.0
+BATCH_DELAY = 0.5               # inotify events are coalesced this long before rehashing
+POLL_INTERVAL = 300.0           # stat sweep for trees that could not be watched
+CRITICAL_PREFIXES = ("/etc/", "/bin/", "/sbin/", "/usr/bin/", "/usr/sbin/", "/boot/",
+                     "/lib/", "/usr/lib/", "/lib64/", "/usr/lib64/")
+
+BASELINE_MAGIC = b"SNIB"
+BASELINE_VERSION = 1
+_HEADER = struct.Struct(">4sBI")
+
+WATCH_MASK = (inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_MOVED_FROM | inotify.IN_CREATE
+              | inotify.IN_DELETE | inotify.IN_ATTRIB | inotify.IN_DELETE_SELF | inotify.IN_ONLYDIR)
+
+
+class FileRecord:
+    """Baseline entry: stat signature plus content digest"""
+
+    __slots__ = ("size", "mtime_ns", "ino", "mode", "digest")
+
+    def __init__(self, size: int, mtime_ns: int, ino: int, mode: int, digest: bytes):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.ino = ino
+        self.mode = mode
+        self.digest = digest
+
+    def same_stat(self, st: os.stat_result) -> bool:
+        return (self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+                and self.ino == st.st_ino and self.mode == st.st_mode)
+
+
+class Change:
+    """A detected difference from the baseline"""
+
+    __slots__ = ("kind", "path", "detail")
+
+    def __init__(self, kind: str, path: str, detail: str = ""):
+        self.kind = kind        # created, modified, deleted, permissions
+        self.path = path
+        self.detail = detail
+
+
+def hash_file(path: str, buf: Optional[bytearray] = None) -> Optional[bytes]:
+    """BLAKE2b digest read in large chunks; None if unreadable"""
+    import hashlib
+    buf = buf or bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    except OSError:
+        return None
+    return h.digest()
+
+
+# === BASELINE FILE ===
+
+def save_baseline(records: Dict[str, FileRecord], path: str):
+    """Sorted, prefix-compressed, varint-encoded and zlib-compressed; written atomically"""
+    import zlib
+    out = bytearray()
+    previous = b""
+    for name in sorted(records):
+        rec = records[name]
+        encoded = os.fsencode(name)
+        shared = 0
+        limit = min(len(previous), len(encoded))
+        while shared < limit and previous[shared] == encoded[shared]:
+            shared += 1
+        encode_varint(shared, out)
+        encode_varint(len(encoded) - shared, out)
+        out += encoded[shared:]
+        for value in (rec.size, rec.mtime_ns, rec.ino, rec.mode):
+            encode_varint(value, out)
+        out += rec.digest.ljust(DIGEST_SIZE, b"\0")
+        previous = encoded
+    data = _HEADER.pack(BASELINE_MAGIC, BASELINE_VERSION, len(records)) + zlib.compress(bytes(out), 6)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_baseline(path: str) -> Dict[str, FileRecord]:
+    """Inverse of save_baseline; an empty dict if missing or unreadable"""
+    import zlib
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, count = _HEADER.unpack_from(data)
+        if magic != BASELINE_MAGIC or version != BASELINE_VERSION:
+            return {}
+        buf = memoryview(zlib.decompress(data[_HEADER.size:]))
+    except (OSError, struct.error, zlib.error):
+        return {}
+    records = {}
+    pos = 0
+    previous = b""
+    for _ in range(count):
+        shared, pos = decode_varint(buf, pos)
+        length, pos = decode_varint(buf, pos)
+        encoded = previous[:shared] + bytes(buf[pos:pos + length])
+        pos += length
+        size, pos = decode_varint(buf, pos)
+        mtime_ns, pos = decode_varint(buf, pos)
+        ino, pos = decode_varint(buf, pos)
+        mode, pos = decode_varint(buf, pos)
+        digest = bytes(buf[pos:pos + DIGEST_SIZE])
+        pos += DIGEST_SIZE
+        records[os.fsdecode(encoded)] = FileRecord(size, mtime_ns, ino, mode, digest)
+        previous = encoded
+    return records
+
+
+# === MONITOR ===
+
+def walk_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Regular files under root (or root itself), without following symlinks"""
+    try:
+        st = os.stat(root, follow_symlinks=False)
+    except OSError:
+        return
+    if stat.S_ISREG(st.st_mode):
+        yield root, st
+        return
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class IntegrityMonitor:
+    """Baselines configured paths, then rehashes only what inotify reports as changed"""
+
+    def __init__(self, paths: List[str], baseline_path: str,
+                 on_changes: Callable[[List[Change]], None], workers: Optional[int] = None):
+        self.paths = normalize_paths(paths)
+        self.baseline_path = baseline_path
+        self.on_changes = on_changes
+        self.workers = workers or min(8, (os.cpu_count() or 2))
+        self.records: Dict[str, FileRecord] = {}
+        self.mode = "stopped"
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.stat_hits = 0
+        self.baseline_seconds = 0.0
+        self.unwatched: List[str] = []
+        self._local = threading.local()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="securenet-integrity", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # === HASHING ===
+
+    def _hash(self, path: str) -> Optional[bytes]:
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = bytearray(CHUNK_SIZE)
+        return hash_file(path, buf)
+
+    def _hash_job(self, item: Tuple[str, os.stat_result]):
+        path, st = item
+        digest = self._hash(path)
+        return path, st, digest
+
+    def hash_many(self, items: Iterator[Tuple[str, os.stat_result]]) -> Iterator[Tuple[str, os.stat_result, Optional[bytes]]]:
+        """Hash files on a thread pool with a bounded queue (hashlib releases the GIL)"""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="securenet-hash") as pool:
+            pending = []
+            for item in items:
+                pending.append(pool.submit(self._hash_job, item))
+                if len(pending) >= MAX_IN_FLIGHT:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+
+    def _record(self, path: str, st: os.stat_result, digest: Optional[bytes]) -> FileRecord:
+        self.files_hashed += 1
+        self.bytes_hashed += st.st_size
+        return FileRecord(st.st_size, st.st_mtime_ns, st.st_ino, st.st_mode, digest or b"")
+
+    # === COMPARISON ===
+
+    def _compare(self, path: str, old: Optional[FileRecord], new: Optional[FileRecord]) -> Optional[Change]:
+        if old is None and new is None:
+            return None
+        if old is None:
+            return Change("created", path, f"{new.size} bytes")
+        if new is None:
+            return Change("deleted", path)
+        if old.digest != new.digest:
+            return Change("modified", path, f"{old.size} -> {new.size} bytes")
+        if old.mode != new.mode:
+            return Change("permissions", path, f"{stat.filemode(old.mode)} -> {stat.filemode(new.mode)}")
+        return None
+
+    def scan(self, roots: List[str], report: bool = True) -> List[Change]:
+        """Stat everything under roots; hash only files whose stat signature changed"""
+        changes = []
+        seen = set()
+        start = time.perf_counter()
+
+        def needs_hash():
+            for root in roots:
+                for path, st in walk_files(root):
+                    seen.add(path)
+                    old = self.records.get(path)
+                    if old is not None and old.same_stat(st):
+                        self.stat_hits += 1
+                        continue
+                    yield path, st
+
+        for path, st, digest in self.hash_many(needs_hash()):
+            new = self._record(path, st, digest)
+            with self._lock:
+                old = self.records.get(path)
+                self.records[path] = new
+            self._dirty = True
+            change = self._compare(path, old, new)
+            if change is not None:
+                changes.append(change)
+
+        with self._lock:
+            gone = [p for p in self.records if p not in seen and any(_under(p, r) for r in roots)]
+            for path in gone:
+                del self.records[path]
+        for path in gone:
+            self._dirty = True
+            changes.append(Change("deleted", path))
+        self.baseline_seconds = time.perf_counter() - start
+        if report and changes:
+            self.on_changes(changes)
+        return changes
+
+    def check_paths(self, paths: List[str]) -> List[Change]:
+        """Rehash specific files (from inotify events)"""
+        changes = []
+        items = []
+        for path in paths:
+            try:
+                st = os.stat(path, follow_symlinks=False)
+            except OSError:
+                st = None
+            if st is None or not stat.S_ISREG(st.st_mode):
+                with self._lock:
+                    old = self.records.pop(path, None)
+                if old is not None:
+                    self._dirty = True
+                    changes.append(Change("deleted", path))
+                continue
+            items.append((path, st))
+        for path, st, digest in self.hash_many(iter(items)):
+            new = self._record(path, st, digest)
+            with self._lock:
+                old = self.records.get(path)
+                self.records[path] = new
+            self._dirty = True
+            change = self._compare(path, old, new)
+            if change is not None:
+                changes.append(change)
+        if changes:
+            self.on_changes(changes)
+        return changes
+
+    # === LOOP ===
+
+    def _run(self):
+        self.mode = "baseline"
+        self.records = load_baseline(self.baseline_path)
+        # Differences against a stored baseline happened while we were not running
+        had_baseline = bool(self.records)
+        self.scan(self.paths, report=had_baseline)
+        self._save()
+        if self._stop.is_set():
+            return
+        try:
+            self._watch()
+        except OSError as e:
+            print(f"Integrity monitor: inotify unavailable ({e}), polling instead")
+            self.unwatched = list(self.paths)
+            self.mode = "polling"
+            while not self._stop.wait(POLL_INTERVAL):
+                self.scan(self.paths)
+                self._save_if_dirty()
+        self._save_if_dirty()
+        self.mode = "stopped"
+
+    def _watch(self):
+        with inotify.Inotify() as watcher:
+            dirs: Dict[int, str] = {}
+            self.unwatched = []
+            for root in self.paths:
+                self._add_tree(watcher, dirs, root if os.path.isdir(root) else os.path.dirname(root))
+            self.mode = "inotify" if not self.unwatched else "inotify+polling"
+            pending = set()
+            deadline = None
+            last_save = last_poll = time.monotonic()
+            while not self._stop.is_set():
+                for event in watcher.read_events(timeout=BATCH_DELAY):
+                    directory = dirs.get(event.wd)
+                    if event.mask & inotify.IN_Q_OVERFLOW:
+                        # Lost events: fall back to a stat sweep (cheap, hashes only changes)
+                        self.scan(self.paths)
+                        continue
+                    if directory is None:
+                        continue
+                    if event.mask & inotify.IN_IGNORED:
+                        dirs.pop(event.wd, None)
+                        continue
+                    path = os.path.join(directory, event.name) if event.name else directory
+                    if event.mask & inotify.IN_ISDIR:
+                        if event.mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                            self._add_tree(watcher, dirs, path)
+                            pending.update(p for p, _ in walk_files(path))
+                        elif event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                            with self._lock:
+                                pending.update(p for p in self.records if _under(p, path))
+                        continue
+                    if self._tracked(path):
+                        pending.add(path)
+                    if deadline is None:
+                        deadline = time.monotonic() + BATCH_DELAY
+                now = time.monotonic()
+                if pending and (deadline is None or now >= deadline):
+                    batch, pending, deadline = sorted(pending), set(), None
+                    self.check_paths(batch)
+                if self.unwatched and now - last_poll > POLL_INTERVAL:
+                    self.scan(self.unwatched)
+                    last_poll = now
+                if now - last_save > SAVE_INTERVAL:
+                    self._save_if_dirty()
+                    last_save = now
+
+    def _add_tree(self, watcher, dirs: Dict[int, str], root: str):
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                wd = watcher.add_watch(directory, WATCH_MASK)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    # Out of inotify watches (fs.inotify.max_user_watches): poll this subtree
+                    self.unwatched.append(directory)
+                continue
+            dirs[wd] = directory
+            try:
+                with os.scandir(directory) as it:
+                    stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _tracked(self, path: str) -> bool:
+        return any(path == root or _under(path, root) for root in self.paths)
+
+    def _save_if_dirty(self):
+        if self._dirty:
+            self._save()
+
+    def _save(self):
+        with self._lock:
+            records = dict(self.records)
+        try:
+            save_baseline(records, self.baseline_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Integrity baseline save error: {e}")
+
+    def status(self) -> Dict:
+        """Counters behind format_table, as plain data (the collector process sends them as JSON)"""
+        try:
+            size = os.path.getsize(self.baseline_path)
+        except OSError:
+            size = 0
+        return {
+            'mode': self.mode, 'files': len(self.records), 'baseline_bytes': size,
+            'files_hashed': self.files_hashed, 'bytes_hashed': self.bytes_hashed, 'stat_hits': self.stat_hits,
+            'sweep_seconds': round(self.baseline_seconds, 2), 'paths': self.paths, 'unwatched': self.unwatched[:5],
+        }
+
+    def format_table(self) -> str:
+        """Status block for the threat view"""
+        return format_status(self.status())
+
+
+def format_status(status: Dict, where: str = "") -> str:
+    """Status block for an IntegrityMonitor.status() dict"""
+    lines = [
+        f"File integrity: {status['mode']}{where} | {status['files']} files | baseline "
+        f"{status['baseline_bytes'] / 1024:.1f} KiB on disk | {status['files_hashed']} hashed "
+        f"({status['bytes_hashed'] / 1e6:.1f} MB), {status['stat_hits']} unchanged by stat "
+        f"| last sweep {status['sweep_seconds']:.2f} s",
+    ]
+    lines.extend(f"  watching {p}" for p in status['paths'])
+    lines.extend(f"  polling  {p} (no inotify watches left)" for p in status['unwatched'])
+    return "\n".join(lines)
+
+
+def normalize_paths(paths: List[str]) -> List[str]:
+    """Absolute, user-expanded watch roots"""
+    return [os.path.abspath(os.path.expanduser(p)) for p in paths]
+
+
+def _under(path: str, root: str) -> bool:
+    return path.startswith(root.rstrip("/") + "/")
+
+
+def severity_for(path: str) -> str:
+    """System binaries and configuration are more sensitive than other watched trees"""
+    return "HIGH" if path.startswith(CRITICAL_PREFIXES) else "MEDIUM"
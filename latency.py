@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Latency Histograms
+Log-bucketed, fixed-size histograms with sliding windows and per-thread shards
+"""
+
+import threading
+import time
+import weakref
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# 16 sub-buckets per power of two (~6% relative error) from 1us to ~38h
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 38
+BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+DEFAULT_SLOT_SECONDS = 10
+DEFAULT_SLOTS = 30          # 5 minute sliding window
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def bucket_index(micros: int) -> int:
+    """Map a latency in microseconds onto a log-linear bucket"""
+    if micros < SUB_BUCKETS:
+        return max(micros, 0)
+    exponent = micros.bit_length() - SUB_BUCKET_BITS
+    if exponent > MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    return exponent * SUB_BUCKETS + ((micros >> (exponent - 1)) & (SUB_BUCKETS - 1))
+
+
+def bucket_value(index: int) -> int:
+    """Representative (midpoint) value in microseconds for a bucket"""
+    if index < SUB_BUCKETS:
+        return index
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    low = (SUB_BUCKETS | sub) << (exponent - 1)
+    return low + ((1 << (exponent - 1)) >> 1)
+
+
+class WindowedHistogram:
+    """Ring of time-sliced histograms; memory is fixed at construction"""
+
+    def __init__(self, slots: int = DEFAULT_SLOTS, slot_seconds: float = DEFAULT_SLOT_SECONDS):
+        self.slots = slots
+        self.slot_seconds = slot_seconds
+        self.counts = [array("I", bytes(4 * BUCKET_COUNT)) for _ in range(slots)]
+        self.maxima = array("q", [0] * slots)
+        self.epochs = array("q", [-1] * slots)
+
+    def record(self, micros: int, now: Optional[float] = None):
+        """Record one observation (single writer per instance)"""
+        epoch = int((time.time() if now is None else now) / self.slot_seconds)
+        slot = epoch % self.slots
+        if self.epochs[slot] != epoch:
+            self.counts[slot] = array("I", bytes(4 * BUCKET_COUNT))
+            self.maxima[slot] = 0
+            self.epochs[slot] = epoch
+        self.counts[slot][bucket_index(micros)] += 1
+        if micros > self.maxima[slot]:
+            self.maxima[slot] = micros
+
+    def merge_into(self, counts: List[int], window_seconds: float, now: float) -> int:
+        """Add live slots inside the window to counts; returns the window max"""
+        newest = int(now / self.slot_seconds)
+        oldest = newest - max(1, int(window_seconds / self.slot_seconds)) + 1
+        peak = 0
+        for slot in range(self.slots):
+            epoch = self.epochs[slot]
+            if oldest <= epoch <= newest:
+                slot_counts = self.counts[slot]
+                for idx, value in enumerate(slot_counts):
+                    if value:
+                        counts[idx] += value
+                peak = max(peak, self.maxima[slot])
+        return peak
+
+
+class LatencySummary:
+    """Percentile snapshot of one histogram over a window"""
+
+    __slots__ = ("count", "p50", "p90", "p99", "max")
+
+    def __init__(self, count=0, p50=0.0, p90=0.0, p99=0.0, max=0.0):
+        self.count = count
+        self.p50 = p50
+        self.p90 = p90
+        self.p99 = p99
+        self.max = max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'count': self.count, 'p50': self.p50, 'p90': self.p90, 'p99': self.p99, 'max': self.max}
+
+
+class ShardedHistogram:
+    """Per-thread WindowedHistogram shards merged on read
+
+    Writers never take a lock: each thread records into its own shard.
+    Shards of exited threads are folded into a retired shard on read, so the
+    footprint stays bounded even with short-lived probe threads.
+    """
+
+    def __init__(self, slots: int = DEFAULT_SLOTS, slot_seconds: float = DEFAULT_SLOT_SECONDS):
+        self.slots = slots
+        self.slot_seconds = slot_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[weakref.ref, WindowedHistogram]] = []
+        self._retired = WindowedHistogram(slots, slot_seconds)
+
+    def _shard(self) -> WindowedHistogram:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = WindowedHistogram(self.slots, self.slot_seconds)
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        return shard
+
+    def record(self, seconds: float, now: Optional[float] = None):
+        """Record a latency in seconds"""
+        self._shard().record(int(seconds * 1_000_000), now)
+
+    def _retire_dead_shards(self):
+        live = []
+        retired = self._retired
+        for ref, shard in self._shards:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                live.append((ref, shard))
+                continue
+            for slot in range(shard.slots):
+                epoch = shard.epochs[slot]
+                if epoch < 0:
+                    continue
+                if retired.epochs[slot] != epoch:
+                    if retired.epochs[slot] > epoch:
+                        continue
+                    retired.counts[slot] = array("I", shard.counts[slot])
+                    retired.maxima[slot] = shard.maxima[slot]
+                    retired.epochs[slot] = epoch
+                else:
+                    target = retired.counts[slot]
+                    for idx, value in enumerate(shard.counts[slot]):
+                        if value:
+                            target[idx] += value
+                    retired.maxima[slot] = max(retired.maxima[slot], shard.maxima[slot])
+        self._shards = live
+
+    def summary(self, window_seconds: float = DEFAULT_SLOTS * DEFAULT_SLOT_SECONDS,
+                now: Optional[float] = None) -> LatencySummary:
+        """Percentiles (in ms) over the trailing window"""
+        now = time.time() if now is None else now
+        counts = [0] * BUCKET_COUNT
+        with self._lock:
+            self._retire_dead_shards()
+            peak = self._retired.merge_into(counts, window_seconds, now)
+            for _, shard in self._shards:
+                peak = max(peak, shard.merge_into(counts, window_seconds, now))
+
+        total = sum(counts)
+        if not total:
+            return LatencySummary()
+        targets = [q * total for q in QUANTILES]
+        results = []
+        seen = 0
+        idx = 0
+        for target in targets:
+            while idx < BUCKET_COUNT and seen + counts[idx] < target:
+                seen += counts[idx]
+                idx += 1
+            results.append(min(bucket_value(min(idx, BUCKET_COUNT - 1)), peak) / 1000)
+        return LatencySummary(total, results[0], results[1], results[2], peak / 1000)
+
+
+class LatencyRecorder:
+    """Histograms keyed by (probe_type, target)"""
+
+    PROBE_TYPES = {
+        'internet_tcp': "Internet TCP",
+        'icmp_echo': "ICMP Echo",
+        'vpn_lookup': "VPN Lookup",
+        'site_get': "Site GET",
+        'dns_lookup': "DNS Lookup",
+        'tls_handshake': "TLS Handshake",
+    }
+
+    def __init__(self, slots: int = DEFAULT_SLOTS, slot_seconds: float = DEFAULT_SLOT_SECONDS):
+        self.slots = slots
+        self.slot_seconds = slot_seconds
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], ShardedHistogram] = {}
+
+    @property
+    def window_seconds(self) -> float:
+        return self.slots * self.slot_seconds
+
+    def histogram(self, probe_type: str, target: str) -> ShardedHistogram:
+        key = (probe_type, target)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.get(key)
+                if hist is None:
+                    hist = self._histograms[key] = ShardedHistogram(self.slots, self.slot_seconds)
+        return hist
+
+    def record(self, probe_type: str, target: str, seconds: float):
+        """Record one probe duration"""
+        self.histogram(probe_type, target).record(seconds)
+
+    def discard(self, probe_type: str, target: str):
+        """Forget a target that is no longer probed"""
+        with self._lock:
+            self._histograms.pop((probe_type, target), None)
+
+    def summaries(self, probe_type: Optional[str] = None,
+                  window_seconds: Optional[float] = None) -> Dict[Tuple[str, str], LatencySummary]:
+        """Summaries for every target, optionally filtered by probe type"""
+        window = self.window_seconds if window_seconds is None else window_seconds
+        with self._lock:
+            items = list(self._histograms.items())
+        return {
+            key: hist.summary(window)
+            for key, hist in sorted(items)
+            if probe_type is None or key[0] == probe_type
+        }
+
+    def format_table(self, probe_type: Optional[str] = None) -> str:
+        """Plain-text percentile table for the network and analytics views"""
+        lines = [f"{'Probe':<14}{'Target':<28}{'Count':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'Max':>10}"]
+        for (ptype, target), s in self.summaries(probe_type).items():
+            if not s.count:
+                continue
+            label = self.PROBE_TYPES.get(ptype, ptype)
+            lines.append(f"{label:<14}{target[:27]:<28}{s.count:>7}"
+                         f"{s.p50:>8.1f}ms{s.p90:>8.1f}ms{s.p99:>8.1f}ms{s.max:>8.1f}ms")
+        if len(lines) == 1:
+            lines.append("No probe samples in the last window yet.")
+        return "\n".join(lines)
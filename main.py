@@ -4,22 +4,64 @@ SecureNet Monitor Pro - Enterprise Grade Network & Security Monitor
 Features: VPN Detection, Anti-Cheat System, Threat Detection, Real-time Analytics
 """
 
-import customtkinter as ctk
-from tkinter import ttk, messagebox
-import requests
-import psutil
+import startup
+ctk = startup.timed_import("customtkinter")
+import atexit
+import os
 import socket
 import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import json
-import subprocess
-import platform
-import re
 from collections import deque
-import urllib.request
-import ssl
+import urllib.parse
+
+import wire_format
+import exporter
+import latency
+import selfmon
+import dnscache
+import threats
+import config
+import site_import
+import probes
+import pinger
+import pathprobe
+import procevents
+import anticheat
+import integrity
+import logwatch
+import scandetect
+import capture
+import alerts
+import history
+import rules
+import sla
+import synthetic
+import collector_proc
+
+# Deferred imports: none of these are needed to paint the first frame
+requests = startup.lazy_import("requests")
+psutil = startup.lazy_import("psutil")
+json = startup.lazy_import("json")
+argparse = startup.lazy_import("argparse")
+messagebox = startup.lazy_import("tkinter.messagebox")
+tlsprobe = startup.lazy_import("tlsprobe")
+replay = startup.lazy_import("replay")
+export = startup.lazy_import("export")
+
+# Dashboard rows for site groups (the rest are summarised)
+DASHBOARD_GROUP_ROWS = 50
+
+# Latency targets above this count share one histogram instead of one each
+PER_TARGET_HISTOGRAMS = 16
+
+# Probe Endpoints
+INTERNET_CHECK_ADDR = ("8.8.8.8", 53)
+IP_INTEL_URL = "https://ipapi.co/json/"
+
+# History export ranges offered in the analytics view (hours; None exports everything stored)
+EXPORT_RANGES = {"Last 24 hours": 24, "Last 7 days": 24 * 7, "Last 30 days": 24 * 30, "All history": None}
 
 # Modern Theme Configuration
 ctk.set_appearance_mode("dark")
@@ -28,8 +70,10 @@ ctk.set_default_color_theme("blue")
 class SecureNetMonitor(ctk.CTk):
     """Main Application Class"""
     
-    def __init__(self):
+    def __init__(self, startup_report=False, config_path=None):
         super().__init__()
+        startup.REPORT.mark("window_created")
+        self.startup_report = startup_report
         
         # Window Configuration
         self.title("dev-template custom Pro - Edition")
@@ -53,25 +97,30 @@ class SecureNetMonitor(ctk.CTk):
             'network_in': deque(maxlen=100),
             'network_out': deque(maxlen=100),
             'latency': deque(maxlen=100),
-            'timestamps': deque(maxlen=100)
+            'timestamps': deque(maxlen=100),
+            # Latency and traffic are not sampled every tick, so they keep their own times
+            'latency_timestamps': deque(maxlen=100),
+            'network_timestamps': deque(maxlen=100),
         }
         
-        # Monitored Websites
-        self.monitored_sites = [
-            {'url': 'https://google.com', 'name': 'Google', 'status': 'Unknown'},
-            {'url': 'https://github.com', 'name': 'GitHub', 'status': 'Unknown'},
-            {'url': 'https://cloudflare.com', 'name': 'Cloudflare', 'status': 'Unknown'}
-        ]
+        # Persistent Configuration (defaults live in config.DEFAULT_CONFIG)
+        self.config_path = config_path or config.config_path()
+        try:
+            self.config = config.load(self.config_path)
+        except (ValueError, OSError) as e:
+            print(f"Config load error: {e}")
+            self.config = config.defaults()
+        self.config_watcher = None
         
-        # Security Config
-        self.security_config = {
-            'vpn_check_enabled': True,
-            'anticheat_enabled': True,
-            'threat_detection': True,
-            'max_cpu_threshold': 85,
-            'max_memory_threshold': 90,
-            'max_latency_ms': 500
-        }
+        # Monitored Websites (inline sites plus bulk 'site_sources')
+        self.monitored_sites = self.load_sites(self.config)
+        self.synthetic_checks = synthetic.load_checks(self.config.get('synthetic_checks') or [])
+        
+        # Security Config ('metrics_port': e.g. 9464 to serve /metrics for Prometheus)
+        self.security_config = dict(self.config['security'])
+        
+        # Scheduling (sample period and per-check cadence in samples)
+        self.intervals = dict(self.config['intervals'])
         
         # Statistics
         self.stats = {
@@ -84,8 +133,110 @@ class SecureNetMonitor(ctk.CTk):
             'start_time': datetime.now()
         }
         
-        # Build UI
+        # Alert Pipeline (dedup, debounce and grouping between the threat log and 'alert_sinks')
+        self.alerts = alerts.AlertPipeline(alerts.build_sinks(self.config.get('alert_sinks') or []))
+        self.alerts.configure(self.config['alerts'])
+        
+        # Sample History (on-disk wire-format frames; replay, export and reports read it back)
+        self.history = history.HistoryStore(
+            config.data_path("history", self.config_path),
+            retention_days=int(self.intervals.get('history_days') or history.RETENTION_DAYS)
+        )
+        self.report_day = None
+        self.export_job = None
+        
+        # System sampling and integrity hashing in a child process (shared-memory rings; in process
+        # when it is off or the platform cannot use the rings)
+        self.collector = collector_proc.CollectorSupervisor(interval=float(self.intervals['sample_seconds']))
+        
+        # Site SLOs (rolling bucketed windows, rebuilt from history when monitoring starts)
+        self.sla = sla.SLATracker()
+        self.sla.configure(self.config['slo'])
+        
+        # Threat Events
+        self.threats = threats.ThreatLog(
+            on_new=self.on_threat_detected,
+            on_report=self.alerts.observe,
+            on_resolve=self.alerts.clear
+        )
+        
+        # Self Instrumentation
+        self.selfmon = selfmon.SelfMonitor()
+        
+        # Probe Latency Histograms
+        self.latency_recorder = latency.LatencyRecorder()
+        
+        # Latency Prober (TCP connect / ICMP echo rounds on its own event loop thread)
+        self.pinger = pinger.Pinger(
+            self.latency_targets(),
+            interval=max(0.2, float(self.intervals.get('ping_seconds') or 1)),
+            on_result=self.on_latency_result
+        )
+        
+        # Path Monitor (traceroute only when a site's latency degrades)
+        self.path_monitor = pathprobe.PathMonitor()
+        self.path_probe_running = False
+        
+        # Anti-Cheat (fed by process exec/exit events while anticheat_enabled is on)
+        self.anticheat = anticheat.AntiCheatScanner(self.threats, self.security_config.get('anticheat_watch') or [])
+        self.process_watcher = procevents.ProcessWatcher(self.on_process_event, on_overflow=self.anticheat.bootstrap)
+        self.anticheat_refresh_pending = False
+        
+        # File Integrity (baseline once, then inotify-driven rehash of changed files)
+        self.integrity_monitor = None
+        
+        # Scan Detector (socket table deltas each sample while threat_detection is on)
+        self.scan_detector = scandetect.ScanDetector(
+            self.threats,
+            port_threshold=self.security_config.get('scan_port_threshold') or scandetect.PORT_SCAN_THRESHOLD,
+            conn_threshold=self.security_config.get('scan_conn_threshold') or scandetect.CONN_FLOOD_THRESHOLD,
+        )
+        
+        # Packet Capture (optional; traffic rates, top talkers, DNS, and inbound SYNs for the scan detector)
+        self.capture = capture.PacketCapture(
+            self.security_config.get('capture_interface'),
+            on_syn=self.scan_detector.record,
+            on_dns_leak=self.on_dns_leak
+        )
+        self.capture_sample = None
+        
+        # Log Watcher (auth/access log signatures feed the threat log while threat_detection is on)
+        self.log_watcher = logwatch.LogWatcher(
+            self.config.get('log_sources') or [], self.threats,
+            state_path=config.data_path("logwatch.offsets", self.config_path)
+        )
+        
+        # DNS Cache (HTTP probes resolve through it via socket.getaddrinfo)
+        self.dns_cache = dnscache.DNSCache(self.latency_recorder)
+        self.dns_cache.install()
+        
+        # TLS Probe (created on first use; importing ssl is deferred)
+        self.tls_probe = None
+        
+        # Metrics Export
+        self.metrics = exporter.MetricsRegistry()
+        self.metrics_exporter = None
+        
+        # Site Probe Engine (sites grouped by host share a keep-alive session)
+        self.probe_engine = probes.ProbeEngine(
+            self.probe_site,
+            on_group_done=lambda state: self.after(0, self.refresh_sites_table)
+        )
+        self._grouped_sites = None
+        
+        # Build UI (skeleton only; views fill in after the first sample)
         self.build_ui()
+        startup.REPORT.mark("skeleton_built")
+        self.after(0, lambda: startup.REPORT.mark("first_paint"))
+        
+        # Measure Tk event loop lag
+        self.schedule_lag_probe()
+        
+        # Start optional Prometheus endpoint
+        self.start_metrics_exporter()
+        
+        # Hot-reload the config file
+        self.start_config_watcher()
         
         # Start background monitoring
         self.start_monitoring_thread()
@@ -134,6 +285,7 @@ class SecureNetMonitor(ctk.CTk):
             ("🛡️ Anti-Cheat", "anticheat"),
             ("⚠️ Threat Monitor", "threats"),
             ("📈 Analytics", "analytics"),
+            ("🩺 Monitor Health", "health"),
             ("⚙️ Settings", "settings")
         ]
         
@@ -202,9 +354,22 @@ class SecureNetMonitor(ctk.CTk):
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(0, weight=1)
         
-        # Show Dashboard by default
+        # Dashboard is the default view, built once the first sample arrives
         self.current_view = "dashboard"
-        self.show_dashboard_view()
+        self.views_ready = False
+        self.show_skeleton_view()
+    
+    def show_skeleton_view(self):
+        """Lightweight placeholder shown until the first collector sample"""
+        card = self.create_info_card("📊 Dashboard", "#2c3e50")
+        card.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            card,
+            text="⏳ Collecting first sample...",
+            font=("Segoe UI", 16),
+            text_color="#7f8c8d"
+        ).pack(pady=40)
     
     def create_top_stats_bar(self):
         """Create top statistics bar"""
@@ -224,7 +389,7 @@ class SecureNetMonitor(ctk.CTk):
         ]
         
         for idx, (title, key, color) in enumerate(stats_data):
-            card = self.create_stat_card(stats_bar, title, "0", color)
+            card = self.create_stat_card(stats_bar, title, "--", color)
             card.grid(row=0, column=idx, padx=10, pady=15, sticky="ew")
             self.stat_cards[key] = card
     
@@ -403,12 +568,12 @@ class SecureNetMonitor(ctk.CTk):
         )
         sites_card.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         
-        # Table for websites
+        # Table for website groups (one row per host or configured group)
         self.sites_table_frame = ctk.CTkScrollableFrame(sites_card, fg_color="transparent")
         self.sites_table_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Headers
-        headers = ["Website", "URL", "Status", "Response Time"]
+        headers = ["Website", "Sites", "Status", "Response Time", "Uptime 1h / 24h / 30d", "Budget Burn 1h"]
         for idx, header in enumerate(headers):
             lbl = ctk.CTkLabel(
                 self.sites_table_frame,
@@ -417,19 +582,21 @@ class SecureNetMonitor(ctk.CTk):
             )
             lbl.grid(row=0, column=idx, padx=10, pady=5)
         
+        self.sync_site_groups()
         self.site_labels = []
-        for idx, site in enumerate(self.monitored_sites, start=1):
+        rows = min(DASHBOARD_GROUP_ROWS, len(self.probe_engine.states))
+        for idx in range(1, rows + 1):
             row_labels = []
             
             # Name
-            name_lbl = ctk.CTkLabel(self.sites_table_frame, text=site['name'], font=("Segoe UI", 11))
+            name_lbl = ctk.CTkLabel(self.sites_table_frame, text="", font=("Segoe UI", 11))
             name_lbl.grid(row=idx, column=0, padx=10, pady=5)
             row_labels.append(name_lbl)
             
-            # URL
-            url_lbl = ctk.CTkLabel(self.sites_table_frame, text=site['url'], font=("Segoe UI", 11), text_color="#7f8c8d")
-            url_lbl.grid(row=idx, column=1, padx=10, pady=5)
-            row_labels.append(url_lbl)
+            # Site count
+            count_lbl = ctk.CTkLabel(self.sites_table_frame, text="", font=("Segoe UI", 11), text_color="#7f8c8d")
+            count_lbl.grid(row=idx, column=1, padx=10, pady=5)
+            row_labels.append(count_lbl)
             
             # Status
             status_lbl = ctk.CTkLabel(self.sites_table_frame, text="●", font=("Segoe UI", 11))
@@ -441,7 +608,73 @@ class SecureNetMonitor(ctk.CTk):
             time_lbl.grid(row=idx, column=3, padx=10, pady=5)
             row_labels.append(time_lbl)
             
+            # Rolling uptime and error-budget burn
+            uptime_lbl = ctk.CTkLabel(self.sites_table_frame, text="", font=("Consolas", 11))
+            uptime_lbl.grid(row=idx, column=4, padx=10, pady=5)
+            row_labels.append(uptime_lbl)
+            burn_lbl = ctk.CTkLabel(self.sites_table_frame, text="", font=("Consolas", 11))
+            burn_lbl.grid(row=idx, column=5, padx=10, pady=5)
+            row_labels.append(burn_lbl)
+            
             self.site_labels.append(row_labels)
+        
+        self.sites_more_label = ctk.CTkLabel(self.sites_table_frame, text="", font=("Segoe UI", 11),
+                                             text_color="#7f8c8d")
+        self.sites_more_label.grid(row=rows + 1, column=0, columnspan=6, pady=5)
+        self.refresh_sites_table()
+    
+    def refresh_sites_table(self):
+        """Show per-group aggregates, unhealthy groups first"""
+        if not hasattr(self, 'sites_table_frame') or not self.sites_table_frame.winfo_exists():
+            return
+        states = self.probe_engine.summaries()
+        now = time.time()
+        for row, state in zip(self.site_labels, states):
+            sites = state.group.sites
+            single = state.total == 1
+            row[0].configure(text=sites[0]['name'] if single else state.key)
+            row[1].configure(text=str(state.total))
+            windows = self.sla.stats([site['url'] for site in sites], now)
+            if windows[0].probes:
+                burn = windows[0].availability_burn
+                row[4].configure(text=sla.format_uptime(windows))
+                row[5].configure(text=f"{burn:.1f}x", text_color=(
+                    "#e74c3c" if burn >= sla.FAST_BURN[1] else "#f39c12" if burn > 1 else "#27ae60"))
+            else:
+                row[4].configure(text="-")
+                row[5].configure(text="-", text_color="#7f8c8d")
+            if not state.checked:
+                row[2].configure(text="●", text_color="#7f8c8d")
+                row[3].configure(text="--- ms")
+                continue
+            if single:
+                status = sites[0].get('status', "●")
+            elif state.up == state.total:
+                status = f"✅ {state.up}/{state.total} Online"
+            elif state.up == 0:
+                status = f"❌ 0/{state.total} Online"
+            else:
+                status = f"⚠️ {state.up}/{state.total} Online"
+            if state.up == state.total:
+                color = "#27ae60"
+            elif state.up == 0:
+                color = "#e74c3c"
+            else:
+                color = "#f39c12"
+            row[2].configure(text=status, text_color=color)
+            if not state.up:
+                row[3].configure(text="No response")
+            elif single:
+                row[3].configure(text=f"{state.avg_ms:.0f} ms")
+            else:
+                row[3].configure(text=f"{state.avg_ms:.0f} ms avg / {state.max_ms:.0f} max")
+        for row in self.site_labels[len(states):]:
+            for label in row:
+                label.configure(text="")
+        hidden = len(states) - len(self.site_labels)
+        self.sites_more_label.configure(
+            text=f"+ {hidden} more groups ({len(self.monitored_sites)} sites)" if hidden > 0 else ""
+        )
     
     def create_info_card(self, title, color):
         """Create an info card with title"""
@@ -467,7 +700,13 @@ class SecureNetMonitor(ctk.CTk):
     def switch_view(self, view_name):
         """Switch between different views"""
         self.current_view = view_name
+        self.views_ready = True
         
+        with self.selfmon.track(f"view:{view_name}", "ui"):
+            self.show_view(view_name)
+    
+    def show_view(self, view_name):
+        """Build the widgets for a view"""
         if view_name == "dashboard":
             self.show_dashboard_view()
         elif view_name == "network":
@@ -480,6 +719,8 @@ class SecureNetMonitor(ctk.CTk):
             self.show_threats_view()
         elif view_name == "analytics":
             self.show_analytics_view()
+        elif view_name == "health":
+            self.show_health_view()
         elif view_name == "settings":
             self.show_settings_view()
     
@@ -490,13 +731,15 @@ class SecureNetMonitor(ctk.CTk):
         card = self.create_info_card("🌐 Network Detailed Information", "#16a085")
         card.pack(fill="both", expand=True, padx=10, pady=10)
         
-        info = ctk.CTkLabel(
+        ctk.CTkLabel(
             card,
-            text="Network monitoring in progress...\nDetailed stats will appear here.",
-            font=("Segoe UI", 14),
-            justify="left"
-        )
-        info.pack(pady=20)
+            text=f"Probe latency percentiles (last {self.latency_recorder.window_seconds // 60:.0f} min)",
+            font=("Segoe UI", 14, "bold")
+        ).pack(anchor="w", padx=20, pady=(10, 0))
+        
+        self.latency_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
+        self.latency_textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        self.refresh_latency_view()
     
     def show_vpn_view(self):
         """VPN detection detailed view"""
@@ -505,9 +748,27 @@ class SecureNetMonitor(ctk.CTk):
         card = self.create_info_card("🔐 VPN & Proxy Detection System", "#8e44ad")
         card.pack(fill="both", expand=True, padx=10, pady=10)
         
-        info = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
-        info.pack(fill="both", expand=True, padx=20, pady=20)
-        info.insert("1.0", "VPN Detection System Active\n\nChecking for:\n• VPN Services\n• Proxy Servers\n• TOR Network\n• Data Center IPs\n\nResults will appear here...")
+        self.vpn_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
+        self.vpn_textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        self.refresh_vpn_view()
+    
+    def refresh_vpn_view(self):
+        """Redraw the VPN view, with per-interface traffic when capture is on"""
+        if self.current_view != "vpn" or not hasattr(self, 'vpn_textbox'):
+            return
+        try:
+            if not self.vpn_textbox.winfo_exists():
+                return
+            text = "VPN Detection System Active\n\nChecking for:\n• VPN Services\n• Proxy Servers\n• TOR Network\n• Data Center IPs\n\nResults will appear here..."
+            interfaces = self.capture.format_interfaces()
+            if interfaces:
+                text += "\n\n" + interfaces
+            self.vpn_textbox.configure(state="normal")
+            self.vpn_textbox.delete("1.0", "end")
+            self.vpn_textbox.insert("1.0", text)
+            self.vpn_textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"VPN view error: {e}")
     
     def show_anticheat_view(self):
         """Anti-cheat system view"""
@@ -516,12 +777,28 @@ class SecureNetMonitor(ctk.CTk):
         card = self.create_info_card("🛡️ Anti-Cheat Protection System", "#e67e22")
         card.pack(fill="both", expand=True, padx=10, pady=10)
         
-        info = ctk.CTkLabel(
-            card,
-            text="Anti-Cheat System Active\n\nMonitoring for suspicious activities...",
-            font=("Segoe UI", 14)
-        )
-        info.pack(pady=20)
+        self.anticheat_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
+        self.anticheat_textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        self.refresh_anticheat_view()
+    
+    def refresh_anticheat_view(self):
+        """Redraw the live process feed"""
+        self.anticheat_refresh_pending = False
+        if self.current_view != "anticheat" or not hasattr(self, 'anticheat_textbox'):
+            return
+        try:
+            if not self.anticheat_textbox.winfo_exists():
+                return
+            if self.security_config['anticheat_enabled']:
+                text = self.anticheat.format_view(self.process_watcher.mode, self.process_watcher.events_seen)
+            else:
+                text = "Anti-Cheat protection is disabled in Settings."
+            self.anticheat_textbox.configure(state="normal")
+            self.anticheat_textbox.delete("1.0", "end")
+            self.anticheat_textbox.insert("1.0", text)
+            self.anticheat_textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"Anti-cheat view error: {e}")
     
     def show_threats_view(self):
         """Threat monitoring view"""
@@ -530,12 +807,33 @@ class SecureNetMonitor(ctk.CTk):
         card = self.create_info_card("⚠️ Threat Detection & Analysis", "#c0392b")
         card.pack(fill="both", expand=True, padx=10, pady=10)
         
-        info = ctk.CTkLabel(
-            card,
-            text="Threat monitoring system active...",
-            font=("Segoe UI", 14)
-        )
-        info.pack(pady=20)
+        self.threats_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
+        self.threats_textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        self.refresh_threats_view()
+    
+    def refresh_threats_view(self):
+        """Redraw the threat event list and certificate table"""
+        if self.current_view != "threats" or not hasattr(self, 'threats_textbox'):
+            return
+        try:
+            if not self.threats_textbox.winfo_exists():
+                return
+            text = f"Threat Level: {self.threat_level}\n\n" + self.threats.format_table()
+            text += "\n\n" + self.alerts.format_table()
+            if self.tls_probe is not None:
+                text += "\n\n" + self.tls_probe.format_table()
+            if self.integrity_monitor is not None:
+                text += "\n\n" + self.integrity_monitor.format_table()
+            if self.log_watcher.running:
+                text += "\n\n" + self.log_watcher.format_table()
+            if self.security_config['threat_detection']:
+                text += "\n\n" + self.scan_detector.format_table()
+            self.threats_textbox.configure(state="normal")
+            self.threats_textbox.delete("1.0", "end")
+            self.threats_textbox.insert("1.0", text)
+            self.threats_textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"Threat view error: {e}")
     
     def show_analytics_view(self):
         """Analytics view with charts"""
@@ -550,6 +848,163 @@ class SecureNetMonitor(ctk.CTk):
             font=("Segoe UI", 14)
         )
         info.pack(pady=20)
+        
+        export_row = ctk.CTkFrame(card, fg_color="transparent")
+        export_row.pack(fill="x", padx=20, pady=(0, 10))
+        self.export_range = ctk.CTkOptionMenu(export_row, values=list(EXPORT_RANGES))
+        self.export_range.pack(side="left", padx=(0, 10))
+        self.export_format = ctk.CTkOptionMenu(export_row, values=export.available_formats())
+        self.export_format.pack(side="left", padx=(0, 10))
+        ctk.CTkButton(export_row, text="Export", width=90, command=self.export_history).pack(side="left", padx=(0, 10))
+        ctk.CTkButton(export_row, text="Today's Report", width=120,
+                      command=self.show_daily_report).pack(side="left")
+        self.export_label = ctk.CTkLabel(card, text="", font=("Consolas", 11), justify="left")
+        self.export_label.pack(anchor="w", padx=20)
+        self.report_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=160)
+        self.report_textbox.pack(fill="x", padx=20, pady=(0, 10))
+        self.report_textbox.insert("1.0", "Daily reports are written to " + config.data_path("reports", self.config_path))
+        self.report_textbox.configure(state="disabled")
+        
+        self.latency_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=300)
+        self.latency_textbox.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        self.refresh_latency_view()
+    
+    def set_export_label(self, text):
+        if hasattr(self, 'export_label') and self.export_label.winfo_exists():
+            self.export_label.configure(text=text)
+    
+    def export_history(self):
+        """Stream the selected range of stored history to a file in the exports directory"""
+        if self.export_job is not None and not self.export_job.done:
+            self.export_job.cancel()
+            return
+        hours = EXPORT_RANGES[self.export_range.get()]
+        fmt = self.export_format.get()
+        end_ms = int(time.time() * 1000)
+        start_ms = end_ms - int(hours * 3600 * 1000) if hours else None
+        path = os.path.join(config.data_path("exports", self.config_path),
+                            time.strftime("securenet-%Y%m%d-%H%M%S") + export.EXTENSIONS[fmt])
+        job = self.export_job = export.ExportJob(self.history, path, fmt, start_ms=start_ms, end_ms=end_ms)
+        self.set_export_label(f"Exporting to {path} (click Export again to cancel)...")
+        
+        def run():
+            job.run()
+            text = (f"Export failed: {job.error}" if job.error
+                    else f"Exported {job.rows} rows in {job.elapsed:.1f} s to {path}")
+            self.after(0, self.set_export_label, text)
+        
+        self.run_in_background("export", run)
+    
+    def show_daily_report(self):
+        """Build today's report so far in the background and show it in the analytics view"""
+        day = history.day_of(int(time.time() * 1000))
+        limits, settings = self.threshold_limits(), dict(self.config['alerts'])
+        self.set_export_label(f"Building report for {day}...")
+        
+        def job():
+            try:
+                text = export.format_report(export.daily_report(self.history, day, limits, settings))
+            except (OSError, ValueError) as e:
+                text = f"Report failed: {e}"
+            self.after(0, self.show_report_text, text)
+        
+        self.run_in_background("report", job)
+    
+    def show_report_text(self, text):
+        self.set_export_label("")
+        if self.current_view != "analytics" or not self.report_textbox.winfo_exists():
+            return
+        self.report_textbox.configure(state="normal")
+        self.report_textbox.delete("1.0", "end")
+        self.report_textbox.insert("1.0", text)
+        self.report_textbox.configure(state="disabled")
+    
+    def refresh_latency_view(self):
+        """Redraw the latency percentile table in the network/analytics view"""
+        if self.current_view not in ("network", "analytics") or not hasattr(self, 'latency_textbox'):
+            return
+        try:
+            if not self.latency_textbox.winfo_exists():
+                return
+            self.latency_textbox.configure(state="normal")
+            self.latency_textbox.delete("1.0", "end")
+            text = self.latency_recorder.format_table()
+            if self.current_view == "network":
+                text += "\n\n" + self.pinger.format_table()
+                text += "\n\n" + self.path_monitor.format_table()
+                text += "\n\n" + self.dns_cache.format_table()
+                text += "\n\n" + self.capture.format_table()
+            self.latency_textbox.insert("1.0", text)
+            self.latency_textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"Latency view error: {e}")
+    
+    def show_health_view(self):
+        """Monitor self-instrumentation view"""
+        self.clear_content_frame()
+        
+        card = self.create_info_card("🩺 Monitor Health", "#16a085")
+        card.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        controls = ctk.CTkFrame(card, fg_color="transparent")
+        controls.pack(fill="x", padx=20, pady=(10, 0))
+        
+        self.profiler_button = ctk.CTkButton(
+            controls,
+            text="⏹ Stop Profiler" if self.selfmon.profiler.running else "▶ Start Profiler",
+            font=("Segoe UI", 12, "bold"),
+            width=160,
+            command=self.toggle_profiler
+        )
+        self.profiler_button.pack(side="left", padx=(0, 10))
+        
+        ctk.CTkButton(
+            controls,
+            text="💾 Dump Flamegraph Stacks",
+            font=("Segoe UI", 12, "bold"),
+            width=200,
+            command=self.dump_profile
+        ).pack(side="left")
+        
+        self.health_textbox = ctk.CTkTextbox(card, font=("Consolas", 12), height=400)
+        self.health_textbox.pack(fill="both", expand=True, padx=20, pady=20)
+        self.refresh_health_view()
+    
+    def refresh_health_view(self):
+        """Redraw the monitor health report"""
+        if self.current_view != "health" or not hasattr(self, 'health_textbox'):
+            return
+        try:
+            if not self.health_textbox.winfo_exists():
+                return
+            self.health_textbox.configure(state="normal")
+            self.health_textbox.delete("1.0", "end")
+            self.health_textbox.insert(
+                "1.0", self.selfmon.format_report() + "\n\n" + self.collector.format_status()
+                + "\n\n" + startup.REPORT.format_report()
+            )
+            self.health_textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"Health view error: {e}")
+    
+    def toggle_profiler(self):
+        """Start or stop the sampling profiler"""
+        profiler = self.selfmon.profiler
+        if profiler.running:
+            profiler.stop()
+            self.profiler_button.configure(text="▶ Start Profiler")
+        else:
+            profiler.start()
+            self.profiler_button.configure(text="⏹ Stop Profiler")
+    
+    def dump_profile(self):
+        """Write collapsed stacks for flamegraph tools"""
+        path = f"securenet-profile-{datetime.now():%Y%m%d-%H%M%S}.folded"
+        try:
+            count = self.selfmon.profiler.dump(path)
+            messagebox.showinfo("Profile Saved", f"{count} stacks written to {path}")
+        except OSError as e:
+            messagebox.showerror("Profile Error", str(e))
     
     def show_settings_view(self):
         """Settings view"""
@@ -570,7 +1025,15 @@ class SecureNetMonitor(ctk.CTk):
             font=("Segoe UI", 16, "bold")
         ).pack(anchor="w", pady=(10, 5))
         
-        self.vpn_check_var = ctk.BooleanVar(value=True)
+        ctk.CTkLabel(
+            settings_frame,
+            text=f"Config file: {self.config_path}"
+                 + (f"  (watching via {self.config_watcher.mode})" if self.config_watcher else ""),
+            font=("Segoe UI", 11),
+            text_color="#7f8c8d"
+        ).pack(anchor="w", pady=(0, 5))
+        
+        self.vpn_check_var = ctk.BooleanVar(value=self.security_config['vpn_check_enabled'])
         ctk.CTkCheckBox(
             settings_frame,
             text="Enable VPN Detection",
@@ -578,7 +1041,7 @@ class SecureNetMonitor(ctk.CTk):
             font=("Segoe UI", 12)
         ).pack(anchor="w", pady=5)
         
-        self.anticheat_var = ctk.BooleanVar(value=True)
+        self.anticheat_var = ctk.BooleanVar(value=self.security_config['anticheat_enabled'])
         ctk.CTkCheckBox(
             settings_frame,
             text="Enable Anti-Cheat System",
@@ -586,7 +1049,7 @@ class SecureNetMonitor(ctk.CTk):
             font=("Segoe UI", 12)
         ).pack(anchor="w", pady=5)
         
-        self.threat_var = ctk.BooleanVar(value=True)
+        self.threat_var = ctk.BooleanVar(value=self.security_config['threat_detection'])
         ctk.CTkCheckBox(
             settings_frame,
             text="Enable Threat Detection",
@@ -603,14 +1066,23 @@ class SecureNetMonitor(ctk.CTk):
         
         ctk.CTkLabel(settings_frame, text="CPU Threshold (%):").pack(anchor="w", pady=5)
         self.cpu_threshold = ctk.CTkSlider(settings_frame, from_=50, to=100)
-        self.cpu_threshold.set(85)
+        self.cpu_threshold.set(self.security_config['max_cpu_threshold'])
         self.cpu_threshold.pack(fill="x", pady=5)
         
         ctk.CTkLabel(settings_frame, text="Memory Threshold (%):").pack(anchor="w", pady=5)
         self.mem_threshold = ctk.CTkSlider(settings_frame, from_=50, to=100)
-        self.mem_threshold.set(90)
+        self.mem_threshold.set(self.security_config['max_memory_threshold'])
         self.mem_threshold.pack(fill="x", pady=5)
         
+        ctk.CTkButton(
+            settings_frame,
+            text="Preview Alerts (last 7 days)",
+            font=("Segoe UI", 12),
+            command=self.preview_thresholds
+        ).pack(anchor="w", pady=5)
+        self.preview_label = ctk.CTkLabel(settings_frame, text="", font=("Consolas", 11), justify="left")
+        self.preview_label.pack(anchor="w", pady=5)
+        
         # Save Button
         save_btn = ctk.CTkButton(
             settings_frame,
@@ -623,16 +1095,167 @@ class SecureNetMonitor(ctk.CTk):
         )
         save_btn.pack(pady=20)
     
+    def preview_thresholds(self):
+        """Replay stored history against the saved and slider thresholds and show the alert counts"""
+        candidates = {}
+        for setting, slider in (('max_cpu_threshold', self.cpu_threshold), ('max_memory_threshold', self.mem_threshold)):
+            saved, proposed = self.security_config[setting], round(slider.get())
+            candidates[setting] = [saved] if saved == proposed else [saved, proposed]
+        self.preview_label.configure(text="Replaying history...")
+        
+        def job():
+            engine = replay.ReplayEngine(self.history, self.config['alerts'])
+            try:
+                text = replay.format_results(engine.compare(candidates))
+            except Exception as e:
+                text = f"Replay failed: {e}"
+            self.after(0, lambda: self.preview_label.winfo_exists() and self.preview_label.configure(text=text))
+        
+        self.run_in_background("replay", job)
+    
     def save_settings(self):
         """Save settings"""
         self.security_config['vpn_check_enabled'] = self.vpn_check_var.get()
         self.security_config['anticheat_enabled'] = self.anticheat_var.get()
         self.security_config['threat_detection'] = self.threat_var.get()
-        self.security_config['max_cpu_threshold'] = self.cpu_threshold.get()
-        self.security_config['max_memory_threshold'] = self.mem_threshold.get()
+        self.security_config['max_cpu_threshold'] = round(self.cpu_threshold.get())
+        self.security_config['max_memory_threshold'] = round(self.mem_threshold.get())
         
+        self.config['security'] = dict(self.security_config)
+        try:
+            config.save(self.config, self.config_path)
+        except OSError as e:
+            messagebox.showerror("Settings Error", f"Could not write {self.config_path}: {e}")
+            return
+        
+        self.update_process_watcher()
+        self.update_log_watcher()
         messagebox.showinfo("Settings Saved", "Your settings have been saved successfully!")
     
+    def start_config_watcher(self):
+        """Watch the config file and hot-apply changes"""
+        self.config_watcher = config.ConfigWatcher(
+            self.config_path,
+            lambda data: self.after(0, self.apply_config, data)
+        )
+        self.config_watcher.start()
+    
+    def apply_config(self, data):
+        """Apply a reloaded config to running collectors without a restart"""
+        old_port = self.security_config.get('metrics_port')
+        self.security_config.update(data['security'])
+        self.intervals.update(data['intervals'])
+        self.history.retention_days = int(self.intervals.get('history_days') or history.RETENTION_DAYS)
+        self.sla.configure(data['slo'])
+        sinks_changed = data.get('alert_sinks') != self.config.get('alert_sinks')
+        self.alerts.configure(data['alerts'], alerts.build_sinks(data.get('alert_sinks') or []) if sinks_changed else None)
+        
+        # Diff sites in place so unchanged sites keep their probe state
+        added, removed, changed = config.diff_sites(self.monitored_sites, self.load_sites(data))
+        for old, new in changed:
+            if (old['name'], old['url']) != (new['name'], new['url']):
+                self.forget_site_series(old)    # renamed: its histograms and series carry the old labels
+            old.update({k: v for k, v in new.items() if k != 'status'})
+        if removed:
+            removed_keys = {config.site_key(site) for site in removed}
+            self.monitored_sites = [
+                site for site in self.monitored_sites if config.site_key(site) not in removed_keys
+            ]
+            for site in removed:
+                self.forget_site(site)
+        if added:
+            self.monitored_sites = self.monitored_sites + [dict(site, status='Unknown') for site in added]
+        checks_changed = data.get('synthetic_checks') != self.config.get('synthetic_checks')
+        if checks_changed:
+            self.reload_synthetic_checks(data.get('synthetic_checks') or [])
+        self.config = data
+        self.sync_site_groups(force=True)
+        self.pinger.set_interval(max(0.2, float(self.intervals.get('ping_seconds') or 1)))
+        targets = self.latency_targets()
+        for target in self.pinger.stats.keys() - set(targets):
+            self.latency_recorder.discard('internet_tcp', target)
+            self.latency_recorder.discard('icmp_echo', target)
+        self.pinger.set_targets(targets)
+        self.anticheat.set_watch(self.security_config.get('anticheat_watch') or [])
+        self.update_process_watcher()
+        self.update_collector()
+        self.update_integrity_monitor()
+        self.log_watcher.set_paths(self.config.get('log_sources') or [])
+        self.update_capture()
+        self.scan_detector.port_threshold = self.security_config.get('scan_port_threshold') or scandetect.PORT_SCAN_THRESHOLD
+        self.scan_detector.conn_threshold = self.security_config.get('scan_conn_threshold') or scandetect.CONN_FLOOD_THRESHOLD
+        self.update_log_watcher()
+        
+        if self.security_config.get('metrics_port') != old_port:
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.stop()
+                self.metrics_exporter = None
+            self.start_metrics_exporter()
+        
+        if (added or removed or changed or checks_changed) and self.views_ready and self.current_view == "dashboard":
+            self.show_view("dashboard")
+    
+    def reload_synthetic_checks(self, raw_checks):
+        """Swap in edited synthetic checks, keeping the last result of checks that still exist"""
+        checks = synthetic.load_checks(raw_checks)
+        previous = {check['url']: check for check in self.synthetic_checks}
+        for check in checks:
+            old = previous.pop(check['url'], None)
+            if old is not None:
+                check.update({k: old[k] for k in ('status', 'up', 'response_ms') if k in old})
+        for old in previous.values():
+            self.forget_site(old)
+        self.synthetic_checks = checks
+    
+    def latency_targets(self):
+        """Configured latency targets, defaulting to the internet check address"""
+        return list(self.config.get('latency_targets') or ['%s:%d' % INTERNET_CHECK_ADDR])
+    
+    def load_sites(self, data):
+        """Inline and bulk-imported sites, normalised and deduplicated by URL"""
+        result = site_import.load_sources(data['sites'], data.get('site_sources') or [])
+        if result.duplicates or result.invalid:
+            print(f"Site import: {len(result.sites)} sites, skipped {result.duplicates} duplicates "
+                  f"and {result.invalid} invalid URLs")
+        return [dict(site, status='Unknown') for site in result.sites]
+    
+    def sync_site_groups(self, force=False):
+        """Regroup sites for the probe engine when the site list has been replaced"""
+        if not force and self._grouped_sites is self.monitored_sites:
+            return
+        default_interval = self.every('sites_every') * float(self.intervals['sample_seconds'])
+        groups = site_import.group_sites(
+            self.monitored_sites + self.synthetic_checks,
+            default_interval,
+            float(self.intervals.get('site_timeout') or 5),
+            self.config.get('site_groups')
+        )
+        self.probe_engine.set_groups(groups)
+        self._grouped_sites = self.monitored_sites
+    
+    def forget_site_series(self, site):
+        """Drop the histograms and metric series labelled with a site's name and URL"""
+        labels = {'site': site['name'], 'url': site['url']}
+        self.latency_recorder.discard('site_get', site['name'])
+        self.metrics.remove('site_up', labels)
+        self.metrics.remove('site_probe_duration_seconds', labels)
+        for step in site.get('steps', ()):
+            self.metrics.remove('synthetic_step_duration_seconds', {'check': site['name'], 'step': step.name})
+        for window in sla.WINDOW_NAMES:
+            self.metrics.remove('site_availability_percent', dict(labels, window=window))
+            self.metrics.remove('site_error_budget_burn_rate', dict(labels, window=window))
+    
+    def forget_site(self, site):
+        """Release per-site probe state for a site that is no longer monitored"""
+        self.forget_site_series(site)
+        for key in self.sla.forget(site['url']):
+            self.alerts.clear(key)
+        parts = urllib.parse.urlsplit(site['url'])
+        self.path_monitor.forget(parts.hostname)
+        if self.tls_probe is not None and parts.scheme == "https":
+            self.tls_probe.forget(parts.hostname, parts.port or 443)
+        self.alerts.clear(f"site:{site['url']}")
+    
     def start_monitoring(self):
         """Start monitoring"""
         self.monitoring_active = True
@@ -643,33 +1266,256 @@ class SecureNetMonitor(ctk.CTk):
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring_active = False
+        self.history.flush()
         self.btn_start.configure(state="normal")
         self.btn_stop.configure(state="disabled")
         self.status_indicator.configure(text="● STOPPED", text_color="#e74c3c")
     
+    def start_metrics_exporter(self):
+        """Start the Prometheus/OpenMetrics endpoint if a port is configured"""
+        port = self.security_config.get('metrics_port')
+        if not port:
+            return
+        try:
+            self.metrics_exporter = exporter.MetricsExporter(self.metrics, port=int(port))
+            self.metrics_exporter.start()
+        except OSError as e:
+            print(f"Metrics exporter error: {e}")
+            self.metrics_exporter = None
+    
+    def publish_metrics(self, cpu, memory, disk):
+        """Push the latest sample and counters into the metrics registry"""
+        m = self.metrics
+        m.set_gauge('cpu_usage_percent', cpu, "System CPU utilisation")
+        m.set_gauge('memory_usage_percent', memory, "System memory utilisation")
+        m.set_gauge('disk_usage_percent', disk, "Root filesystem utilisation")
+        if self.history_data['latency']:
+            m.set_gauge('latency_ms', self.history_data['latency'][-1], "Last measured network latency")
+        if self.pinger.last_round is not None:
+            m.set_gauge('latency_loss_ratio', round(self.pinger.last_round.loss, 4),
+                        "Share of latency probes unanswered in the last round")
+        if self.capture.running and self.history_data['network_in']:
+            m.set_gauge('network_download_kbps', self.history_data['network_in'][-1], "Captured inbound traffic, KB/s")
+            m.set_gauge('network_upload_kbps', self.history_data['network_out'][-1], "Captured outbound traffic, KB/s")
+            m.set_counter('capture_kernel_drops', self.capture.kernel_drops, "Packets the capture ring dropped")
+        m.set_gauge('uptime_seconds', self.stats['uptime_seconds'], "Monitor uptime")
+        m.set_counter('scans', self.stats['total_scans'], "Completed monitoring scans")
+        m.set_counter('threats_detected', self.stats['threats_detected'], "Threats detected")
+        m.set_counter('alerts_sent', self.alerts.alert_count, "Alert notifications dispatched")
+        m.set_counter('collector_restarts', self.collector.restarts, "Collector process restarts")
+        m.set_counter('vpn_detections', self.stats['vpn_detections'], "VPN/proxy detections")
+    
+    def schedule_lag_probe(self, interval_ms=500):
+        """Measure how late Tk runs a timer callback"""
+        expected = time.perf_counter() + interval_ms / 1000
+        
+        def probe():
+            self.selfmon.record_lag(time.perf_counter() - expected)
+            self.schedule_lag_probe(interval_ms)
+        
+        self.after(interval_ms, probe)
+    
+    def run_in_background(self, section, target):
+        """Run a probe in a daemon thread, timed by the self-monitor"""
+        def runner():
+            with self.selfmon.track(section, "probe"):
+                target()
+        
+        threading.Thread(target=runner, daemon=True).start()
+    
     def start_monitoring_thread(self):
         """Start background monitoring thread"""
         def monitor_loop():
             self.monitoring_active = True
+            # Fixed-rate schedule: samples land on a regular grid, which
+            # keeps timestamp deltas constant for the compact wire format
+            next_tick = time.time()
             while True:
                 if self.monitoring_active:
-                    self.update_all_data()
-                time.sleep(2)
+                    with self.selfmon.track("collect_cycle"):
+                        self.update_all_data(int(next_tick * 1000))
+                next_tick += max(0.5, float(self.intervals['sample_seconds']))
+                delay = next_tick - time.time()
+                if delay < 0:
+                    next_tick = time.time()
+                    delay = 0
+                time.sleep(delay)
         
         thread = threading.Thread(target=monitor_loop, daemon=True)
         thread.start()
+        self.pinger.start()
+        self.alerts.start()
+        self.seed_sla()
+        self.update_collector()
+        self.update_process_watcher()
+        self.update_integrity_monitor()
+        self.update_log_watcher()
+        self.update_capture()
+    
+    def update_collector(self):
+        """Start or stop the collector process to match the config"""
+        self.collector.set_interval(float(self.intervals['sample_seconds']))
+        if self.security_config.get('collector_process'):
+            if not self.collector.running:
+                self.collector.start()
+                atexit.register(self.collector.stop)
+        elif self.collector.running:
+            self.collector.stop()
+            atexit.unregister(self.collector.stop)
+    
+    def seed_sla(self):
+        """Rebuild the 30 day SLO windows from stored probe history in the background"""
+        sites = [site['url'] for site in self.monitored_sites + self.synthetic_checks]
+        end_ms = int(time.time() * 1000)
+        
+        def job():
+            try:
+                self.sla.seed(self.history, sites, end_ms)
+            except (OSError, ValueError) as e:
+                print(f"SLO history error: {e}")
+        
+        self.run_in_background("sla_seed", job)
+    
+    def update_capture(self):
+        """Start, restart or stop packet capture to follow the packet_capture settings"""
+        enabled = bool(self.security_config.get('packet_capture'))
+        interface = self.security_config.get('capture_interface') or None
+        if self.capture.running and (not enabled or self.capture.interface != interface):
+            self.capture.stop()
+            self.capture_sample = None
+        if enabled and not self.capture.running:
+            self.capture.interface = interface
+            if not self.capture.start():
+                print(f"Packet capture unavailable: {self.capture.error}")
+    
+    def sample_traffic(self):
+        """Turn the capture byte counters into Upload/Download rates"""
+        now = time.monotonic()
+        up, down = self.capture.up_bytes, self.capture.down_bytes
+        if self.capture_sample is not None:
+            then, last_up, last_down = self.capture_sample
+            elapsed = max(now - then, 1e-3)
+            self.history_data['network_out'].append(round((up - last_up) / 1024 / elapsed, 1))
+            self.history_data['network_in'].append(round((down - last_down) / 1024 / elapsed, 1))
+            self.history_data['network_timestamps'].append(int(time.time() * 1000))
+        self.capture_sample = (now, up, down)
     
-    def update_all_data(self):
+    def on_dns_leak(self, name, interface):
+        """A DNS query left outside the tunnel while a VPN interface is active (capture thread)"""
+        self.threats.report("capture", "LOW", f"DNS query outside VPN tunnel via {interface}",
+                            name, key=f"capture:dnsleak:{interface}")
+    
+    def update_log_watcher(self):
+        """Start or stop log tailing to follow threat_detection"""
+        enabled = self.security_config['threat_detection'] and bool(self.log_watcher.files)
+        if enabled and not self.log_watcher.running:
+            self.log_watcher.start()
+        elif not enabled and self.log_watcher.running:
+            self.log_watcher.stop()
+    
+    def update_integrity_monitor(self):
+        """Start, restart or stop file integrity monitoring to follow integrity_paths
+
+        Walking and hashing run in the collector process while it is up, on local threads otherwise.
+        """
+        paths = [p for p in self.config.get('integrity_paths') or [] if p]
+        remote = self.collector.running
+        current = self.integrity_monitor
+        if (current is not None and current.paths == integrity.normalize_paths(paths)
+                and isinstance(current, collector_proc.RemoteIntegrity) == remote):
+            return
+        if current is not None:
+            current.stop()
+            self.integrity_monitor = None
+        if paths:
+            baseline = config.data_path("integrity.baseline", self.config_path)
+            if remote:
+                self.integrity_monitor = collector_proc.RemoteIntegrity(
+                    self.collector, paths, baseline, self.on_integrity_changes
+                )
+            else:
+                self.integrity_monitor = integrity.IntegrityMonitor(paths, baseline, self.on_integrity_changes)
+            self.integrity_monitor.start()
+    
+    def on_integrity_changes(self, changes):
+        """Report baseline differences as threats (called on the monitor or collector supervisor thread)"""
+        if len(changes) > 20:
+            # Package upgrades touch hundreds of files; one event instead of a flood
+            severity = max((integrity.severity_for(c.path) for c in changes), key=threats.severity_rank)
+            sample = ", ".join(c.path for c in changes[:5])
+            self.threats.report("integrity", severity, f"{len(changes)} monitored files changed",
+                                f"{sample}, ...", key=f"integrity:batch:{int(time.time())}")
+        else:
+            for change in changes:
+                self.threats.report("integrity", integrity.severity_for(change.path),
+                                    f"File {change.kind}: {os.path.basename(change.path)}",
+                                    f"{change.path} {change.detail}".strip(), key=f"integrity:{change.path}")
+        self.after(0, self.update_threat_widgets)
+        self.after(0, self.refresh_threats_view)
+    
+    def update_process_watcher(self):
+        """Start or stop the process event feed to follow anticheat_enabled"""
+        enabled = self.security_config['anticheat_enabled']
+        if enabled and not self.process_watcher.running:
+            self.anticheat.bootstrap()
+            self.process_watcher.start()
+        elif not enabled and self.process_watcher.running:
+            self.process_watcher.stop()
+    
+    def on_process_event(self, event):
+        """Feed one exec/exit event to the scanner (called on the watcher thread)"""
+        self.anticheat.handle(event)
+        # Coalesce bursts into one redraw
+        if self.current_view == "anticheat" and not self.anticheat_refresh_pending:
+            self.anticheat_refresh_pending = True
+            self.after(250, self.refresh_anticheat_view)
+    
+    def update_all_data(self, timestamp_ms=None):
         """Update all monitoring data"""
         try:
-            # Update system resources
-            cpu = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory().percent
-            disk = psutil.disk_usage('/').percent
+            if timestamp_ms is None:
+                timestamp_ms = int(time.time() * 1000)
+            
+            # Update system resources (from the collector process while it is fresh)
+            with self.selfmon.track("psutil"):
+                sample = None
+                if self.collector.running:
+                    sample = self.collector.latest(max_age=2 * float(self.intervals['sample_seconds']))
+                if sample is not None:
+                    cpu, memory, disk = sample.cpu, sample.memory, sample.disk
+                else:
+                    cpu = psutil.cpu_percent(interval=0.1)
+                    memory = psutil.virtual_memory().percent
+                    disk = psutil.disk_usage('/').percent
+            
+            startup.REPORT.mark("first_sample")
+            
+            # Record history
+            self.history_data['timestamps'].append(timestamp_ms)
+            self.history_data['cpu'].append(cpu)
+            self.history_data['memory'].append(memory)
             
             # Update stats
             self.stats['total_scans'] += 1
             self.stats['uptime_seconds'] = (datetime.now() - self.stats['start_time']).seconds
+            self.alert_count = self.alerts.alert_count
+            self.publish_metrics(cpu, memory, disk)
+            
+            if self.security_config['threat_detection']:
+                self.check_thresholds(cpu, memory)
+                with self.selfmon.track("scandetect"):
+                    self.scan_detector.poll(timestamp_ms / 1000, deltas=not self.capture.running)
+            
+            if self.capture.running:
+                self.sample_traffic()
+            
+            with self.selfmon.track("history"):
+                self.record_history(timestamp_ms, cpu, memory)
+                self.schedule_daily_report(timestamp_ms)
+            
+            if self.security_config['anticheat_enabled'] and self.process_watcher.running:
+                with self.selfmon.track("anticheat"):
+                    self.anticheat.scan()
             
             # Update UI (must be done in main thread)
             self.after(0, self.update_ui_data, cpu, memory, disk)
@@ -677,66 +1523,170 @@ class SecureNetMonitor(ctk.CTk):
         except Exception as e:
             print(f"Error updating data: {e}")
     
+    def record_history(self, timestamp_ms, cpu, memory):
+        """Append this sample's series to the on-disk history"""
+        self.history.append('cpu', timestamp_ms, cpu)
+        self.history.append('memory', timestamp_ms, memory)
+        round_ = self.pinger.last_round
+        if round_ is not None and round_.median_ms is not None:
+            self.history.append('latency', timestamp_ms, round_.median_ms)
+        if self.capture.running and self.history_data['network_in']:
+            self.history.append('network_in', timestamp_ms, self.history_data['network_in'][-1])
+            self.history.append('network_out', timestamp_ms, self.history_data['network_out'][-1])
+        for key in ('total_scans', 'threats_detected', 'vpn_detections', 'uptime_seconds'):
+            self.history.append(history.STATS_PREFIX + key, timestamp_ms, self.stats[key], precision=0)
+    
+    def threshold_limits(self):
+        """Current limit for every threshold rule, keyed by setting"""
+        return {rule.setting: self.security_config[rule.setting] for rule in rules.THRESHOLD_RULES}
+    
+    def schedule_daily_report(self, timestamp_ms):
+        """Write the previous day's report once the UTC day rolls over (or on start if it is missing)"""
+        day = history.day_of(timestamp_ms)
+        if day == self.report_day:
+            return
+        self.report_day = day
+        previous = history.day_of(timestamp_ms - 86400 * 1000)
+        directory = config.data_path("reports", self.config_path)
+        if os.path.exists(os.path.join(directory, previous + ".txt")) or previous not in self.history.days('cpu'):
+            return
+        limits, settings = self.threshold_limits(), dict(self.config['alerts'])
+        
+        def job():
+            try:
+                export.write_daily_report(self.history, directory, previous, limits, settings)
+            except (OSError, ValueError) as e:
+                print(f"Daily report error: {e}")
+        
+        self.run_in_background("report", job)
+    
+    def encode_history(self) -> Dict[str, bytes]:
+        """Encode recorded history series and counters in the compact wire format"""
+        encoded = {}
+        for key, times in (('cpu', 'timestamps'), ('memory', 'timestamps'), ('network_in', 'network_timestamps'),
+                           ('network_out', 'network_timestamps'), ('latency', 'latency_timestamps')):
+            values = list(self.history_data[key])
+            if values:
+                encoded[key] = wire_format.encode_series(self.history_data[times], values)
+        encoded['stats'] = wire_format.encode_counters(self.stats)
+        return encoded
+    
     def update_ui_data(self, cpu, memory, disk):
         """Update UI with new data"""
-        try:
-            # Update progress bars
-            if hasattr(self, 'cpu_progress'):
-                self.cpu_label.configure(text=f"CPU: {cpu:.1f}%")
-                self.cpu_progress.set(cpu / 100)
+        with self.selfmon.track("ui_flush", "ui"):
+            try:
+                # Fill in the skeleton on the first sample
+                if not self.views_ready:
+                    self.views_ready = True
+                    self.show_view(self.current_view)
+                    startup.REPORT.mark("first_sample_rendered")
+                    if self.startup_report:
+                        print(startup.REPORT.format_report(), flush=True)
                 
-                self.memory_label.configure(text=f"Memory: {memory:.1f}%")
-                self.memory_progress.set(memory / 100)
+                # Update progress bars
+                if hasattr(self, 'cpu_progress'):
+                    self.cpu_label.configure(text=f"CPU: {cpu:.1f}%")
+                    self.cpu_progress.set(cpu / 100)
                 
-                self.disk_label.configure(text=f"Disk: {disk:.1f}%")
-                self.disk_progress.set(disk / 100)
+                    self.memory_label.configure(text=f"Memory: {memory:.1f}%")
+                    self.memory_progress.set(memory / 100)
+                
+                    self.disk_label.configure(text=f"Disk: {disk:.1f}%")
+                    self.disk_progress.set(disk / 100)
             
-            # Update stat cards
-            self.stat_cards['total_scans'].value_label.configure(
-                text=str(self.stats['total_scans'])
-            )
-            self.stat_cards['cpu_usage'].value_label.configure(
-                text=f"{cpu:.1f}%"
-            )
-            self.stat_cards['memory_usage'].value_label.configure(
-                text=f"{memory:.1f}%"
-            )
+                # Update stat cards
+                self.stat_cards['total_scans'].value_label.configure(
+                    text=str(self.stats['total_scans'])
+                )
+                self.stat_cards['cpu_usage'].value_label.configure(
+                    text=f"{cpu:.1f}%"
+                )
+                self.stat_cards['memory_usage'].value_label.configure(
+                    text=f"{memory:.1f}%"
+                )
+                self.update_threat_widgets()
             
-            # Check internet
-            self.check_internet_status()
+                # Check internet
+                self.check_internet_status()
+                self.refresh_latency_view()
+                self.refresh_health_view()
+                self.refresh_threats_view()
+                self.refresh_anticheat_view()
+                self.refresh_vpn_view()
+                if self.capture.running and self.history_data['network_in'] and hasattr(self, 'upload_label'):
+                    self.upload_label.configure(text=f"Upload: {self.history_data['network_out'][-1]:.0f} KB/s")
+                    self.download_label.configure(text=f"Download: {self.history_data['network_in'][-1]:.0f} KB/s")
             
-            # Check VPN (every 10 scans to avoid rate limits)
-            if self.stats['total_scans'] % 10 == 0:
-                threading.Thread(target=self.check_vpn_status, daemon=True).start()
+                scans = self.stats['total_scans']
+                
+                # Check VPN (every 10 scans by default to avoid rate limits)
+                if scans % self.every('vpn_every') == 0:
+                    if self.security_config['vpn_check_enabled']:
+                        self.run_in_background("vpn_lookup", self.check_vpn_status)
+                    self.run_in_background("dns_probe", self.probe_dns_resolvers)
             
-            # Check websites
-            if self.stats['total_scans'] % 5 == 0:
-                threading.Thread(target=self.check_websites, daemon=True).start()
+                # Check websites (each group runs on its own interval)
+                self.sync_site_groups()
+                self.probe_engine.run_due()
+                
+                # Trace paths of sites whose latency degraded
+                if (self.security_config.get('path_probe') and not self.path_probe_running
+                        and self.path_monitor.due()):
+                    self.path_probe_running = True
+                    self.run_in_background("path_probe", self.check_paths)
+                
+                # Check TLS certificates (resumed handshakes keep this cheap)
+                if scans % self.every('tls_every') == 0:
+                    self.run_in_background("tls_probe", self.check_tls_certificates)
             
-        except Exception as e:
-            print(f"Error updating UI: {e}")
+            except Exception as e:
+                print(f"Error updating UI: {e}")
+    
+    def every(self, key):
+        """Cadence of a periodic check, in samples"""
+        return max(1, int(self.intervals.get(key) or 1))
     
     def check_internet_status(self):
-        """Check internet connectivity"""
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
+        """Show the latest latency round and append it to the latency history"""
+        round_ = self.pinger.last_round
+        if round_ is None or time.time() - round_.timestamp > 3 * self.pinger.interval + 1:
+            return
+        if round_.received:
+            self.history_data['latency'].append(round(round_.median_ms, 1))
+            self.history_data['latency_timestamps'].append(int(round_.timestamp * 1000))
+            if hasattr(self, 'latency_label'):
+                self.latency_label.configure(text=f"Latency: {round_.median_ms:.0f} ms")
             if hasattr(self, 'internet_status'):
                 self.internet_status.configure(
                     text="Internet: ✅ Connected",
                     text_color="#27ae60"
                 )
-        except OSError:
+        else:
+            if hasattr(self, 'latency_label'):
+                self.latency_label.configure(text="Latency: --- ms")
             if hasattr(self, 'internet_status'):
                 self.internet_status.configure(
                     text="Internet: ❌ Disconnected",
                     text_color="#e74c3c"
                 )
     
+    def on_latency_result(self, target, rtt):
+        """Record one latency probe (called on the prober thread)"""
+        if rtt is None:
+            return
+        stats = self.pinger.stats.get(target.key)
+        probe_type = 'icmp_echo' if stats is not None and stats.mode == "icmp" else 'internet_tcp'
+        name = target.key if len(self.pinger.targets) <= PER_TARGET_HISTOGRAMS else "all targets"
+        self.latency_recorder.record(probe_type, name, rtt)
+    
     def check_vpn_status(self):
         """Check for VPN/Proxy using multiple methods"""
         try:
             # Method 1: IP API check
-            response = requests.get('https://ipapi.co/json/', timeout=5)
+            start_time = time.perf_counter()
+            response = requests.get(IP_INTEL_URL, timeout=5)
+            self.latency_recorder.record('vpn_lookup', urllib.parse.urlsplit(IP_INTEL_URL).hostname,
+                                         time.perf_counter() - start_time)
             data = response.json()
             
             ip = data.get('ip', 'Unknown')
@@ -749,12 +1699,13 @@ class SecureNetMonitor(ctk.CTk):
             self.after(0, lambda: self.location_label.configure(text=f"Location: {city}, {country}"))
             self.after(0, lambda: self.isp_label.configure(text=f"ISP: {isp}"))
             
-            # VPN Detection Logic
+            # VPN Detection Logic (ipapi.co reports 'asn' as a plain string)
+            asn = data.get('asn')
             vpn_indicators = [
                 'vpn' in isp.lower(),
                 'proxy' in isp.lower(),
                 'hosting' in isp.lower(),
-                data.get('asn', {}).get('type') == 'hosting'
+                isinstance(asn, dict) and asn.get('type') == 'hosting'
             ]
             
             if any(vpn_indicators):
@@ -771,6 +1722,9 @@ class SecureNetMonitor(ctk.CTk):
                     text_color="#27ae60"
                 ))
             
+            self.metrics.set_gauge('vpn_detected', int(self.vpn_detected), "1 if a VPN/proxy is detected")
+            self.metrics.set_counter('vpn_detections', self.stats['vpn_detections'], "VPN/proxy detections")
+            
             # Update stat card
             self.after(0, lambda: self.stat_cards['vpn_detections'].value_label.configure(
                 text=str(self.stats['vpn_detections'])
@@ -783,36 +1737,300 @@ class SecureNetMonitor(ctk.CTk):
                 text_color="#f39c12"
             ))
     
+    def check_thresholds(self, cpu, memory):
+        """Raise (or clear) resource and latency threshold threats using the live settings"""
+        round_ = self.pinger.last_round
+        values = {
+            'cpu': cpu,
+            'memory': memory,
+            'latency': round_.median_ms if round_ is not None else None,
+        }
+        # The same rules drive the what-if replay in the settings view
+        for rule in rules.THRESHOLD_RULES:
+            rules.apply(self.threats, rule, values[rule.series], self.security_config[rule.setting])
+        
+        # Packet loss over each target's rolling window
+        lossy = [key for key, s in list(self.pinger.stats.items()) if s.count >= 5 and s.loss >= 0.5]
+        if round_ is not None and not round_.received:
+            self.threats.report("network", "HIGH", "Latency targets unreachable",
+                                f"0/{round_.sent} probes answered", key="network:unreachable")
+        else:
+            self.threats.resolve("network:unreachable")
+        if lossy:
+            self.threats.report("network", "MEDIUM", f"Packet loss on {len(lossy)} target(s)",
+                                ", ".join(lossy[:3]) + (" ..." if len(lossy) > 3 else ""), key="network:loss")
+        else:
+            self.threats.resolve("network:loss")
+    
+    def on_threat_detected(self, event):
+        """Called by the threat log for every new event"""
+        self.stats['threats_detected'] += 1
+        self.threat_level = self.threats.level()
+        self.metrics.set_counter('threats_detected', self.stats['threats_detected'], "Threats detected")
+    
+    def update_threat_widgets(self):
+        """Refresh the dashboard threat card and stat card"""
+        self.threat_level = self.threats.level()
+        self.stat_cards['threats_detected'].value_label.configure(
+            text=str(self.stats['threats_detected'])
+        )
+        if hasattr(self, 'threat_level_label') and self.threat_level_label.winfo_exists():
+            self.threat_level_label.configure(
+                text=f"Threat Level: {self.threat_level}",
+                text_color=threats.SEVERITY_COLORS[self.threat_level]
+            )
+            self.threats_found.configure(text=f"Threats Found: {self.stats['threats_detected']}")
+            self.last_scan.configure(text=f"Last Scan: {datetime.now():%H:%M:%S}")
+    
+    def check_tls_certificates(self):
+        """Probe HTTPS sites and raise threats for invalid or expiring certificates"""
+        if self.tls_probe is None:
+            self.tls_probe = tlsprobe.TLSProbe(self.latency_recorder)
+        
+        targets = {}
+        for site in self.monitored_sites:
+            parts = urllib.parse.urlsplit(site['url'])
+            if parts.scheme == "https":
+                targets[(parts.hostname, parts.port or 443)] = None
+        
+        for result in self.tls_probe.probe_many(list(targets)):
+            cert = result.cert
+            host = result.host
+            if cert is None:
+                continue
+            if cert.expired:
+                # Expired certificates fail verification, so there is no parsed expiry date
+                self.threats.resolve(f"tls:{host}:invalid")
+                self.threats.report("tls", "CRITICAL", f"Certificate expired: {host}", cert.error,
+                                    key=f"tls:{host}:expiry")
+                continue
+            if not cert.verified:
+                self.threats.report("tls", "HIGH", f"Invalid certificate: {host}", cert.error,
+                                    key=f"tls:{host}:invalid")
+                continue
+            self.threats.resolve(f"tls:{host}:invalid")
+            
+            days = cert.days_left
+            self.metrics.set_gauge('tls_cert_expiry_days', round(days, 2),
+                                   "Days until the site certificate expires", {'host': host})
+            if days < 0:
+                self.threats.report("tls", "CRITICAL", f"Certificate expired: {host}",
+                                    f"expired {-days:.0f} days ago", key=f"tls:{host}:expiry")
+            elif days < tlsprobe.EXPIRY_CRITICAL_DAYS:
+                self.threats.report("tls", "HIGH", f"Certificate expires soon: {host}",
+                                    f"{days:.1f} days left", key=f"tls:{host}:expiry")
+            elif days < tlsprobe.EXPIRY_WARNING_DAYS:
+                self.threats.report("tls", "MEDIUM", f"Certificate expiring: {host}",
+                                    f"{days:.0f} days left", key=f"tls:{host}:expiry")
+            else:
+                self.threats.resolve(f"tls:{host}:expiry")
+    
+    def check_paths(self):
+        """Trace degraded hosts and raise threats for route changes and hop latency shifts"""
+        try:
+            for report in self.path_monitor.run_due():
+                host = report.host
+                if report.changed_hops:
+                    hops = ", ".join(map(str, report.changed_hops))
+                    self.threats.report("network", "MEDIUM", f"Route changed: {host}",
+                                        f"hop {hops}: {report.previous.format()} -> {report.path.format()}",
+                                        key=f"path:{host}:route")
+                if report.latency_shifts:
+                    ttl, hop, base, ms = max(report.latency_shifts, key=lambda s: s[3] - s[2])
+                    self.threats.report("network", "LOW", f"Hop latency rose: {host}",
+                                        f"hop {ttl} {hop}: {base:.1f} -> {ms:.1f} ms",
+                                        key=f"path:{host}:latency")
+        finally:
+            self.path_probe_running = False
+    
+    def probe_dns_resolvers(self):
+        """Measure each upstream resolver directly and publish its health"""
+        if not self.monitored_sites:
+            return
+        host = urllib.parse.urlsplit(self.monitored_sites[0]['url']).hostname
+        self.dns_cache.probe_resolvers(host)
+        
+        for server, s in self.dns_cache.stats.items():
+            labels = {'resolver': server}
+            self.metrics.set_counter('dns_queries', s.queries, "DNS queries sent", labels)
+            self.metrics.set_counter('dns_nxdomain', s.nxdomain, "NXDOMAIN answers", labels)
+            self.metrics.set_counter('dns_servfail', s.servfail, "SERVFAIL answers", labels)
+            self.metrics.set_counter('dns_timeouts', s.timeouts, "Unanswered DNS queries", labels)
+        self.metrics.set_counter('dns_cache_hits', self.dns_cache.hits, "DNS cache hits")
+        self.metrics.set_counter('dns_cache_misses', self.dns_cache.misses, "DNS cache misses")
+    
     def check_websites(self):
-        """Check monitored websites status"""
-        for idx, site in enumerate(self.monitored_sites):
+        """Check every monitored website now, blocking until all groups finish"""
+        self.sync_site_groups()
+        self.probe_engine.run_all()
+    
+    def probe_site(self, site, session, timeout):
+        """Probe one website over its group's shared session"""
+        if 'steps' in site:
+            self.probe_synthetic(site, session, timeout)
+            return
+        labels = {'site': site['name'], 'url': site['url']}
+        with self.selfmon.track("site_probes", "probe"):
             try:
-                start_time = time.time()
-                response = requests.get(site['url'], timeout=5)
-                response_time = int((time.time() - start_time) * 1000)
+                # Resolve first so DNS time is not folded into the response time
+                dns = self.dns_cache.resolve(urllib.parse.urlsplit(site['url']).hostname)
+                if not dns.addresses:
+                    site.update(status="❌ DNS Failure", up=False)
+                    self.metrics.set_gauge('site_up', 0, "1 if the site answered 200", labels)
+                    self.report_site_state(site)
+                    return
                 
-                if response.status_code == 200:
-                    status = "✅ Online"
-                    color = "#27ae60"
-                else:
-                    status = f"⚠️ {response.status_code}"
-                    color = "#f39c12"
+                start_time = time.perf_counter()
+                response = session.get(site['url'], timeout=timeout)
+                elapsed = time.perf_counter() - start_time
+                response_time = int(elapsed * 1000)
+                self.latency_recorder.record('site_get', site['name'], elapsed)
+                self.path_monitor.note_latency(dns.host, response_time)
                 
-                # Update UI
-                if hasattr(self, 'site_labels') and idx < len(self.site_labels):
-                    self.after(0, lambda i=idx, s=status, c=color, rt=response_time: (
-                        self.site_labels[i][2].configure(text=s, text_color=c),
-                        self.site_labels[i][3].configure(text=f"{rt} ms")
-                    ))
+                self.metrics.observe('site_probe_duration_seconds', response_time / 1000,
+                                     "Website probe latency", labels)
+                self.metrics.set_gauge('site_up', int(response.status_code == 200),
+                                       "1 if the site answered 200", labels)
                 
-            except Exception as e:
-                if hasattr(self, 'site_labels') and idx < len(self.site_labels):
-                    self.after(0, lambda i=idx: (
-                        self.site_labels[i][2].configure(text="❌ Offline", text_color="#e74c3c"),
-                        self.site_labels[i][3].configure(text="Timeout")
-                    ))
+                site['response_ms'] = response_time
+                site['up'] = response.status_code == 200
+                site['status'] = "✅ Online" if site['up'] else f"⚠️ {response.status_code}"
+                
+            except Exception:
+                site.update(status="❌ Offline", up=False)
+                self.metrics.set_gauge('site_up', 0, "1 if the site answered 200", labels)
+            
+            self.report_site_state(site)
+    
+    def probe_synthetic(self, check, session, timeout):
+        """Run one synthetic check; it reports, records and alerts like a site"""
+        with self.selfmon.track("synthetic_checks", "probe"):
+            result = synthetic.run_check(check, session, timeout)
+            for step, elapsed_ms in result.steps:
+                self.metrics.observe('synthetic_step_duration_seconds', elapsed_ms / 1000,
+                                     "Synthetic check step latency", {'check': check['name'], 'step': step})
+            check['response_ms'] = int(result.total_ms)
+            check['up'] = result.ok
+            if result.ok:
+                check['status'] = f"✅ Passed ({len(result.steps)} steps)"
+            else:
+                where = f"{result.step}: " if result.step else ""
+                check['status'] = f"❌ {where}{result.message}"
+            self.metrics.set_gauge('site_up', int(result.ok), "1 if the site answered 200",
+                                   {'site': check['name'], 'url': check['url']})
+            self.report_site_state(check)
+    
+    def report_site_state(self, site):
+        """Record a probe result (history, SLO windows) and raise or clear the site's down alert
+
+        Site state goes straight to the alert pipeline, which debounces flapping. It is an
+        availability condition, so it stays out of the threat log, threats_detected and the
+        threat level.
+        """
+        now_ms = int(time.time() * 1000)
+        response_ms = site.get('response_ms') if site['up'] else None
+        site_id = history.site_id(site['url'])
+        self.history.label_site(site_id, site['name'], site['url'])
+        self.history.append(history.site_series(site_id, "up"), now_ms, int(site['up']), precision=0)
+        if response_ms is not None:
+            self.history.append(history.site_series(site_id, "response_ms"), now_ms, response_ms, precision=0)
+        
+        self.sla.record(site['url'], now_ms / 1000, site['up'], response_ms)
+        self.sla.check(self.alerts, site['url'], site['name'], now_ms / 1000)
+        labels = {'site': site['name'], 'url': site['url']}
+        for stats in self.sla.stats([site['url']], now_ms / 1000):
+            window_labels = dict(labels, window=stats.window)
+            self.metrics.set_gauge('site_availability_percent', stats.availability or 0.0,
+                                   "Rolling share of successful probes", window_labels)
+            self.metrics.set_gauge('site_error_budget_burn_rate', stats.availability_burn,
+                                   "Availability error budget spend rate (1 = exactly on budget)", window_labels)
+        
+        key = f"site:{site['url']}"
+        if site['up']:
+            self.alerts.clear(key)
+        else:
+            self.alerts.observe(threats.ThreatEvent(key, "sites", "HIGH", f"{site['name']} is down", site['status']))
+
+def run_headless(interval=2.0, report_every=15, profile_path=None):
+    """Run the collectors without a window, printing health reports as JSON lines"""
+    monitor = selfmon.SelfMonitor()
+    if profile_path:
+        monitor.profiler.start()
+    
+    next_tick = time.perf_counter()
+    ticks = 0
+    try:
+        while True:
+            with monitor.track("collect_cycle"):
+                with monitor.track("psutil"):
+                    psutil.cpu_percent(interval=0.1)
+                    psutil.virtual_memory()
+                    psutil.disk_usage('/')
+                with monitor.track("internet_check", "probe"):
+                    try:
+                        with socket.create_connection(INTERNET_CHECK_ADDR, timeout=3):
+                            pass
+                    except OSError:
+                        pass
+            
+            ticks += 1
+            if ticks % report_every == 0:
+                print(json.dumps(monitor.snapshot()), flush=True)
+                if profile_path:
+                    monitor.profiler.dump(profile_path)
+            
+            next_tick += interval
+            time.sleep(max(0, next_tick - time.perf_counter()))
+            # Without Tk, loop lag is how far the scheduler overslept
+            monitor.record_lag(time.perf_counter() - next_tick)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if profile_path:
+            monitor.profiler.stop()
+            monitor.profiler.dump(profile_path)
+
+
+def run_export(path, hours=None, report_day=None, config_path=None):
+    """Export stored history (or write one day's report) from the command line"""
+    store = history.HistoryStore(config.data_path("history", config_path))
+    if report_day:
+        settings = config.load(config_path)
+        limits = {rule.setting: settings['security'][rule.setting] for rule in rules.THRESHOLD_RULES}
+        print(export.write_daily_report(store, path or config.data_path("reports", config_path), report_day,
+                                        limits, settings['alerts']))
+        return
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - int(hours * 3600 * 1000) if hours else None
+    try:
+        job = export.ExportJob(store, path, start_ms=start_ms, end_ms=end_ms).run()
+    except ValueError as e:
+        raise SystemExit(f"Export failed: {e}")
+    if job.error:
+        raise SystemExit(f"Export failed: {job.error}")
+    print(f"Exported {job.rows} rows in {job.elapsed:.1f} s to {path}")
 
 
 if __name__ == "__main__":
-    app = SecureNetMonitor()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="SecureNet Monitor Pro")
+    parser.add_argument("--headless", action="store_true", help="run collectors without the GUI")
+    parser.add_argument("--interval", type=float, default=2.0, help="headless sample interval in seconds")
+    parser.add_argument("--profile", metavar="PATH", help="headless: write collapsed profiler stacks to PATH")
+    parser.add_argument("--config", metavar="PATH", help="config file (JSON or TOML, default: %(default)s)",
+                        default=config.config_path())
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import and startup timings once the first sample is shown")
+    parser.add_argument("--export", metavar="PATH",
+                        help="export stored history to PATH (.csv, .jsonl, .snc columnar or .parquet) and exit")
+    parser.add_argument("--since", type=float, metavar="HOURS", help="--export: only the last HOURS of history")
+    parser.add_argument("--report", metavar="YYYY-MM-DD",
+                        help="write the daily report for a UTC day (into --export PATH if given) and exit")
+    args = parser.parse_args()
+    
+    if args.export or args.report:
+        run_export(args.export, args.since, args.report, args.config)
+    elif args.headless:
+        run_headless(args.interval, profile_path=args.profile)
+    else:
+        app = SecureNetMonitor(startup_report=args.startup_report, config_path=args.config)
+        app.mainloop()
\ No newline at end of file
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Path Probe
+Parallel TTL-stepped traceroute with a path cache, change detection and adaptive scheduling
+"""
+
+import errno
+import select
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BASE_PORT = 33434               # classic traceroute UDP ports: BASE_PORT + ttl
+MAX_HOPS = 30
+HOP_MARGIN = 3                  # probe this many TTLs past the last known hop count
+DEFAULT_TIMEOUT = 2.0
+
+# Adaptive scheduling
+DEGRADE_FACTOR = 1.5            # latency this far above the baseline ...
+DEGRADE_MIN_MS = 50.0           # ... and at least this much higher counts as slow
+DEGRADE_SAMPLES = 3             # consecutive slow samples before a host is degraded
+BASELINE_ALPHA = 0.1
+MIN_SAMPLES = 5
+MIN_INTERVAL = 60.0             # per-host backoff starts here and doubles ...
+MAX_INTERVAL = 1800.0           # ... up to this while the host stays degraded
+HOP_SHIFT_FACTOR = 1.5
+HOP_SHIFT_MIN_MS = 10.0
+
+IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+IPV6_RECVERR = getattr(socket, "IPV6_RECVERR", 25)
+MSG_ERRQUEUE = getattr(socket, "MSG_ERRQUEUE", 0x2000)
+SO_EE_ORIGIN_ICMP = 2
+SO_EE_ORIGIN_ICMP6 = 3
+
+_EXTENDED_ERR = struct.Struct("=IBBBBII")
+
+
+class HopReply:
+    """Answer to the probe sent with one TTL"""
+
+    __slots__ = ("address", "rtt", "reached")
+
+    def __init__(self, address: Optional[str], rtt: Optional[float], reached: bool = False):
+        self.address = address
+        self.rtt = rtt
+        self.reached = reached
+
+
+# === TRANSPORTS ===
+
+class UDPTransport:
+    """Unprivileged UDP probes; ICMP errors are read from the socket error queue (Linux)"""
+
+    name = "udp"
+
+    def probe(self, address: str, family: int, ttls: Iterable[int],
+              timeout: float = DEFAULT_TIMEOUT) -> Dict[int, HopReply]:
+        """Send one probe per TTL at once and collect the ICMP replies"""
+        v6 = family == socket.AF_INET6
+        socks: Dict[int, Tuple[int, socket.socket, float]] = {}
+        poller = select.poll()
+        replies: Dict[int, HopReply] = {}
+        try:
+            for ttl in ttls:
+                s = socket.socket(family, socket.SOCK_DGRAM)
+                s.setblocking(False)
+                if v6:
+                    s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_UNICAST_HOPS, ttl)
+                    s.setsockopt(socket.IPPROTO_IPV6, IPV6_RECVERR, 1)
+                else:
+                    s.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                    s.setsockopt(socket.IPPROTO_IP, IP_RECVERR, 1)
+                s.connect((address, BASE_PORT + ttl))
+                socks[s.fileno()] = (ttl, s, time.perf_counter())
+                try:
+                    s.send(b"securenet-path")
+                except OSError:
+                    pass
+                poller.register(s.fileno(), select.POLLIN | select.POLLERR)
+
+            deadline = time.perf_counter() + timeout
+            while socks:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                for fd, _event in poller.poll(remaining * 1000):
+                    entry = socks.pop(fd, None)
+                    if entry is None:
+                        continue
+                    poller.unregister(fd)
+                    ttl, s, sent = entry
+                    reply = self._read(s, v6)
+                    reply.rtt = time.perf_counter() - sent
+                    replies[ttl] = reply
+                    s.close()
+                # Stop once every TTL below the first one that reached the target has answered
+                reached = [t for t, r in replies.items() if r.reached]
+                if reached and all(t > min(reached) for t, _s, _ in socks.values()):
+                    break
+        finally:
+            for _ttl, s, _sent in socks.values():
+                s.close()
+        return replies
+
+    @staticmethod
+    def _read(s: socket.socket, v6: bool) -> HopReply:
+        try:
+            _data, ancdata, _flags, _addr = s.recvmsg(512, 512, MSG_ERRQUEUE)
+        except (BlockingIOError, InterruptedError):
+            # Readable without an error: the target answered the UDP probe
+            return HopReply(s.getpeername()[0], None, reached=True)
+        except OSError:
+            return HopReply(None, None)
+        for level, kind, data in ancdata:
+            if kind not in (IP_RECVERR, IPV6_RECVERR) or len(data) < _EXTENDED_ERR.size:
+                continue
+            _err, origin, ee_type, code, _pad, _info, _data = _EXTENDED_ERR.unpack_from(data)
+            offender = _parse_sockaddr(data[_EXTENDED_ERR.size:])
+            if origin == SO_EE_ORIGIN_ICMP:
+                expired = ee_type == 11
+                port_unreachable = ee_type == 3 and code == 3
+            elif origin == SO_EE_ORIGIN_ICMP6:
+                expired = ee_type == 3
+                port_unreachable = ee_type == 1 and code == 4
+            else:
+                continue
+            # Anything other than "time exceeded" ends the path (unreachable, prohibited ...)
+            return HopReply(offender, None, reached=port_unreachable or not expired)
+        return HopReply(None, None)
+
+
+class TCPTransport:
+    """TTL-limited TCP connects; only the hop that reaches the target is identified"""
+
+    name = "tcp"
+
+    def __init__(self, port: int = 443):
+        self.port = port
+
+    def probe(self, address: str, family: int, ttls: Iterable[int],
+              timeout: float = DEFAULT_TIMEOUT) -> Dict[int, HopReply]:
+        v6 = family == socket.AF_INET6
+        socks: Dict[int, Tuple[int, socket.socket, float]] = {}
+        poller = select.poll()
+        replies: Dict[int, HopReply] = {}
+        linger = struct.pack("ii", 1, 0)
+        try:
+            for ttl in ttls:
+                s = socket.socket(family, socket.SOCK_STREAM)
+                s.setblocking(False)
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)
+                if v6:
+                    s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_UNICAST_HOPS, ttl)
+                else:
+                    s.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+                sent = time.perf_counter()
+                err = s.connect_ex((address, self.port))
+                if err in (0, errno.ECONNREFUSED):
+                    replies[ttl] = HopReply(address, time.perf_counter() - sent, reached=True)
+                    s.close()
+                    continue
+                socks[s.fileno()] = (ttl, s, sent)
+                poller.register(s.fileno(), select.POLLOUT)
+
+            deadline = time.perf_counter() + timeout
+            while socks:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                for fd, _event in poller.poll(remaining * 1000):
+                    entry = socks.pop(fd, None)
+                    if entry is None:
+                        continue
+                    poller.unregister(fd)
+                    ttl, s, sent = entry
+                    err = s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err in (0, errno.ECONNREFUSED):
+                        replies[ttl] = HopReply(address, time.perf_counter() - sent, reached=True)
+                    s.close()
+                if any(r.reached for r in replies.values()):
+                    break
+        finally:
+            for _ttl, s, _sent in socks.values():
+                s.close()
+        return replies
+
+
+class SimulatedTransport:
+    """Deterministic responder for tests: a list of hop addresses (None = silent hop)"""
+
+    name = "simulated"
+
+    def __init__(self, paths: Optional[Dict[str, List[Optional[str]]]] = None,
+                 hop_ms: float = 5.0, extra_ms: Optional[Dict[str, float]] = None):
+        self.paths = paths or {}
+        self.hop_ms = hop_ms
+        self.extra_ms = extra_ms or {}      # added latency from a given hop address onwards
+        self.probes_sent = 0
+
+    def probe(self, address: str, family: int, ttls: Iterable[int],
+              timeout: float = DEFAULT_TIMEOUT) -> Dict[int, HopReply]:
+        path = self.paths.get(address, [])
+        replies = {}
+        for ttl in ttls:
+            self.probes_sent += 1
+            if ttl > len(path) + 1:
+                replies[ttl] = HopReply(address, None, reached=True)
+                continue
+            extra = 0.0
+            for hop in path[:ttl]:
+                extra += self.extra_ms.get(hop, 0.0)
+            rtt = (ttl * self.hop_ms + extra) / 1000
+            if ttl == len(path) + 1:
+                replies[ttl] = HopReply(address, rtt, reached=True)
+            elif path[ttl - 1] is not None:
+                replies[ttl] = HopReply(path[ttl - 1], rtt)
+        return replies
+
+
+def _parse_sockaddr(data: bytes) -> Optional[str]:
+    if len(data) < 8:
+        return None
+    family = struct.unpack_from("=H", data)[0]
+    if family == socket.AF_INET:
+        return socket.inet_ntop(socket.AF_INET, data[4:8])
+    if family == socket.AF_INET6 and len(data) >= 24:
+        return socket.inet_ntop(socket.AF_INET6, data[8:24])
+    return None
+
+
+# === PATHS ===
+
+class PathSnapshot:
+    """Hops up to the target (None where a hop did not answer)"""
+
+    __slots__ = ("hops", "rtts", "reached", "taken_at")
+
+    def __init__(self, hops: List[Optional[str]], rtts: List[Optional[float]], reached: bool):
+        self.hops = hops
+        self.rtts = rtts
+        self.reached = reached
+        self.taken_at = time.time()
+
+    def format(self) -> str:
+        return " > ".join(h or "*" for h in self.hops) or "(no reply)"
+
+
+def trace(transport, address: str, family: int = socket.AF_INET, max_hops: int = MAX_HOPS,
+          timeout: float = DEFAULT_TIMEOUT) -> PathSnapshot:
+    """Probe TTLs 1..max_hops in parallel and assemble the path"""
+    replies = transport.probe(address, family, range(1, max_hops + 1), timeout)
+    reached_at = min((ttl for ttl, r in replies.items() if r.reached), default=None)
+    last = reached_at or max(replies, default=0)
+    hops, rtts = [], []
+    for ttl in range(1, last + 1):
+        reply = replies.get(ttl)
+        hops.append(reply.address if reply else None)
+        rtts.append(reply.rtt if reply else None)
+    return PathSnapshot(hops, rtts, reached_at is not None)
+
+
+def diff_paths(old: PathSnapshot, new: PathSnapshot) -> List[int]:
+    """1-based hop numbers that changed; silent hops match anything"""
+    changed = []
+    for index in range(max(len(old.hops), len(new.hops))):
+        a = old.hops[index] if index < len(old.hops) else ""
+        b = new.hops[index] if index < len(new.hops) else ""
+        if a is None or b is None:
+            continue
+        if a != b:
+            changed.append(index + 1)
+    return changed
+
+
+class PathReport:
+    """What a path run found: route changes and per-hop latency shifts only"""
+
+    __slots__ = ("host", "path", "previous", "changed_hops", "latency_shifts", "first")
+
+    def __init__(self, host, path, previous, changed_hops, latency_shifts):
+        self.host = host
+        self.path = path
+        self.previous = previous
+        self.changed_hops = changed_hops
+        self.latency_shifts = latency_shifts    # [(ttl, address, baseline_ms, now_ms)]
+        self.first = previous is None
+
+
+class _HostState:
+    __slots__ = ("baseline_ms", "samples", "slow_streak", "degraded", "next_allowed", "backoff", "path",
+                 "hop_baseline", "last_report")
+
+    def __init__(self):
+        self.baseline_ms = 0.0
+        self.samples = 0
+        self.slow_streak = 0
+        self.degraded = False
+        self.next_allowed = 0.0
+        self.backoff = MIN_INTERVAL
+        self.path: Optional[PathSnapshot] = None
+        self.hop_baseline: Dict[Tuple[int, str], float] = {}
+        self.last_report: Optional[PathReport] = None
+
+
+class PathMonitor:
+    """Traces a host's path only when its latency degrades, within a global probe budget"""
+
+    def __init__(self, transport=None, rate: float = 0.1, burst: int = 3, baseline: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.transport = transport or UDPTransport()
+        self.rate = rate                # traces per second, sustained
+        self.burst = burst
+        self.baseline = baseline        # capture an initial path when the budget is idle
+        self.timeout = timeout
+        self.hosts: Dict[str, _HostState] = {}
+        self.runs = 0
+        self._tokens = float(burst)
+        self._refilled: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def note_latency(self, host: str, ms: float):
+        """Feed a latency sample; DEGRADE_SAMPLES slow ones in a row mark the host for a path probe"""
+        with self._lock:
+            state = self.hosts.get(host)
+            if state is None:
+                state = self.hosts[host] = _HostState()
+            if state.samples >= MIN_SAMPLES and ms > state.baseline_ms * DEGRADE_FACTOR \
+                    and ms - state.baseline_ms > DEGRADE_MIN_MS:
+                state.slow_streak += 1
+                if state.slow_streak >= DEGRADE_SAMPLES:
+                    state.degraded = True
+                return      # keep slow samples out of the baseline
+            state.slow_streak = 0
+            if state.degraded:
+                state.degraded = False
+                state.backoff = MIN_INTERVAL
+                state.next_allowed = 0.0
+            state.samples += 1
+            alpha = 1 / state.samples if state.samples < MIN_SAMPLES else BASELINE_ALPHA
+            state.baseline_ms += (ms - state.baseline_ms) * alpha
+
+    def forget(self, host: str):
+        with self._lock:
+            self.hosts.pop(host, None)
+
+    def _take_token(self, background: bool, now: float) -> bool:
+        if self._refilled is not None:
+            self._tokens = min(self.burst, self._tokens + max(0.0, now - self._refilled) * self.rate)
+        self._refilled = now
+        # Baseline captures only use a full bucket, so degraded hosts always find budget
+        needed = self.burst if background else 1
+        if self._tokens < needed:
+            return False
+        self._tokens -= 1
+        return True
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[str, bool]]:
+        """(host, background) pairs eligible for a trace, degraded hosts first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            degraded = [h for h, s in self.hosts.items() if s.degraded and now >= s.next_allowed]
+            pending = [h for h, s in self.hosts.items()
+                       if self.baseline and s.path is None and not s.degraded and now >= s.next_allowed]
+        return [(h, False) for h in degraded] + [(h, True) for h in pending]
+
+    def run_due(self, now: Optional[float] = None) -> List[PathReport]:
+        """Trace due hosts within the budget; returns reports with changes or shifts"""
+        now = time.time() if now is None else now
+        reports = []
+        for host, background in self.due(now):
+            with self._lock:
+                if not self._take_token(background, now):
+                    break
+            report = self.run(host, now)
+            if report is not None and (report.changed_hops or report.latency_shifts):
+                reports.append(report)
+        return reports
+
+    def run(self, host: str, now: Optional[float] = None) -> Optional[PathReport]:
+        """Trace one host now and compare with the cached path"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self.hosts.setdefault(host, _HostState())
+            previous = state.path
+            if state.degraded:
+                state.next_allowed = now + state.backoff
+                state.backoff = min(MAX_INTERVAL, state.backoff * 2)
+        try:
+            family, _, _, _, sockaddr = socket.getaddrinfo(host, None, type=socket.SOCK_DGRAM)[0]
+        except (OSError, UnicodeError) as e:
+            print(f"Path probe resolve error ({host}): {e}")
+            return None
+        max_hops = min(MAX_HOPS, len(previous.hops) + HOP_MARGIN) if previous and previous.reached else MAX_HOPS
+        try:
+            path = trace(self.transport, sockaddr[0], family, max_hops, self.timeout)
+        except OSError as e:
+            print(f"Path probe error ({host}): {e}")
+            return None
+        if previous is not None and previous.reached and not path.reached and max_hops < MAX_HOPS:
+            # The path got longer than the cached hop count; retry with the full range
+            path = trace(self.transport, sockaddr[0], family, MAX_HOPS, self.timeout)
+        self.runs += 1
+
+        changed = diff_paths(previous, path) if previous is not None else []
+        shifts = []
+        with self._lock:
+            for ttl, (hop, rtt) in enumerate(zip(path.hops, path.rtts), start=1):
+                if hop is None or rtt is None:
+                    continue
+                ms = rtt * 1000
+                key = (ttl, hop)
+                base = state.hop_baseline.get(key)
+                if base is None:
+                    state.hop_baseline[key] = ms
+                    continue
+                if ms > base * HOP_SHIFT_FACTOR and ms - base > HOP_SHIFT_MIN_MS:
+                    shifts.append((ttl, hop, base, ms))
+                else:
+                    state.hop_baseline[key] = base + (ms - base) * BASELINE_ALPHA
+            if changed:
+                # Baselines of hops that are no longer on the path are stale
+                live = set(enumerate(path.hops, start=1))
+                state.hop_baseline = {k: v for k, v in state.hop_baseline.items() if k in live}
+            state.path = path
+            report = PathReport(host, path, previous, changed, shifts)
+            state.last_report = report
+        return report
+
+    def format_table(self, limit: int = 20) -> str:
+        """Cached paths and the last detected change per host"""
+        with self._lock:
+            items = [(h, s) for h, s in self.hosts.items() if s.path is not None]
+            watching = len(self.hosts)
+        lines = [f"Paths: {len(items)} cached, {watching} hosts watched, {self.runs} traces "
+                 f"({self.transport.name})"]
+        items.sort(key=lambda item: (not item[1].degraded, item[0]))
+        for host, state in items[:limit]:
+            flag = "DEGRADED " if state.degraded else ""
+            lines.append(f"{host[:27]:<28}{flag}{len(state.path.hops)} hops: {state.path.format()}")
+            report = state.last_report
+            if report is not None and report.changed_hops:
+                lines.append(f"{'':<28}changed at hop {', '.join(map(str, report.changed_hops))} "
+                             f"(was {report.previous.format()})")
+            if report is not None:
+                for ttl, hop, base, ms in report.latency_shifts[:3]:
+                    lines.append(f"{'':<28}hop {ttl} {hop}: {base:.1f} -> {ms:.1f} ms")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Trace the path to a host (e.g. inside a test netns)")
+    parser.add_argument("host")
+    parser.add_argument("--tcp", type=int, metavar="PORT", help="use TTL-limited TCP connects to PORT")
+    parser.add_argument("--max-hops", type=int, default=MAX_HOPS)
+    args = parser.parse_args()
+
+    transport = TCPTransport(args.tcp) if args.tcp else UDPTransport()
+    family, _, _, _, sockaddr = socket.getaddrinfo(args.host, None, type=socket.SOCK_DGRAM)[0]
+    snapshot = trace(transport, sockaddr[0], family, args.max_hops)
+    for ttl, (hop, rtt) in enumerate(zip(snapshot.hops, snapshot.rtts), start=1):
+        print(f"{ttl:>3}  {hop or '*':<40}{'' if rtt is None else f'{rtt * 1000:.2f} ms'}")
+    if not snapshot.reached:
+        print("target not reached")
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Latency Prober
+TCP-connect and unprivileged ICMP echo probes to many targets from one asyncio loop
+"""
+
+import errno
+import ipaddress
+import socket
+import statistics
+import struct
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import asyncio      # imported by the prober thread itself; it pulls in ssl
+
+try:
+    import resource
+except ImportError:     # not on Windows
+    resource = None
+
+DEFAULT_WINDOW = 60             # results kept per target for loss and jitter
+RESOLVE_SECONDS = 300           # re-resolve hostnames this often
+ICMP_FALLBACK_PORT = 443        # icmp targets use a TCP connect when ping sockets are not permitted
+ICMP_PAYLOAD = b"securenet"
+LAUNCH_BATCH = 64               # probes started before the loop gets to handle replies
+
+_ICMP_HEADER = struct.Struct("!BBHHH")
+_LINGER_ABORT = struct.pack("ii", 1, 0)
+_CONNECT_OK = (0, errno.ECONNREFUSED)    # a RST is an answer too
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def max_in_flight() -> int:
+    """Concurrent probes allowed, leaving headroom under the open-file limit"""
+    if resource is None:
+        return 256
+    soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft == resource.RLIM_INFINITY:
+        return 1024
+    return max(16, min(1024, soft // 2))
+
+
+class Target:
+    """A probe target: 'host:port' (TCP connect) or 'host' / 'icmp://host' (echo)"""
+
+    __slots__ = ("spec", "kind", "host", "port", "address", "family", "resolved_at")
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        text = spec.strip()
+        kind = None
+        if "://" in text:
+            kind, text = text.split("://", 1)
+        host, port = text, None
+        if text.startswith("["):
+            host, _, rest = text[1:].partition("]")
+            port = rest.lstrip(":") or None
+        elif text.count(":") == 1:
+            host, port = text.split(":")
+        self.host = host
+        self.port = int(port) if port else None
+        self.kind = kind or ("tcp" if self.port else "icmp")
+        if self.kind == "tcp" and self.port is None:
+            self.port = ICMP_FALLBACK_PORT
+        self.address: Optional[str] = None
+        self.family = socket.AF_INET
+        self.resolved_at = 0.0
+        try:
+            ip = ipaddress.ip_address(host)
+            self.address = str(ip)
+            self.family = socket.AF_INET6 if ip.version == 6 else socket.AF_INET
+            self.resolved_at = float("inf")
+        except ValueError:
+            pass
+
+    @property
+    def key(self) -> str:
+        return self.spec
+
+
+class TargetStats:
+    """Rolling loss, RTT and RFC 3550-style jitter for one target
+
+    Only the prober thread calls add(); it keeps running totals over the window,
+    so readers on other threads never iterate the results deque.
+    """
+
+    __slots__ = ("results", "count", "lost", "rtt_total", "last_rtt", "jitter", "mode")
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.results = deque(maxlen=window)
+        self.count = 0
+        self.lost = 0
+        self.rtt_total = 0.0
+        self.last_rtt: Optional[float] = None
+        self.jitter = 0.0
+        self.mode = ""
+
+    def add(self, rtt: Optional[float]):
+        if rtt is not None and self.last_rtt is not None:
+            self.jitter += (abs(rtt - self.last_rtt) - self.jitter) / 16
+        if rtt is not None:
+            self.last_rtt = rtt
+        if len(self.results) == self.results.maxlen:
+            dropped = self.results[0]
+            if dropped is None:
+                self.lost -= 1
+            else:
+                self.rtt_total -= dropped
+        self.results.append(rtt)
+        if rtt is None:
+            self.lost += 1
+        else:
+            self.rtt_total += rtt
+        self.count = len(self.results)
+
+    @property
+    def loss(self) -> float:
+        count = self.count
+        return self.lost / count if count else 0.0
+
+    @property
+    def avg(self) -> Optional[float]:
+        answered = self.count - self.lost
+        return max(self.rtt_total, 0.0) / answered if answered > 0 else None
+
+
+class RoundSummary:
+    """Aggregate of one probe round (RTTs in milliseconds)"""
+
+    __slots__ = ("timestamp", "sent", "received", "median_ms", "max_ms", "duration")
+
+    def __init__(self, rtts: List[Optional[float]], duration: float):
+        answered = [r * 1000 for r in rtts if r is not None]
+        self.timestamp = time.time()
+        self.sent = len(rtts)
+        self.received = len(answered)
+        self.median_ms = statistics.median(answered) if answered else None
+        self.max_ms = max(answered) if answered else None
+        self.duration = duration
+
+    @property
+    def loss(self) -> float:
+        return 1 - self.received / self.sent if self.sent else 0.0
+
+
+class _EchoSocket:
+    """Unprivileged ICMP (SOCK_DGRAM) socket shared by all targets of one family"""
+
+    def __init__(self, loop: "asyncio.AbstractEventLoop", family: int):
+        self.loop = loop
+        self.family = family
+        proto = socket.IPPROTO_ICMPV6 if family == socket.AF_INET6 else socket.IPPROTO_ICMP
+        self.request_type, self.reply_type = (128, 129) if family == socket.AF_INET6 else (8, 0)
+        self.sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+        self.sock.setblocking(False)
+        self.seq = 0
+        self.pending: Dict[int, tuple] = {}
+        loop.add_reader(self.sock.fileno(), self._on_readable)
+
+    def ping(self, address: str, timeout: float) -> "asyncio.Future":
+        fut = self.loop.create_future()
+        self.seq = (self.seq + 1) & 0xFFFF
+        seq = self.seq
+        header = _ICMP_HEADER.pack(self.request_type, 0, 0, 0, seq)
+        csum = _checksum(header + ICMP_PAYLOAD) if self.family == socket.AF_INET else 0
+        packet = _ICMP_HEADER.pack(self.request_type, 0, csum, 0, seq) + ICMP_PAYLOAD
+        self.pending[seq] = (fut, address, time.perf_counter())
+        try:
+            self.sock.sendto(packet, (address, 0))
+        except OSError:
+            self.pending.pop(seq, None)
+            fut.set_result(None)
+            return fut
+        self.loop.call_later(timeout, self._expire, seq, fut)
+        return fut
+
+    def _expire(self, seq: int, fut: "asyncio.Future"):
+        if not fut.done():
+            self.pending.pop(seq, None)
+            fut.set_result(None)
+
+    def _on_readable(self):
+        now = time.perf_counter()
+        while True:
+            try:
+                data, source = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue
+            if len(data) < _ICMP_HEADER.size:
+                continue
+            kind, _code, _csum, _ident, seq = _ICMP_HEADER.unpack_from(data)
+            entry = self.pending.get(seq)
+            if kind != self.reply_type or entry is None or entry[1] != source[0]:
+                continue
+            del self.pending[seq]
+            if not entry[0].done():
+                entry[0].set_result(now - entry[2])
+
+    def close(self):
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+
+
+class Pinger:
+    """Probes every target once per interval from a single thread"""
+
+    def __init__(self, targets: List[str], interval: float = 1.0, timeout: Optional[float] = None,
+                 window: int = DEFAULT_WINDOW,
+                 on_result: Optional[Callable[[Target, Optional[float]], None]] = None,
+                 on_round: Optional[Callable[[RoundSummary], None]] = None):
+        self.configured_timeout = timeout
+        self.interval = interval
+        self.timeout = min(timeout or interval, interval)
+        self.window = window
+        self.on_result = on_result
+        self.on_round = on_round
+        self.targets: List[Target] = []
+        self.stats: Dict[str, TargetStats] = {}
+        self.last_round: Optional[RoundSummary] = None
+        self.icmp_available: Dict[int, bool] = {}
+        self.limit = max_in_flight()
+        self._pending_targets: Optional[List[str]] = None
+        self._echo: Dict[int, _EchoSocket] = {}
+        self._loop: Optional["asyncio.AbstractEventLoop"] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._apply_targets(targets)
+
+    def set_interval(self, interval: float):
+        """Change the round interval; the probe timeout follows it up to the configured timeout"""
+        self.interval = interval
+        self.timeout = min(self.configured_timeout or interval, interval)
+
+    # === TARGETS ===
+
+    def set_targets(self, specs: List[str]):
+        """Replace the target list; applied at the start of the next round"""
+        with self._lock:
+            self._pending_targets = list(specs)
+
+    def _apply_targets(self, specs: List[str]):
+        targets = []
+        seen = set()
+        for spec in specs:
+            if spec in seen:
+                continue
+            seen.add(spec)
+            try:
+                targets.append(Target(spec))
+            except ValueError as e:
+                print(f"Latency target error ({spec}): {e}")
+        self.targets = targets
+        with self._lock:
+            self.stats = {t.key: self.stats.get(t.key) or TargetStats(self.window) for t in targets}
+
+    async def _resolve(self, target: Target):
+        try:
+            infos = await self._loop.getaddrinfo(target.host, None, type=socket.SOCK_STREAM)
+        except (OSError, UnicodeError):
+            target.resolved_at = time.time()
+            return
+        family, _, _, _, sockaddr = infos[0]
+        target.family = family
+        target.address = sockaddr[0]
+        target.resolved_at = time.time()
+
+    # === PROBES ===
+
+    def _echo_socket(self, family: int) -> Optional[_EchoSocket]:
+        if family not in self.icmp_available:
+            try:
+                self._echo[family] = _EchoSocket(self._loop, family)
+                self.icmp_available[family] = True
+            except OSError:
+                # net.ipv4.ping_group_range does not include us
+                self.icmp_available[family] = False
+        return self._echo.get(family)
+
+    def _probe(self, target: Target) -> "asyncio.Future":
+        if target.address is None:
+            fut = self._loop.create_future()
+            fut.set_result(None)
+            return fut
+        stats = self.stats.get(target.key)
+        if target.kind == "icmp":
+            echo = self._echo_socket(target.family)
+            if echo is not None:
+                if stats is not None:
+                    stats.mode = "icmp"
+                return echo.ping(target.address, self.timeout)
+        if stats is not None:
+            stats.mode = "tcp"
+        return self._connect(target)
+
+    def _connect(self, target: Target) -> "asyncio.Future":
+        loop = self._loop
+        fut = loop.create_future()
+        try:
+            sock = socket.socket(target.family, socket.SOCK_STREAM)
+        except OSError:
+            fut.set_result(None)
+            return fut
+        sock.setblocking(False)
+        # Abort with RST on close so thousands of probes leave no TIME_WAIT sockets
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_ABORT)
+        port = target.port or ICMP_FALLBACK_PORT
+        start = time.perf_counter()
+        err = sock.connect_ex((target.address, port))
+        if err != errno.EINPROGRESS:
+            # Loopback and local rejects complete immediately
+            rtt = time.perf_counter() - start
+            sock.close()
+            fut.set_result(rtt if err in _CONNECT_OK else None)
+            return fut
+        fd = sock.fileno()
+
+        def finish(rtt):
+            if fut.done():
+                return
+            loop.remove_writer(fd)
+            timer.cancel()
+            sock.close()
+            fut.set_result(rtt)
+
+        def writable():
+            error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            finish(time.perf_counter() - start if error in _CONNECT_OK else None)
+
+        loop.add_writer(fd, writable)
+        timer = loop.call_later(self.timeout, finish, None)
+        return fut
+
+    def _round(self, targets: List[Target]) -> "asyncio.Future":
+        """Probe all targets with at most self.limit in flight; resolves to the RTT list"""
+        done = self._loop.create_future()
+        results: List[Optional[float]] = [None] * len(targets)
+        state = {'next': 0, 'left': len(targets), 'in_flight': 0}
+        if not targets:
+            done.set_result(results)
+            return done
+
+        def launch():
+            # Start in small batches so replies are timestamped promptly
+            batch = 0
+            while state['next'] < len(targets) and state['in_flight'] < self.limit:
+                if batch == LAUNCH_BATCH:
+                    self._loop.call_soon(launch)
+                    return
+                index = state['next']
+                state['next'] += 1
+                state['in_flight'] += 1
+                batch += 1
+                self._probe(targets[index]).add_done_callback(lambda f, i=index: finished(i, f))
+
+        def finished(index, fut):
+            results[index] = fut.result()
+            state['in_flight'] -= 1
+            state['left'] -= 1
+            if state['left'] == 0:
+                done.set_result(results)
+            else:
+                launch()
+
+        launch()
+        return done
+
+    async def probe_round(self) -> RoundSummary:
+        """Run one round over the current targets and update their statistics"""
+        with self._lock:
+            pending, self._pending_targets = self._pending_targets, None
+        if pending is not None:
+            self._apply_targets(pending)
+        targets = self.targets
+        stale = [t for t in targets if time.time() - t.resolved_at > RESOLVE_SECONDS]
+        if stale:
+            import asyncio
+            await asyncio.gather(*(self._resolve(t) for t in stale))
+
+        start = time.perf_counter()
+        rtts = await self._round(targets)
+        summary = RoundSummary(rtts, time.perf_counter() - start)
+        for target, rtt in zip(targets, rtts):
+            stats = self.stats.get(target.key)
+            if stats is not None:
+                stats.add(rtt)
+            if self.on_result is not None:
+                self.on_result(target, rtt)
+        self.last_round = summary
+        if self.on_round is not None:
+            self.on_round(summary)
+        return summary
+
+    # === LOOP ===
+
+    async def _main(self):
+        import asyncio
+        self._loop = asyncio.get_running_loop()
+        next_round = self._loop.time()
+        while not self._stop.is_set():
+            try:
+                await self.probe_round()
+            except Exception as e:
+                print(f"Latency probe error: {e}")
+            next_round += self.interval
+            delay = next_round - self._loop.time()
+            if delay < 0:
+                next_round = self._loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+        for echo in self._echo.values():
+            echo.close()
+        self._echo.clear()
+        self.icmp_available.clear()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="securenet-pinger", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        import asyncio
+        asyncio.run(self._main())
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self) -> RoundSummary:
+        """Probe every target once on a private event loop (benchmarks, headless use)"""
+        import asyncio
+
+        async def once():
+            self._loop = asyncio.get_running_loop()
+            try:
+                return await self.probe_round()
+            finally:
+                for echo in self._echo.values():
+                    echo.close()
+                self._echo.clear()
+                self.icmp_available.clear()
+
+        return asyncio.run(once())
+
+    # === REPORTING ===
+
+    def format_table(self, limit: int = 20) -> str:
+        """Per-target RTT, jitter and loss, worst first"""
+        with self._lock:
+            items = list(self.stats.items())
+        lines = [f"{'Target':<28}{'Mode':<6}{'Last':>10}{'Avg':>10}{'Jitter':>10}{'Loss':>7}"]
+        items.sort(key=lambda item: (-item[1].loss, -(item[1].avg or 0)))
+        for key, s in items[:limit]:
+            last = f"{s.last_rtt * 1000:.1f}ms" if s.results and s.results[-1] is not None else "---"
+            avg = f"{s.avg * 1000:.1f}ms" if s.avg is not None else "---"
+            lines.append(f"{key[:27]:<28}{s.mode:<6}{last:>10}{avg:>10}"
+                         f"{s.jitter * 1000:>8.1f}ms{s.loss * 100:>6.0f}%")
+        if len(items) > limit:
+            lines.append(f"... {len(items) - limit} more targets")
+        if self.last_round is not None:
+            r = self.last_round
+            lines.append(f"Last round: {r.received}/{r.sent} answered in {r.duration * 1000:.0f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Probe Engine
+Schedules site groups on a shared worker pool with one keep-alive session per group
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+HOST_CONCURRENCY = 4        # parallel connections per group (also the session pool size)
+STRIPE_MIN_SITES = 25       # groups smaller than this are probed on a single connection
+
+
+def new_session(pool_size: int = HOST_CONCURRENCY):
+    """requests.Session sized for one host group (requests is imported on first use)"""
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class GroupState:
+    """Schedule, shared session and last aggregate result of one site group"""
+
+    __slots__ = ("group", "next_due", "session", "running", "pending", "last_checked",
+                 "up", "checked", "avg_ms", "max_ms", "_lock")
+
+    def __init__(self, group):
+        self.group = group
+        self.next_due = 0.0
+        self.session = None
+        self.running = False
+        self.pending = 0
+        self.last_checked = 0.0
+        self.up = 0
+        self.checked = 0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        return self.group.key
+
+    @property
+    def total(self) -> int:
+        return len(self.group.sites)
+
+    def summarize(self):
+        """Recompute aggregates from the per-site results"""
+        times = [s['response_ms'] for s in self.group.sites if s.get('up')]
+        self.checked = sum(1 for s in self.group.sites if 'up' in s)
+        self.up = len(times)
+        self.avg_ms = sum(times) / len(times) if times else 0.0
+        self.max_ms = max(times) if times else 0.0
+        self.last_checked = time.time()
+
+
+class ProbeEngine:
+    """Runs probe(site, session, timeout) for every site of each due group"""
+
+    def __init__(self, probe: Callable[[Dict, object, float], None], workers: int = 16,
+                 on_group_done: Optional[Callable[[GroupState], None]] = None,
+                 session_factory: Callable[[], object] = new_session):
+        self.probe = probe
+        self.on_group_done = on_group_done
+        self.session_factory = session_factory
+        self.states: Dict[str, GroupState] = {}
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="securenet-probe")
+        return self._pool
+
+    def set_groups(self, groups: Dict):
+        """Replace the group set, keeping schedule and sessions of surviving groups"""
+        with self._lock:
+            states = {}
+            for key, group in groups.items():
+                state = self.states.get(key)
+                if state is None:
+                    state = GroupState(group)
+                else:
+                    state.group = group
+                states[key] = state
+            removed = [s for k, s in self.states.items() if k not in states]
+            self.states = states
+        for state in removed:
+            if state.session is not None and not state.running:
+                state.session.close()
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Start every idle group whose interval has elapsed; returns groups started"""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [s for s in self.states.values() if not s.running and s.next_due <= now]
+            for state in due:
+                state.running = True
+                state.next_due = now + state.group.interval
+        for state in due:
+            self._start(state)
+        return len(due)
+
+    def run_all(self, wait: bool = True):
+        """Probe every group now, optionally blocking until all are done"""
+        with self._lock:
+            # In-flight groups may be probing an older site list; let them finish first
+            while wait and any(s.running for s in self.states.values()):
+                self._idle.wait()
+            states = [s for s in self.states.values() if not s.running]
+            for state in states:
+                state.running = True
+                state.next_due = time.time() + state.group.interval
+        done = threading.Event()
+        remaining = [len(states)]
+        if not states:
+            return
+
+        def finished(_state):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        for state in states:
+            self._start(state, finished)
+        if wait:
+            done.wait()
+
+    def _start(self, state: GroupState, finished: Optional[Callable] = None):
+        sites = list(state.group.sites)
+        if state.session is None:
+            state.session = self.session_factory()
+        stripes = min(HOST_CONCURRENCY, max(1, len(sites) // STRIPE_MIN_SITES))
+        state.pending = stripes
+        pool = self._executor()
+        for i in range(stripes):
+            pool.submit(self._run_stripe, state, sites[i::stripes], finished)
+
+    def _run_stripe(self, state: GroupState, sites: List[Dict], finished):
+        timeout = state.group.timeout
+        for site in sites:
+            try:
+                self.probe(site, state.session, timeout)
+            except Exception as e:
+                print(f"Probe error ({site.get('url')}): {e}")
+        with state._lock:
+            state.pending -= 1
+            last = state.pending == 0
+        if not last:
+            return
+        state.summarize()
+        with self._lock:
+            state.running = False
+            self._idle.notify_all()
+        if self.states.get(state.key) is not state and state.session is not None:
+            state.session.close()       # group was removed while running
+        if self.on_group_done is not None:
+            self.on_group_done(state)
+        if finished is not None:
+            finished(state)
+
+    def summaries(self) -> List[GroupState]:
+        """Group states, unhealthy groups first"""
+        with self._lock:
+            states = list(self.states.values())
+        return sorted(states, key=lambda s: (s.up / s.total if s.checked and s.total else 2, s.key))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        for state in self.states.values():
+            if state.session is not None:
+                state.session.close()
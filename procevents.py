@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Process Events
+exec/exit notifications from the Linux proc connector, with a /proc polling fallback
+"""
+
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Optional, Set
+
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+NLMSG_DONE = 3
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+POLL_INTERVAL = 0.5
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_CN_MSG = struct.Struct("=IIIIHH")
+_EVENT_HEADER = struct.Struct("=IIQ")
+_EXEC_DATA = struct.Struct("=II")
+_EXIT_DATA = struct.Struct("=IIII")
+
+
+class ProcEvent:
+    """A process started a new program ('exec') or went away ('exit')"""
+
+    __slots__ = ("kind", "pid", "name", "exe", "timestamp", "exit_code")
+
+    def __init__(self, kind: str, pid: int, name: str = "", exe: str = "", exit_code: Optional[int] = None):
+        self.kind = kind
+        self.pid = pid
+        self.name = name
+        self.exe = exe
+        self.timestamp = time.time()
+        self.exit_code = exit_code
+
+
+def list_pids() -> Set[int]:
+    """Current process IDs (thread groups only)"""
+    try:
+        return {int(name) for name in os.listdir("/proc") if name.isdigit()}
+    except OSError:
+        return set()
+
+
+def describe(pid: int) -> tuple:
+    """(comm, exe) for a pid; empty strings if it is gone or not ours to read"""
+    try:
+        with open(f"/proc/{pid}/comm", encoding="utf-8", errors="replace") as f:
+            name = f.read().strip()
+    except OSError:
+        return "", ""
+    try:
+        exe = os.readlink(f"/proc/{pid}/exe")
+    except OSError:
+        exe = ""
+    return name, exe
+
+
+class _Source:
+    mode = ""
+
+    def __init__(self, on_event: Callable[[ProcEvent], None]):
+        self.on_event = on_event
+        self._stop = threading.Event()
+        self.events_seen = 0
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, event: ProcEvent):
+        self.events_seen += 1
+        try:
+            self.on_event(event)
+        except Exception as e:
+            print(f"Process event handler error: {e}")
+
+
+class NetlinkSource(_Source):
+    """Kernel-pushed events; needs CAP_NET_ADMIN, costs nothing while idle"""
+
+    mode = "netlink"
+
+    def __init__(self, on_event: Callable[[ProcEvent], None], on_overflow: Optional[Callable[[], None]] = None):
+        super().__init__(on_event)
+        self.on_overflow = on_overflow
+        self.overflows = 0
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self.sock.bind((os.getpid(), CN_IDX_PROC))
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self._control(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self.sock.close()
+            raise
+
+    def _control(self, op: int):
+        payload = struct.pack("=I", op)
+        cn = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn), NLMSG_DONE, 0, 0, os.getpid())
+        self.sock.send(header + cn)
+
+    def run(self):
+        self.sock.settimeout(1.0)
+        try:
+            while not self._stop.is_set():
+                try:
+                    data = self.sock.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    if e.errno == 105:      # ENOBUFS: the kernel dropped events
+                        self.overflows += 1
+                        if self.on_overflow is not None:
+                            self.on_overflow()
+                        continue
+                    raise
+                self._parse(data)
+        finally:
+            try:
+                self._control(PROC_CN_MCAST_IGNORE)
+            except OSError:
+                pass
+            self.sock.close()
+
+    def _parse(self, data: bytes):
+        offset = 0
+        while offset + _NLMSGHDR.size <= len(data):
+            length = _NLMSGHDR.unpack_from(data, offset)[0]
+            if length < _NLMSGHDR.size:
+                return
+            body = offset + _NLMSGHDR.size + _CN_MSG.size
+            if body + _EVENT_HEADER.size <= offset + length:
+                what = _EVENT_HEADER.unpack_from(data, body)[0]
+                payload = body + _EVENT_HEADER.size
+                if what == PROC_EVENT_EXEC:
+                    pid, tgid = _EXEC_DATA.unpack_from(data, payload)
+                    if pid == tgid:
+                        name, exe = describe(tgid)
+                        self._emit(ProcEvent("exec", tgid, name, exe))
+                elif what == PROC_EVENT_EXIT:
+                    pid, tgid, code, _signal = _EXIT_DATA.unpack_from(data, payload)
+                    if pid == tgid:
+                        self._emit(ProcEvent("exit", tgid, exit_code=code))
+            offset += (length + 3) & ~3
+
+
+class PollSource(_Source):
+    """Diffs /proc every interval; processes shorter than the interval can be missed"""
+
+    mode = "polling"
+
+    def __init__(self, on_event: Callable[[ProcEvent], None], interval: float = POLL_INTERVAL):
+        super().__init__(on_event)
+        self.interval = interval
+        self.known = list_pids()
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        current = list_pids()
+        for pid in current - self.known:
+            name, exe = describe(pid)
+            self._emit(ProcEvent("exec", pid, name, exe))
+        for pid in self.known - current:
+            self._emit(ProcEvent("exit", pid))
+        self.known = current
+
+
+class ProcessWatcher:
+    """Process start/exit feed using the best source available"""
+
+    def __init__(self, on_event: Callable[[ProcEvent], None], on_overflow: Optional[Callable[[], None]] = None,
+                 prefer_netlink: bool = True, poll_interval: float = POLL_INTERVAL):
+        self.on_event = on_event
+        self.on_overflow = on_overflow
+        self.prefer_netlink = prefer_netlink
+        self.poll_interval = poll_interval
+        self.source: Optional[_Source] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def mode(self) -> str:
+        return self.source.mode if self.source is not None else "stopped"
+
+    @property
+    def events_seen(self) -> int:
+        return self.source.events_seen if self.source is not None else 0
+
+    def start(self):
+        source = None
+        if self.prefer_netlink and hasattr(socket, "AF_NETLINK"):
+            try:
+                source = NetlinkSource(self.on_event, self.on_overflow)
+            except OSError:
+                # Not root / no CAP_NET_ADMIN, or the connector is not built in
+                source = None
+        if source is None:
+            source = PollSource(self.on_event, self.poll_interval)
+        self.source = source
+        self._thread = threading.Thread(target=source.run, name=f"securenet-proc-{source.mode}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()
+            self.source = None
+
+    @property
+    def running(self) -> bool:
+        return self.source is not None
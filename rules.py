@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Threshold Rules
+Resource/latency threshold rules shared by the live checks and history replay
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+
+class ThresholdRule(NamedTuple):
+    """A series breaches its rule while the value is strictly above the setting"""
+    series: str         # history series and threat key suffix
+    label: str
+    setting: str        # security config key holding the limit
+    unit: str
+    source: str = "system"
+    severity: str = "MEDIUM"
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.series}"
+
+    @staticmethod
+    def breached(value: float, limit: float) -> bool:
+        return value > limit
+
+    def title(self) -> str:
+        return f"High {self.label}"
+
+    def detail(self, value: float, limit: float) -> str:
+        return f"{value:.1f}{self.unit} > {limit}{self.unit}"
+
+
+THRESHOLD_RULES = (
+    ThresholdRule('cpu', "CPU usage", 'max_cpu_threshold', "%"),
+    ThresholdRule('memory', "Memory usage", 'max_memory_threshold', "%"),
+    ThresholdRule('latency', "network latency", 'max_latency_ms', " ms"),
+)
+
+RULES_BY_SETTING: Dict[str, ThresholdRule] = {rule.setting: rule for rule in THRESHOLD_RULES}
+
+
+def apply(threats, rule: ThresholdRule, value: Optional[float], limit: float):
+    """Report or resolve one rule's threat for the latest value (None: no sample, leave it)"""
+    if value is None:
+        return
+    if rule.breached(value, limit):
+        threats.report(rule.source, rule.severity, rule.title(), rule.detail(value, limit), key=rule.key)
+    else:
+        threats.resolve(rule.key)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Scan Detector
+Port-scan and connection-flood detection from /proc/net socket table deltas
+"""
+
+import operator
+import re
+import socket
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set, Tuple
+
+PROC_TABLES = ("/proc/net/tcp", "/proc/net/tcp6", "/proc/net/udp", "/proc/net/udp6")
+
+TCP_ESTABLISHED = "01"
+TCP_SYN_RECV = "03"
+TCP_LISTEN = "0A"
+TCP_INBOUND = {TCP_ESTABLISHED, TCP_SYN_RECV}   # TIME_WAIT and the closing states are old connections
+
+WINDOW_SECONDS = 60.0
+BUCKETS = 6                     # the window slides in WINDOW_SECONDS / BUCKETS steps
+SKETCH_WIDTH = 8192
+SKETCH_DEPTH = 4
+BLOOM_BITS = 1 << 20
+BLOOM_HASHES = 4
+MAX_FLAGGED = 256
+
+PORT_SCAN_THRESHOLD = 20        # distinct local ports touched by one source per window
+CONN_FLOOD_THRESHOLD = 200      # new connections from one source per window
+SYN_FLOOD_THRESHOLD = 256       # half-open connections in one snapshot, all sources
+
+# "  12: 0100007F:1F90 0200007F:C350 01 ..." -> local addr, local port, remote addr, remote port, state
+_ENTRY = re.compile(r"^\s*\d+: ([0-9A-F]+):([0-9A-F]{4}) ([0-9A-F]+):([0-9A-F]{4}) ([0-9A-F]{2})", re.M)
+_UNSPECIFIED = {"00000000", "0" * 32}
+_LOOPBACK6 = "0" * 24 + "01000000"
+_MAPPED4 = "0" * 16 + "FFFF0000"
+
+
+def is_loopback(hex_addr: str) -> bool:
+    """127.0.0.0/8, ::1 or ::ffff:127.x in /proc/net hex (the first octet is the word's last byte)"""
+    if len(hex_addr) == 8:
+        return hex_addr.endswith("7F")
+    return hex_addr == _LOOPBACK6 or (hex_addr.startswith(_MAPPED4) and hex_addr.endswith("7F"))
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hashes(key, count: int, size: int) -> List[int]:
+    """Kirsch-Mitzenmacher double hashing: `count` indexes from one hash() call"""
+    h = hash(key) & _MASK64
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    return [(h1 + i * h2) % size for i in range(count)]
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimates that never under-count"""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def add(self, key, count: int = 1):
+        for row, index in zip(self.rows, _hashes(key, self.depth, self.width)):
+            row[index] += count
+
+    def estimate(self, key) -> int:
+        return min(row[index] for row, index in zip(self.rows, _hashes(key, self.depth, self.width)))
+
+    def clear(self):
+        for row in self.rows:
+            row[:] = array("I", bytes(4 * self.width))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(row.itemsize * len(row) for row in self.rows)
+
+
+class WindowedSketch:
+    """Count-min over a sliding window: one sketch per bucket plus a running total"""
+
+    def __init__(self, window: float = WINDOW_SECONDS, buckets: int = BUCKETS,
+                 width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.bucket_seconds = window / buckets
+        self.buckets = [CountMinSketch(width, depth) for _ in range(buckets)]
+        self.total = CountMinSketch(width, depth)
+        self.current = 0
+        self.bucket_start = 0.0
+
+    def advance(self, now: float):
+        """Expire buckets that fell out of the window"""
+        if not self.bucket_start:
+            self.bucket_start = now
+        steps = int((now - self.bucket_start) // self.bucket_seconds)
+        for _ in range(min(steps, len(self.buckets))):
+            self.current = (self.current + 1) % len(self.buckets)
+            expired = self.buckets[self.current]
+            for total_row, old_row in zip(self.total.rows, expired.rows):
+                total_row[:] = array("I", map(operator.sub, total_row, old_row))
+            expired.clear()
+        if steps:
+            self.bucket_start += steps * self.bucket_seconds
+
+    def add(self, key, count: int = 1) -> int:
+        """Count and return the windowed estimate"""
+        # Conservative update: only rows at the current minimum grow, which keeps quiet
+        # keys' estimates low while a flood of distinct sources fills the table
+        indexes = _hashes(key, self.total.depth, self.total.width)
+        bucket = self.buckets[self.current]
+        cells = list(zip(bucket.rows, self.total.rows, indexes))
+        low = min(total_row[index] for _, total_row, index in cells)
+        for row, total_row, index in cells:
+            if total_row[index] == low:
+                row[index] += count
+                total_row[index] += count
+        return low + count
+
+    @property
+    def nbytes(self) -> int:
+        return self.total.nbytes * (len(self.buckets) + 1)
+
+
+class BloomFilter:
+    """Set membership with false positives only; two generations give a sliding window"""
+
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.generations = [bytearray(bits // 8), bytearray(bits // 8)]
+
+    def add(self, key) -> bool:
+        """Insert; True if the key was (probably) already present"""
+        indexes = _hashes(key, self.hashes, self.bits)
+        current, previous = self.generations
+        seen_current = all(current[i >> 3] & (1 << (i & 7)) for i in indexes)
+        if seen_current:
+            return True
+        seen_previous = all(previous[i >> 3] & (1 << (i & 7)) for i in indexes)
+        for i in indexes:
+            current[i >> 3] |= 1 << (i & 7)
+        return seen_previous
+
+    def rotate(self):
+        self.generations = [bytearray(self.bits // 8), self.generations[0]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(g) for g in self.generations)
+
+
+def format_address(hex_addr: str) -> str:
+    """/proc/net hex (host-order 32-bit words) to a printable address"""
+    raw = bytes.fromhex(hex_addr)
+    words = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    family = socket.AF_INET if len(words) == 4 else socket.AF_INET6
+    text = socket.inet_ntop(family, words)
+    return text[7:] if text.startswith("::ffff:") else text
+
+
+def read_table(path: str) -> List[Tuple[str, str, str, str, str]]:
+    """(local, lport, remote, rport, state) rows; one C-level regex pass over the file"""
+    try:
+        with open(path, encoding="ascii", errors="replace") as f:
+            return _ENTRY.findall(f.read())
+    except OSError:
+        return []
+
+
+class ScanDetector:
+    """Feeds per-snapshot socket deltas into windowed sketches and raises threats"""
+
+    def __init__(self, threats, tables: Iterable[str] = PROC_TABLES,
+                 port_threshold: int = PORT_SCAN_THRESHOLD, conn_threshold: int = CONN_FLOOD_THRESHOLD,
+                 syn_threshold: int = SYN_FLOOD_THRESHOLD, window: float = WINDOW_SECONDS):
+        self.threats = threats
+        self.tables = list(tables)
+        self.port_threshold = port_threshold
+        self.conn_threshold = conn_threshold
+        self.syn_threshold = syn_threshold
+        self.window = window
+        self.connections = WindowedSketch(window)
+        self.ports = WindowedSketch(window)
+        self.pairs = BloomFilter()
+        self.flagged: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self.previous: Optional[Set[Tuple[str, str, str, str, str]]] = None
+        self.last_rotate = 0.0
+        self.snapshot_size = 0
+        self.syn_recv = 0
+        self.new_last = 0
+        self.parse_ms = 0.0
+        self._lock = threading.Lock()
+
+    def poll(self, now: Optional[float] = None, deltas: bool = True):
+        """Snapshot every table and count new inbound connections (deltas=False: half-open check only)"""
+        now = now or time.time()
+        start = time.perf_counter()
+        current = set()
+        listening = set()
+        syn_recv = 0
+        for path in self.tables:
+            proto = "udp" if "udp" in path else "tcp"
+            for local, lport, remote, rport, state in read_table(path):
+                if remote in _UNSPECIFIED:
+                    # TCP listeners, and bound but unconnected UDP sockets, are our services
+                    if proto == "udp" or state == TCP_LISTEN:
+                        listening.add((proto, lport))
+                    continue
+                if is_loopback(remote):
+                    continue    # local clients such as a reverse proxy in front of our own services
+                if proto == "tcp":
+                    if state not in TCP_INBOUND:
+                        continue
+                    if state == TCP_SYN_RECV:
+                        syn_recv += 1
+                current.add((proto, local, lport, remote, rport))
+        self.parse_ms = (time.perf_counter() - start) * 1000
+        self.snapshot_size = len(current)
+        self.syn_recv = syn_recv
+
+        with self._lock:
+            self.connections.advance(now)
+            self.ports.advance(now)
+            if now - self.last_rotate >= self.window / 2:
+                self.pairs.rotate()
+                self.last_rotate = now
+
+        previous, self.previous = self.previous, current
+        fresh = current - previous if previous is not None and deltas else ()
+        # The first snapshot is the baseline, not a burst of new connections
+        self.new_last = len(fresh)
+        for proto, local, lport, remote, rport in fresh:
+            if (proto, lport) not in listening:
+                continue    # outbound: our own client sockets
+            self.record(format_address(remote), int(lport, 16), now)
+
+        if syn_recv >= self.syn_threshold:
+            self.threats.report("scandetect", "HIGH", "SYN flood",
+                                f"{syn_recv} half-open connections", key="scandetect:synflood")
+        else:
+            self.threats.resolve("scandetect:synflood")
+
+    def record(self, address: str, port: int, now: float):
+        """Count one new inbound connection (or SYN) from address to a local port"""
+        with self._lock:
+            connections = self.connections.add(address)
+            ports = 0 if self.pairs.add((address, port)) else self.ports.add(address)
+        if connections >= self.conn_threshold:
+            self._flag(address, "flood", connections, now)
+        if ports >= self.port_threshold:
+            self._flag(address, "scan", ports, now)
+
+    def _flag(self, address: str, kind: str, value: int, now: float):
+        with self._lock:
+            self.flagged[address] = (kind, value, now)
+            self.flagged.move_to_end(address)
+            while len(self.flagged) > MAX_FLAGGED:
+                self.flagged.popitem(last=False)
+        if kind == "scan":
+            self.threats.report("scandetect", "MEDIUM", f"Port scan from {address}",
+                                f"~{value} distinct local ports in {self.window:.0f} s",
+                                key=f"scandetect:scan:{address}")
+        else:
+            self.threats.report("scandetect", "HIGH", f"Connection flood from {address}",
+                                f"~{value} new connections in {self.window:.0f} s",
+                                key=f"scandetect:flood:{address}")
+
+    @property
+    def nbytes(self) -> int:
+        """Fixed state size, independent of how many sources are seen"""
+        return self.connections.nbytes + self.ports.nbytes + self.pairs.nbytes
+
+    def format_table(self, limit: int = 10) -> str:
+        """Status block for the threat view"""
+        lines = [
+            f"Scan detector: {self.snapshot_size} sockets ({self.syn_recv} half-open, {self.new_last} new) "
+            f"| snapshot {self.parse_ms:.1f} ms | sketch memory {self.nbytes / 1024:.0f} KiB"
+        ]
+        with self._lock:
+            flagged = list(reversed(self.flagged.items()))[:limit]
+        for address, (kind, value, when) in flagged:
+            what = "ports" if kind == "scan" else "conns"
+            lines.append(f"  {address:<40} {kind:<6} ~{value:>6} {what}  {time.strftime('%H:%M:%S', time.localtime(when))}")
+        return "\n".join(lines)
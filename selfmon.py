@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Self Instrumentation
+Per-collector timings, event loop lag, thread/RSS stats and a sampling profiler
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import latency
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class SectionStats:
+    """Running totals for one instrumented section"""
+
+    __slots__ = ("calls", "total", "last", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.errors = 0
+
+
+class SamplingProfiler:
+    """Periodically samples every thread's stack into collapsed-stack counts"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="securenet-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(parts))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format consumed by flamegraph.pl / speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def dump(self, path: str) -> int:
+        """Write collapsed stacks to path, returning the number of distinct stacks"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return len(self.stacks)
+
+
+class SelfMonitor:
+    """Instrumentation surface for the monitor's own overhead"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.sections: Dict[str, SectionStats] = {}
+        self.timings = latency.LatencyRecorder(slots=6, slot_seconds=10)
+        self.loop_lag = latency.ShardedHistogram(slots=6, slot_seconds=10)
+        self.last_lag = 0.0
+        self.profiler = SamplingProfiler()
+        self._lock = threading.Lock()
+        self._cpu_mark = (time.perf_counter(), time.process_time())
+        self._cpu_percent = 0.0
+
+    @contextmanager
+    def track(self, section: str, kind: str = "collector"):
+        """Time a block of work under section ("collector", "probe" or "ui")"""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.sections.get(section)
+            if stats is None:
+                with self._lock:        # snapshot() copies the dict under the same lock
+                    stats = self.sections.setdefault(section, SectionStats())
+            stats.calls += 1
+            stats.total += elapsed
+            stats.last = elapsed
+            if failed:
+                stats.errors += 1
+            self.timings.record(kind, section, elapsed)
+
+    def record_lag(self, lag_seconds: float):
+        """Record how late a scheduled event loop callback ran"""
+        lag = max(lag_seconds, 0.0)
+        self.last_lag = lag
+        self.loop_lag.record(lag)
+
+    def cpu_percent(self) -> float:
+        """Own-process CPU since the previous call"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        last_wall, last_cpu = self._cpu_mark
+        if wall - last_wall >= 0.5:
+            self._cpu_percent = 100.0 * (cpu - last_cpu) / (wall - last_wall)
+            self._cpu_mark = (wall, cpu)
+        return self._cpu_percent
+
+    def snapshot(self) -> Dict[str, object]:
+        """Current health figures as plain data (used by the panel and headless mode)"""
+        lag = self.loop_lag.summary(60)
+        with self._lock:
+            items = sorted(self.sections.items())
+        sections = {}
+        for name, stats in items:
+            sections[name] = {
+                'calls': stats.calls,
+                'total_s': round(stats.total, 4),
+                'avg_ms': round(stats.total / stats.calls * 1000, 3) if stats.calls else 0.0,
+                'last_ms': round(stats.last * 1000, 3),
+                'errors': stats.errors,
+            }
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'rss_mb': round(process_rss_bytes() / (1024 * 1024), 1),
+            'cpu_percent': round(self.cpu_percent(), 1),
+            'threads': threading.active_count(),
+            'loop_lag_ms': {'last': round(self.last_lag * 1000, 2), 'p99': lag.p99, 'max': lag.max},
+            'profiler': {'running': self.profiler.running, 'samples': self.profiler.samples},
+            'sections': sections,
+        }
+
+    def format_report(self) -> str:
+        """Human-readable health report"""
+        snap = self.snapshot()
+        lag = snap['loop_lag_ms']
+        lines = [
+            f"Uptime: {snap['uptime_s']:.0f}s    RSS: {snap['rss_mb']:.1f} MB    "
+            f"Own CPU: {snap['cpu_percent']:.1f}%    Threads: {snap['threads']}",
+            f"Event loop lag: last {lag['last']:.1f} ms, p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms",
+            f"Profiler: {'running' if snap['profiler']['running'] else 'off'} "
+            f"({snap['profiler']['samples']} samples)",
+            "",
+            f"{'Section':<28}{'Calls':>8}{'Avg':>11}{'Last':>11}{'Total':>10}{'Errors':>8}",
+        ]
+        for name, s in snap['sections'].items():
+            lines.append(f"{name[:27]:<28}{s['calls']:>8}{s['avg_ms']:>9.2f}ms{s['last_ms']:>9.2f}ms"
+                         f"{s['total_s']:>9.2f}s{s['errors']:>8}")
+        lines.append("")
+        lines.append(self.timings.format_table())
+        return "\n".join(lines)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Bulk Site Import
+Streaming CSV / JSON / plain-list loaders with URL normalisation and grouping
+"""
+
+import io
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+CHUNK_SIZE = 1 << 16
+_HOST_RE = re.compile(r"[a-z0-9_-]+(\.[a-z0-9_-]+)*\.?|[0-9a-f:.]+")
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical form used for deduplication; None if the URL is unusable"""
+    url = url.strip()
+    if not url or url.startswith("#"):
+        return None
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+    try:
+        host = host.encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+    if not _HOST_RE.fullmatch(host):
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def host_key(url: str) -> str:
+    """host[:port] of a normalised URL; sites sharing it can share connections"""
+    return urlsplit(url).netloc
+
+
+def default_name(url: str) -> str:
+    """Display name for a normalised URL without one: host[:port] plus any path and query"""
+    parts = urlsplit(url)
+    name = parts.netloc + (parts.path if parts.path != "/" else "")
+    return f"{name}?{parts.query}" if parts.query else name
+
+
+# === STREAMING READERS ===
+
+def _iter_plain(f) -> Iterator[Dict]:
+    for line in f:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield {'url': line}
+
+
+def _iter_csv(f) -> Iterator[Dict]:
+    import csv
+    first = f.readline()
+    if not first:
+        return
+    header = [h.strip().lower() for h in next(csv.reader([first]))]
+    if "url" in header:
+        for row in csv.DictReader(f, fieldnames=header):
+            yield {k: v for k, v in row.items() if k and v not in (None, "")}
+    else:
+        # Headerless: url[,name[,group]]
+        for row in csv.reader(_chain_line(first, f)):
+            if row and row[0].strip():
+                item = {'url': row[0]}
+                if len(row) > 1 and row[1].strip():
+                    item['name'] = row[1].strip()
+                if len(row) > 2 and row[2].strip():
+                    item['group'] = row[2].strip()
+                yield item
+
+
+def _chain_line(first: str, f) -> Iterator[str]:
+    yield first
+    yield from f
+
+
+def _iter_json(f) -> Iterator[Dict]:
+    """Stream items out of a JSON array (or JSON Lines) without loading the whole file"""
+    import json
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    in_array = None
+    eof = False
+    while True:
+        # Skip whitespace and separators
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(CHUNK_SIZE)
+            buf, pos = buf[pos:] + chunk, 0
+            eof = not chunk
+        if pos >= len(buf):
+            return
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+                continue
+        if in_array and buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            if eof:
+                raise
+            chunk = f.read(CHUNK_SIZE)
+            buf, pos = buf[pos:] + chunk, 0
+            eof = not chunk
+            continue
+        pos = end
+        if isinstance(item, str):
+            yield {'url': item}
+        elif isinstance(item, dict) and item.get('url'):
+            yield item
+        # Compact the buffer now and then
+        if pos > CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def iter_site_file(path: str) -> Iterator[Dict]:
+    """Yield raw site dicts from a .csv, .json/.jsonl or plain URL list file"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            yield from _iter_csv(f)
+        elif ext in (".json", ".jsonl", ".ndjson"):
+            yield from _iter_json(f)
+        else:
+            yield from _iter_plain(f)
+
+
+def iter_site_text(text: str, fmt: str = "plain") -> Iterator[Dict]:
+    """Same as iter_site_file for in-memory text"""
+    f = io.StringIO(text)
+    if fmt == "csv":
+        return _iter_csv(f)
+    if fmt == "json":
+        return _iter_json(f)
+    return _iter_plain(f)
+
+
+# === IMPORT & GROUPING ===
+
+class ImportResult:
+    """Deduplicated sites plus counts of what was skipped"""
+
+    def __init__(self):
+        self.sites: List[Dict] = []
+        self.names = set()
+        self.duplicates = 0
+        self.invalid = 0
+
+
+def import_sites(items: Iterable[Dict], result: Optional[ImportResult] = None,
+                 seen: Optional[set] = None) -> ImportResult:
+    """Normalise and deduplicate site dicts (first occurrence wins); names are made unique"""
+    result = result or ImportResult()
+    seen = set() if seen is None else seen
+    for item in items:
+        url = normalize_url(str(item.get('url', "")))
+        if url is None:
+            result.invalid += 1
+            continue
+        if url in seen:
+            result.duplicates += 1
+            continue
+        seen.add(url)
+        # Histograms, history series and metric labels are keyed by name, so no two sites share one
+        name = base = str(item.get('name') or default_name(url))
+        suffix = 2
+        while name in result.names:
+            name = f"{base} ({suffix})"
+            suffix += 1
+        result.names.add(name)
+        site = {'url': url, 'name': name}
+        for field in ('group', 'interval', 'timeout'):
+            if item.get(field) not in (None, ""):
+                site[field] = item[field]
+        result.sites.append(site)
+    return result
+
+
+def load_sources(inline: Iterable[Dict], paths: Iterable[str]) -> ImportResult:
+    """Combine inline config sites with bulk source files"""
+    result = ImportResult()
+    seen = set()
+    import_sites(inline, result, seen)
+    for path in paths:
+        try:
+            import_sites(iter_site_file(os.path.expanduser(path)), result, seen)
+        except (OSError, ValueError) as e:
+            print(f"Site import error ({path}): {e}")
+    return result
+
+
+class SiteGroup:
+    """Sites probed together over shared connections"""
+
+    __slots__ = ("key", "sites", "interval", "timeout")
+
+    def __init__(self, key: str, interval: float, timeout: float):
+        self.key = key
+        self.sites: List[Dict] = []
+        self.interval = interval
+        self.timeout = timeout
+
+
+def group_sites(sites: Iterable[Dict], default_interval: float, default_timeout: float,
+                group_settings: Optional[Dict[str, Dict]] = None) -> "OrderedDict[str, SiteGroup]":
+    """Group sites by explicit 'group' or by host, applying per-group interval/timeout"""
+    group_settings = group_settings or {}
+    groups: "OrderedDict[str, SiteGroup]" = OrderedDict()
+    for site in sites:
+        key = site.get('group') or host_key(site['url'])
+        group = groups.get(key)
+        if group is None:
+            settings = group_settings.get(key, {})
+            group = groups[key] = SiteGroup(
+                key,
+                float(settings.get('interval', default_interval)),
+                float(settings.get('timeout', default_timeout)),
+            )
+        # A per-site override tightens the whole group
+        if site.get('interval'):
+            group.interval = min(group.interval, float(site['interval']))
+        if site.get('timeout'):
+            group.timeout = max(group.timeout, float(site['timeout']))
+        group.sites.append(site)
+    return groups
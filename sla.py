@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Site SLOs
+Rolling 1h/24h/30d availability, latency compliance and error-budget burn per site
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import history
+import threats
+
+# (name, seconds, buckets): the window slides one bucket at a time, so it covers
+# between (buckets - 1) and buckets bucket-widths of probes
+WINDOWS = (
+    ("1h", 3600, 60),               # 1 minute buckets
+    ("24h", 86400, 48),             # 30 minute buckets
+    ("30d", 30 * 86400, 120),       # 6 hour buckets
+)
+WINDOW_NAMES = tuple(name for name, _seconds, _buckets in WINDOWS)
+
+DEFAULT_AVAILABILITY = 99.9     # percent of probes that must succeed
+DEFAULT_LATENCY_MS = 1000       # a successful probe is "fast" at or under this
+DEFAULT_LATENCY = 99.0          # percent of successful probes that must be fast
+
+# Multi-window burn-rate alerts: 14.4x spends 2% of a 30 day budget in an hour,
+# 3x spends 10% in a day
+FAST_BURN = (WINDOW_NAMES[0], 14.4, "HIGH")
+SLOW_BURN = (WINDOW_NAMES[1], 3.0, "MEDIUM")
+MIN_PROBES = 10                 # no burn alert from a window with fewer probes than this
+
+SLIS = ("availability", "latency")
+
+
+class RollingWindow:
+    """Probe counts over a sliding window of fixed buckets, O(1) amortised per probe
+
+    Each slot remembers which bucket it holds and is reset as the window slides
+    past it, with running sums kept in step, so reading the window never walks
+    the buckets. Late samples (history seeding alongside live probes) still land
+    in their own bucket while it is inside the window.
+    """
+
+    __slots__ = ("width", "size", "head", "ids", "probes", "up", "fast", "sums")
+
+    def __init__(self, seconds: float, buckets: int):
+        self.width = seconds / buckets
+        self.size = buckets
+        self.head = -1                  # newest bucket number seen
+        self.ids = array("q", [-1]) * buckets
+        self.probes = array("i", [0]) * buckets
+        self.up = array("i", [0]) * buckets
+        self.fast = array("i", [0]) * buckets
+        self.sums = [0, 0, 0]
+
+    def _clear(self, slot: int):
+        if self.ids[slot] >= 0:
+            self.sums[0] -= self.probes[slot]
+            self.sums[1] -= self.up[slot]
+            self.sums[2] -= self.fast[slot]
+            self.probes[slot] = self.up[slot] = self.fast[slot] = 0
+        self.ids[slot] = -1
+
+    def _slide(self, bucket: int):
+        """Make `bucket` the newest, dropping the buckets that fall out of the window"""
+        if bucket <= self.head:
+            return
+        if bucket - self.head >= self.size:
+            for slot in range(self.size):
+                self._clear(slot)
+        else:
+            for number in range(self.head + 1, bucket + 1):
+                self._clear(number % self.size)
+        self.head = bucket
+
+    def add(self, now: float, probes: int, up: int, fast: int):
+        bucket = int(now // self.width)
+        self._slide(bucket)
+        if bucket <= self.head - self.size:
+            return                      # already outside the window
+        slot = bucket % self.size
+        if self.ids[slot] != bucket:
+            self._clear(slot)
+            self.ids[slot] = bucket
+        self.probes[slot] += probes
+        self.up[slot] += up
+        self.fast[slot] += fast
+        self.sums[0] += probes
+        self.sums[1] += up
+        self.sums[2] += fast
+
+    def totals(self, now: float) -> List[int]:
+        """[probes, up, fast] inside the window ending at now"""
+        self._slide(int(now // self.width))
+        return list(self.sums)
+
+
+class WindowStats(NamedTuple):
+    """One window of one site (or group), percentages None until there are probes"""
+    window: str
+    probes: int
+    availability: Optional[float]
+    latency: Optional[float]            # percent of successful probes within the latency target
+    availability_burn: float            # error budget spend rate; 1.0 uses it up exactly on time
+    latency_burn: float
+
+
+def burn_rate(good: int, total: int, target: float) -> float:
+    """How many times faster than sustainable the error budget is being spent"""
+    if not total:
+        return 0.0
+    budget = 1 - target / 100
+    bad = 1 - min(good, total) / total
+    return bad / budget if budget > 0 else (float("inf") if bad else 0.0)
+
+
+class _Site:
+    __slots__ = ("windows", "alerting", "seeded", "first_live")
+
+    def __init__(self):
+        self.windows = [RollingWindow(seconds, buckets) for _name, seconds, buckets in WINDOWS]
+        self.alerting = set()
+        self.seeded = False
+        self.first_live: Optional[float] = None     # time of the first probe recorded live
+
+
+class SLATracker:
+    """Per-site rolling SLO windows, keyed by site URL"""
+
+    def __init__(self, availability: float = DEFAULT_AVAILABILITY, latency_ms: float = DEFAULT_LATENCY_MS,
+                 latency: float = DEFAULT_LATENCY):
+        self.availability = availability
+        self.latency_ms = latency_ms
+        self.latency = latency
+        self._sites: Dict[str, _Site] = {}
+        self._lock = threading.Lock()
+        self.seeded_probes = 0
+
+    def configure(self, settings: Dict):
+        """Apply the 'slo' config section"""
+        self.availability = float(settings.get('availability', DEFAULT_AVAILABILITY))
+        self.latency_ms = float(settings.get('latency_ms', DEFAULT_LATENCY_MS))
+        self.latency = float(settings.get('latency', DEFAULT_LATENCY))
+
+    def _site(self, key: str) -> _Site:
+        site = self._sites.get(key)
+        if site is None:
+            site = self._sites[key] = _Site()
+        return site
+
+    def record(self, key: str, now: float, up: bool, response_ms: Optional[float] = None):
+        """Count one probe result"""
+        fast = int(up and response_ms is not None and response_ms <= self.latency_ms)
+        with self._lock:
+            site = self._site(key)
+            if site.first_live is None:
+                site.first_live = now
+            for window in site.windows:
+                window.add(now, 1, int(up), fast)
+
+    def forget(self, key: str) -> List[str]:
+        """Drop a site, returning the alert keys it still had raised"""
+        with self._lock:
+            site = self._sites.pop(key, None)
+        return sorted(site.alerting) if site is not None else []
+
+    def stats(self, keys: Iterable[str], now: float) -> List[WindowStats]:
+        """Per-window stats for one site, or summed over several (a site group)"""
+        totals = [[0, 0, 0] for _ in WINDOWS]
+        with self._lock:
+            for key in keys:
+                site = self._sites.get(key)
+                if site is None:
+                    continue
+                for index, window in enumerate(site.windows):
+                    for field, value in enumerate(window.totals(now)):
+                        totals[index][field] += value
+        result = []
+        for name, (probes, up, fast) in zip(WINDOW_NAMES, totals):
+            result.append(WindowStats(
+                name, probes,
+                availability=up / probes * 100 if probes else None,
+                latency=min(fast, up) / up * 100 if up else None,
+                availability_burn=burn_rate(up, probes, self.availability),
+                latency_burn=burn_rate(fast, up, self.latency),
+            ))
+        return result
+
+    def check(self, alerts, key: str, label: str, now: float):
+        """Raise or clear burn-rate alerts for one site after a probe
+
+        They go to the alert pipeline like site state, not the threat log, so an
+        outage across many sites cannot crowd security events out of the log.
+        """
+        by_window = {s.window: s for s in self.stats([key], now)}
+        targets = {'availability': self.availability, 'latency': self.latency}
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                return
+            alerting = site.alerting
+        for sli in SLIS:
+            for window, limit, severity in (FAST_BURN, SLOW_BURN):
+                stats = by_window[window]
+                burn = getattr(stats, f"{sli}_burn")
+                alert_key = f"sla:{key}:{sli}:{window}"
+                if stats.probes >= MIN_PROBES and burn >= limit:
+                    value = getattr(stats, sli)
+                    alerts.observe(threats.ThreatEvent(
+                        alert_key, "sla", severity, f"{label} burning {sli} error budget",
+                        f"{burn:.1f}x over {window} ({value:.2f}% vs {targets[sli]}% target)"))
+                    alerting.add(alert_key)
+                elif alert_key in alerting:
+                    alerting.discard(alert_key)
+                    alerts.clear(alert_key)
+
+    def seed(self, store, urls: Iterable[str], end_ms: int) -> int:
+        """Rebuild the windows from stored probe history up to end_ms
+
+        History is read by the site ID of each URL. Each site is seeded once, and only up to its
+        first live probe, so probes already counted live (and stored by then)
+        are never added twice. Probes are first counted per finest bucket;
+        every coarser bucket is a whole number of those, so adding the per-bucket
+        counts gives the same windows as adding each probe.
+        """
+        _name, seconds, _buckets = WINDOWS[-1]
+        start_ms = end_ms - int(seconds * 1000)
+        unit_ms = int(min(s / b for _n, s, b in WINDOWS) * 1000)
+        seeded = 0
+        for key in urls:
+            series = history.site_id(key)
+            with self._lock:
+                site = self._site(key)
+                if site.seeded:
+                    continue
+                site.seeded = True
+                until_ms = end_ms if site.first_live is None else min(end_ms, int(site.first_live * 1000))
+            counts: Dict[int, List[int]] = {}
+            for timestamps, values in store.read(history.site_series(series, "up"), start_ms, until_ms):
+                for ts, value in zip(timestamps, values):
+                    bucket = counts.setdefault(ts // unit_ms, [0, 0, 0])
+                    bucket[0] += 1
+                    bucket[1] += value >= 1
+                seeded += len(values)
+            for timestamps, values in store.read(history.site_series(series, "response_ms"), start_ms, until_ms):
+                for ts, value in zip(timestamps, values):
+                    counts.setdefault(ts // unit_ms, [0, 0, 0])[2] += value <= self.latency_ms
+            with self._lock:
+                windows = site.windows
+                for bucket in sorted(counts):
+                    probes, up, fast = counts[bucket]
+                    for window in windows:
+                        window.add(bucket * unit_ms / 1000, probes, up, fast)
+        self.seeded_probes += seeded
+        return seeded
+
+
+def format_uptime(stats: List[WindowStats]) -> str:
+    """"99.95 / 99.99 / 100%" style summary of the availability windows"""
+    parts = []
+    for s in stats:
+        if s.availability is None:
+            parts.append("-")
+        elif s.availability >= 100:
+            parts.append("100")
+        else:
+            parts.append(f"{min(s.availability, 99.99):.2f}")
+    return " / ".join(parts) + "%"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Startup Helpers
+Lazy module loading and an import/startup timing report
+"""
+
+import importlib
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+class StartupReport:
+    """Milestones and import durations measured from interpreter start-up"""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.milestones: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str):
+        """Record a milestone (only the first occurrence of a name counts)"""
+        elapsed = time.perf_counter() - self.t0
+        with self._lock:
+            if all(existing != name for existing, _ in self.milestones):
+                self.milestones.append((name, elapsed))
+
+    def record_import(self, name: str, seconds: float, lazy: bool):
+        with self._lock:
+            self.imports[name] = (seconds, lazy)
+
+    def milestone(self, name: str) -> float:
+        for existing, elapsed in self.milestones:
+            if existing == name:
+                return elapsed
+        return -1.0
+
+    def format_report(self) -> str:
+        """Plain-text report for the console and the Monitor Health view"""
+        lines = ["Startup timeline:"]
+        for name, elapsed in self.milestones:
+            lines.append(f"  {name:<24}{elapsed * 1000:>10.1f} ms")
+        lines.append("Imports:")
+        for name, (seconds, lazy) in sorted(self.imports.items(), key=lambda item: -item[1][0]):
+            lines.append(f"  {name:<24}{seconds * 1000:>10.1f} ms  {'(lazy)' if lazy else ''}")
+        pending = [m.__name__ for m in LazyModule.instances if not m.loaded]
+        if pending:
+            lines.append(f"  not loaded yet: {', '.join(sorted(pending))}")
+        return "\n".join(lines)
+
+
+REPORT = StartupReport()
+
+
+def timed_import(name: str):
+    """Import a module now, recording how long it took"""
+    already = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already:
+        REPORT.record_import(name, time.perf_counter() - start, lazy=False)
+    return module
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access (thread-safe)"""
+
+    instances: List["LazyModule"] = []
+
+    def __init__(self, name: str):
+        self.__dict__["__name__"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+        LazyModule.instances.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                start = time.perf_counter()
+                already = self.__name__ in sys.modules
+                module = importlib.import_module(self.__name__)
+                if not already:
+                    REPORT.record_import(self.__name__, time.perf_counter() - start, lazy=True)
+                self.__dict__["_module"] = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._module or self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._module or self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy that imports name on first use"""
+    return LazyModule(name)
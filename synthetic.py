@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Synthetic Checks
+Scripted multi-step HTTP transactions with assertions, run on the shared probe engine
+"""
+
+import re
+import time
+from string import Template
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+PREFIX = "synthetic:"           # check URLs/group keys, so checks never collide with plain sites
+MAX_BODY_PREVIEW = 80
+
+_PATH_TOKEN = re.compile(r"\.([A-Za-z_][\w-]*)|\[(-?\d+)\]|\[['\"]([^'\"]+)['\"]\]")
+MISSING = object()
+
+
+# === JSON PATH ===
+
+def compile_path(path: str) -> Tuple:
+    """Keys of a "$.a.b[0]['c d']" path"""
+    if not path.startswith("$"):
+        raise ValueError(f"JSON path must start with $: {path}")
+    keys = []
+    pos = 1
+    while pos < len(path):
+        match = _PATH_TOKEN.match(path, pos)
+        if match is None:
+            raise ValueError(f"bad JSON path at {path[pos:]!r}: {path}")
+        name, index, quoted = match.groups()
+        keys.append(int(index) if index is not None else (name if name is not None else quoted))
+        pos = match.end()
+    return tuple(keys)
+
+
+def lookup(document: Any, keys: Tuple) -> Any:
+    """Value at a compiled path, or MISSING"""
+    for key in keys:
+        try:
+            document = document[key]
+        except (KeyError, IndexError, TypeError):
+            return MISSING
+    return document
+
+
+# === CHECK DEFINITIONS ===
+
+def _template(value: Any) -> Any:
+    """Templates for every string in a value that references ${variables}"""
+    if isinstance(value, str):
+        return Template(value) if "$" in value else value
+    if isinstance(value, dict):
+        return {k: _template(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_template(v) for v in value]
+    return value
+
+
+def _render(value: Any, variables: Dict[str, str]) -> Any:
+    if isinstance(value, Template):
+        return value.safe_substitute(variables)
+    if isinstance(value, dict):
+        return {k: _render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, variables) for v in value]
+    return value
+
+
+class Step:
+    """One request of a check, with its assertions compiled up front"""
+
+    __slots__ = ("name", "method", "url", "headers", "data", "json", "statuses", "header_patterns",
+                 "body_patterns", "json_expect", "extract", "max_ms", "needs_json", "needs_text")
+
+    def __init__(self, raw: Dict, index: int):
+        if not isinstance(raw, dict) or not raw.get('url'):
+            raise ValueError(f"step {index + 1} needs a url")
+        expect = raw.get('expect') or {}
+        self.name = str(raw.get('name') or f"step {index + 1}")
+        self.method = str(raw.get('method') or "GET").upper()
+        self.url = _template(raw['url'])
+        self.headers = _template(raw.get('headers') or {})
+        self.data = _template(raw.get('body'))
+        self.json = _template(raw.get('json'))
+        status = expect.get('status')
+        self.statuses = None if status is None else frozenset(status if isinstance(status, list) else [status])
+        self.header_patterns = [(name, re.compile(pattern, re.I))
+                                for name, pattern in (expect.get('headers') or {}).items()]
+        body = expect.get('body') or []
+        self.body_patterns = [re.compile(pattern) for pattern in (body if isinstance(body, list) else [body])]
+        self.json_expect = [(path, compile_path(path), value) for path, value in (expect.get('json') or {}).items()]
+        self.extract = []
+        for variable, source in (raw.get('extract') or {}).items():
+            # "$.path" reads the JSON body, anything else is a regex whose first group is taken
+            self.extract.append((variable, source, compile_path(source) if source.startswith("$")
+                                 else re.compile(source)))
+        self.max_ms = float(expect['max_ms']) if expect.get('max_ms') else None
+        self.needs_json = bool(self.json_expect) or any(isinstance(p, tuple) for _v, _s, p in self.extract)
+        self.needs_text = bool(self.body_patterns) or any(not isinstance(p, tuple) for _v, _s, p in self.extract)
+
+
+def parse_check(raw: Dict) -> Dict:
+    """A probe-engine site entry for a 'synthetic_checks' config item"""
+    name = str(raw.get('name') or "").strip()
+    if not name:
+        raise ValueError("synthetic check needs a name")
+    steps = raw.get('steps')
+    if not isinstance(steps, list) or not steps:
+        raise ValueError(f"{name}: needs a list of steps")
+    check = {
+        'name': name,
+        'url': PREFIX + name,
+        'group': raw.get('group') or PREFIX + name,
+        'steps': [Step(step, index) for index, step in enumerate(steps)],
+        'variables': {str(k): str(v) for k, v in (raw.get('variables') or {}).items()},
+        'max_ms': float(raw['max_ms']) if raw.get('max_ms') else None,
+        'status': 'Unknown',
+    }
+    for key in ('interval', 'timeout'):
+        if raw.get(key):
+            check[key] = float(raw[key])
+    return check
+
+
+def load_checks(raws: Iterable[Dict]) -> List[Dict]:
+    """Parse every check, skipping (and reporting) invalid ones and duplicate names"""
+    checks = []
+    seen = set()
+    for raw in raws:
+        try:
+            check = parse_check(raw)
+        except (ValueError, TypeError, re.error) as e:
+            print(f"Synthetic check error: {e}")
+            continue
+        if check['name'] in seen:
+            print(f"Synthetic check error: duplicate name {check['name']}")
+            continue
+        seen.add(check['name'])
+        checks.append(check)
+    return checks
+
+
+# === EXECUTION ===
+
+class CheckResult(NamedTuple):
+    ok: bool
+    step: str                           # failing step ("" when ok)
+    message: str
+    total_ms: float
+    steps: List[Tuple[str, float]]      # (step name, elapsed ms) for the steps that ran
+
+
+class _StepFailure(Exception):
+    pass
+
+
+def _preview(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_BODY_PREVIEW else text[:MAX_BODY_PREVIEW] + "..."
+
+
+def _run_step(step: Step, session, timeout: float, variables: Dict[str, str]) -> float:
+    kwargs = {'timeout': timeout, 'allow_redirects': True}
+    if step.headers:
+        kwargs['headers'] = _render(step.headers, variables)
+    if step.json is not None:
+        kwargs['json'] = _render(step.json, variables)
+    elif step.data is not None:
+        kwargs['data'] = _render(step.data, variables)
+    start = time.perf_counter()
+    response = session.request(step.method, _render(step.url, variables), **kwargs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if step.statuses is not None:
+        if response.status_code not in step.statuses:
+            raise _StepFailure(f"status {response.status_code}, expected {sorted(step.statuses)}")
+    elif response.status_code >= 400:
+        raise _StepFailure(f"status {response.status_code}")
+    for name, pattern in step.header_patterns:
+        value = response.headers.get(name)
+        if value is None or not pattern.search(value):
+            raise _StepFailure(f"header {name}: {value!r} does not match {pattern.pattern!r}")
+    text = response.text if step.needs_text else ""
+    for pattern in step.body_patterns:
+        match = pattern.search(text)
+        if match is None:
+            raise _StepFailure(f"body does not match {pattern.pattern!r}: {_preview(text)!r}")
+        variables.update({k: v for k, v in match.groupdict().items() if v is not None})
+    document = None
+    if step.needs_json:
+        try:
+            document = response.json()
+        except ValueError:
+            raise _StepFailure(f"body is not JSON: {_preview(response.text)!r}")
+    for path, keys, expected in step.json_expect:
+        value = lookup(document, keys)
+        if value is MISSING:
+            raise _StepFailure(f"{path} missing")
+        if value != expected:
+            raise _StepFailure(f"{path} is {value!r}, expected {expected!r}")
+    for variable, source, pattern in step.extract:
+        if isinstance(pattern, tuple):
+            value = lookup(document, pattern)
+            if value is MISSING:
+                raise _StepFailure(f"cannot extract {variable}: {source} missing")
+        else:
+            match = pattern.search(text)
+            if match is None:
+                raise _StepFailure(f"cannot extract {variable}: no match for {source!r}")
+            value = match.group(1) if pattern.groups else match.group(0)
+        if not isinstance(value, str):
+            import json
+            value = json.dumps(value)
+        variables[variable] = value
+    if step.max_ms is not None and elapsed_ms > step.max_ms:
+        raise _StepFailure(f"took {elapsed_ms:.0f} ms, budget {step.max_ms:.0f} ms")
+    return elapsed_ms
+
+
+def _run_session(session):
+    """A session with its own empty cookie jar that shares session's adapters (and so its pools)
+
+    Each run starts logged out, so a broken login step cannot pass on a cookie
+    left by the previous run or by another check in the same group.
+    """
+    run = type(session)()
+    run.adapters = session.adapters
+    run.headers = session.headers
+    run.verify = session.verify
+    run.proxies = session.proxies
+    return run
+
+
+def run_check(check: Dict, session, timeout: float) -> CheckResult:
+    """Run a check's steps in order on the group's connections (keep-alive carries across steps and runs)"""
+    session = _run_session(session)
+    variables = dict(check['variables'])
+    timings: List[Tuple[str, float]] = []
+    started = time.perf_counter()
+    for step in check['steps']:
+        try:
+            timings.append((step.name, _run_step(step, session, timeout, variables)))
+        except _StepFailure as e:
+            return CheckResult(False, step.name, str(e), (time.perf_counter() - started) * 1000, timings)
+        except Exception as e:      # connection errors, timeouts, bad URLs after substitution
+            return CheckResult(False, step.name, f"{type(e).__name__}: {e}",
+                               (time.perf_counter() - started) * 1000, timings)
+    total_ms = (time.perf_counter() - started) * 1000
+    if check['max_ms'] is not None and total_ms > check['max_ms']:
+        return CheckResult(False, "", f"took {total_ms:.0f} ms, budget {check['max_ms']:.0f} ms",
+                           total_ms, timings)
+    return CheckResult(True, "", "", total_ms, timings)
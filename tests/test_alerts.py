@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Alert Pipeline Tests
+State machine on explicit clocks, and webhook delivery against the local stub server
+"""
+
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import alerts  # noqa: E402
+import threats  # noqa: E402
+from stub_servers import StubHTTPServer  # noqa: E402
+
+T0 = 1_000_000.0
+
+
+class CollectingSink:
+    """Stands in for a Sink: keeps every batch the pipeline submits"""
+
+    def __init__(self):
+        self.batches = []
+
+    def submit(self, batch):
+        self.batches.append(batch)
+
+    def stop(self):
+        pass
+
+    def notifications(self):
+        return [(n['fingerprint'], n['status']) for batch in self.batches for n in batch['alerts']]
+
+
+def event(key="k", source="test", severity="HIGH"):
+    return threats.ThreatEvent(key, source, severity, f"{key} title", "detail")
+
+
+def pipeline(**settings):
+    sink = CollectingSink()
+    options = dict(pending_seconds=10, clear_seconds=30, group_seconds=0, flap_transitions=6)
+    options.update(settings)
+    return alerts.AlertPipeline([sink], **options), sink
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_repeated_reports_notify_once(self):
+        p, sink = pipeline()
+        for offset in range(5):
+            p.observe(event(), T0 + offset)
+            p.tick(T0 + offset)
+        p.tick(T0 + 12)
+        p.tick(T0 + 13)
+        self.assertEqual(sink.notifications(), [("k", alerts.FIRING)])
+        self.assertEqual(sink.batches[0]['alerts'][0]['count'], 5)
+
+    def test_pending_delay(self):
+        p, sink = pipeline()
+        p.observe(event(), T0)
+        p.tick(T0 + 9)
+        self.assertEqual(sink.notifications(), [])
+        p.tick(T0 + 10)
+        self.assertEqual(sink.notifications(), [("k", alerts.FIRING)])
+
+    def test_cleared_while_pending_never_notifies(self):
+        p, sink = pipeline()
+        p.observe(event(), T0)
+        p.clear("k", T0 + 5)
+        for offset in (10, 40, 100):
+            p.tick(T0 + offset)
+        self.assertEqual(sink.notifications(), [])
+
+    def test_clear_delay(self):
+        p, sink = pipeline()
+        p.observe(event(), T0)
+        p.tick(T0 + 10)
+        p.clear("k", T0 + 20)
+        p.tick(T0 + 49)
+        self.assertEqual(sink.notifications(), [("k", alerts.FIRING)])
+        # Back before the clear delay ran out: nothing is sent either way
+        p.observe(event(), T0 + 45)
+        p.tick(T0 + 80)
+        self.assertEqual(sink.notifications(), [("k", alerts.FIRING)])
+        p.clear("k", T0 + 90)
+        p.tick(T0 + 119)
+        self.assertEqual(len(sink.notifications()), 1)
+        p.tick(T0 + 120)
+        self.assertEqual(sink.notifications(), [("k", alerts.FIRING), ("k", alerts.RESOLVED)])
+
+    def test_flapping_is_suppressed_with_hysteresis(self):
+        p, sink = pipeline(flap_transitions=4, pending_seconds=0, clear_seconds=0)
+        p.observe(event(), T0)
+        p.tick(T0)
+        # Four state changes at T0 + 1..4 (no delays, so each notifies): flapping from the fourth
+        for offset in range(1, 5):
+            if offset % 2:
+                p.clear("k", T0 + offset)
+            else:
+                p.observe(event(), T0 + offset)
+            p.tick(T0 + offset)
+        flapped = [("k", alerts.FIRING), ("k", alerts.RESOLVED)] * 2 + [("k", "flapping")]
+        self.assertEqual(sink.notifications(), flapped)
+        # Changes while flapping are held back
+        p.clear("k", T0 + 5)
+        p.tick(T0 + 5)
+        p.observe(event(), T0 + 6)
+        p.tick(T0 + 6)
+        self.assertEqual(p.suppressed, 2)
+        self.assertEqual(sink.notifications(), flapped)
+        # Four of the six have aged out: below the entry threshold, but held by hysteresis
+        p.tick(T0 + alerts.FLAP_WINDOW + 4.5)
+        self.assertTrue(p.alerts["k"].flapping)
+        self.assertEqual(sink.notifications(), flapped)
+        # Below half the threshold it settles, and says how (firing again since T0 + 6)
+        p.tick(T0 + alerts.FLAP_WINDOW + 5.5)
+        self.assertFalse(p.alerts["k"].flapping)
+        self.assertEqual(sink.notifications()[-1], ("k", alerts.FIRING))
+
+    def test_grouping_by_source(self):
+        p, sink = pipeline(group_seconds=10, pending_seconds=0)
+        p.observe(event("a", "net"), T0)
+        p.observe(event("b", "net"), T0)
+        p.observe(event("c", "tls"), T0)
+        p.tick(T0)
+        p.tick(T0 + 9)
+        self.assertEqual(sink.batches, [])
+        p.tick(T0 + 10)
+        groups = {batch['group']: sorted(n['fingerprint'] for n in batch['alerts']) for batch in sink.batches}
+        self.assertEqual(groups, {"net": ["a", "b"], "tls": ["c"]})
+        self.assertEqual(p.alert_count, 3)
+
+
+class WebhookSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.http = StubHTTPServer().start()
+
+    def tearDown(self):
+        self.http.stop()
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_retries_until_delivered(self):
+        with mock.patch.object(alerts, "RETRY_BASE", 0.01):
+            sink = alerts.WebhookSink(self.http.webhook_url(fail_first=2))
+            try:
+                sink.submit({'group': "test", 'alerts': [], 'sent_at': T0})
+                self.assertTrue(self.wait_for(lambda: sink.sent == 1))
+            finally:
+                sink.stop()
+        self.assertEqual(sink.retries, 2)
+        self.assertEqual(sink.failed, 0)
+        self.assertEqual([json.loads(body)['group'] for body in self.http.webhook_posts], ["test"])
+
+    def test_gives_up_after_max_attempts(self):
+        with mock.patch.object(alerts, "RETRY_BASE", 0.01):
+            sink = alerts.WebhookSink(self.http.webhook_url(status=503))
+            try:
+                sink.submit({'group': "test", 'alerts': [], 'sent_at': T0})
+                self.assertTrue(self.wait_for(lambda: sink.failed == 1))
+            finally:
+                sink.stop()
+        self.assertEqual(sink.retries, alerts.MAX_ATTEMPTS - 1)
+        self.assertIn("503", sink.last_error)
+
+    def test_backlog_drops_oldest(self):
+        with mock.patch.object(alerts, "SINK_QUEUE", 3):
+            sink = alerts.WebhookSink(self.http.webhook_url(delay=0.3))
+            try:
+                sink.submit({'group': "0", 'alerts': [], 'sent_at': T0})
+                self.assertTrue(self.wait_for(lambda: sink.backlog == 0))     # batch 0 is in flight
+                for index in range(1, 7):
+                    sink.submit({'group': str(index), 'alerts': [], 'sent_at': T0})
+                self.assertEqual(sink.dropped, 3)
+                self.assertTrue(self.wait_for(lambda: sink.sent == 4))
+            finally:
+                sink.stop()
+        self.assertEqual([json.loads(body)['group'] for body in self.http.webhook_posts], ["0", "4", "5", "6"])
+
+
+if __name__ == "__main__":
+    unittest.main()
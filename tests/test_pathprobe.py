@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Path Probe Tests
+Tracing, path diffs and PathMonitor scheduling against the simulated transport
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pathprobe  # noqa: E402
+
+T0 = 1_000_000.0
+HOST = "192.0.2.10"
+PATH = ["10.0.0.1", None, "198.51.100.1"]
+
+
+def simulated(**paths):
+    return pathprobe.SimulatedTransport(dict({HOST: list(PATH)}, **paths))
+
+
+def degrade(monitor, host, baseline_ms=20.0, slow_ms=200.0):
+    for _ in range(pathprobe.MIN_SAMPLES):
+        monitor.note_latency(host, baseline_ms)
+    for _ in range(pathprobe.DEGRADE_SAMPLES):
+        monitor.note_latency(host, slow_ms)
+
+
+class TraceTest(unittest.TestCase):
+
+    def test_trace_assembles_path(self):
+        snapshot = pathprobe.trace(simulated(), HOST)
+        self.assertTrue(snapshot.reached)
+        self.assertEqual(snapshot.hops, PATH + [HOST])
+        self.assertIsNone(snapshot.rtts[1])
+        for got, want in zip(snapshot.rtts, [0.005, None, 0.015, 0.020]):
+            if want is not None:
+                self.assertAlmostEqual(got, want)
+        self.assertEqual(snapshot.format(), f"10.0.0.1 > * > 198.51.100.1 > {HOST}")
+
+    def test_trace_stops_at_max_hops(self):
+        transport = simulated()
+        snapshot = pathprobe.trace(transport, HOST, max_hops=2)
+        self.assertFalse(snapshot.reached)
+        self.assertEqual(snapshot.hops, ["10.0.0.1"])     # the silent second hop adds nothing
+        self.assertEqual(transport.probes_sent, 2)
+
+    def test_diff_paths(self):
+        transport = simulated()
+        old = pathprobe.trace(transport, HOST)
+        transport.paths[HOST] = ["10.0.0.1", "10.9.9.9", "203.0.113.1"]
+        self.assertEqual(pathprobe.diff_paths(old, pathprobe.trace(transport, HOST)), [3])
+        transport.paths[HOST] = PATH + ["203.0.113.1"]
+        self.assertEqual(pathprobe.diff_paths(old, pathprobe.trace(transport, HOST)), [4, 5])
+        self.assertEqual(pathprobe.diff_paths(old, old), [])
+
+
+class MonitorTest(unittest.TestCase):
+
+    def test_one_slow_sample_does_not_degrade(self):
+        monitor = pathprobe.PathMonitor(simulated(), baseline=False)
+        for _ in range(pathprobe.MIN_SAMPLES):
+            monitor.note_latency(HOST, 20.0)
+        for _ in range(pathprobe.DEGRADE_SAMPLES - 1):
+            monitor.note_latency(HOST, 200.0)
+        monitor.note_latency(HOST, 20.0)     # a normal sample breaks the streak
+        for _ in range(pathprobe.DEGRADE_SAMPLES - 1):
+            monitor.note_latency(HOST, 200.0)
+        self.assertFalse(monitor.hosts[HOST].degraded)
+        self.assertEqual(monitor.due(T0), [])
+        monitor.note_latency(HOST, 200.0)
+        self.assertTrue(monitor.hosts[HOST].degraded)
+        self.assertEqual(monitor.due(T0), [(HOST, False)])
+        self.assertAlmostEqual(monitor.hosts[HOST].baseline_ms, 20.0)   # slow samples stay out
+
+    def test_degraded_host_backs_off(self):
+        monitor = pathprobe.PathMonitor(simulated(), baseline=False)
+        degrade(monitor, HOST)
+        state = monitor.hosts[HOST]
+        now = T0
+        interval = pathprobe.MIN_INTERVAL
+        while interval < pathprobe.MAX_INTERVAL:
+            monitor.run_due(now)
+            self.assertEqual(state.next_allowed, now + interval)
+            self.assertEqual(monitor.due(now + interval - 1), [])
+            now += interval
+            interval *= 2
+        monitor.run_due(now)
+        self.assertEqual(state.backoff, pathprobe.MAX_INTERVAL)
+        # Recovery resets the schedule
+        monitor.note_latency(HOST, 20.0)
+        self.assertFalse(state.degraded)
+        self.assertEqual((state.backoff, state.next_allowed), (pathprobe.MIN_INTERVAL, 0.0))
+
+    def test_token_bucket_limits_traces(self):
+        hosts = [f"192.0.2.{n}" for n in range(1, 6)]
+        monitor = pathprobe.PathMonitor(simulated(**{h: list(PATH) for h in hosts}),
+                                        rate=0.1, burst=3, baseline=False)
+        for host in hosts:
+            degrade(monitor, host)
+        monitor.run_due(T0)
+        self.assertEqual(monitor.runs, 3)
+        monitor.run_due(T0 + 5)
+        self.assertEqual(monitor.runs, 3)
+        monitor.run_due(T0 + 10)       # one token back after 1 / rate seconds
+        self.assertEqual(monitor.runs, 4)
+        monitor.run_due(T0 + 10)
+        self.assertEqual(monitor.runs, 4)
+
+    def test_baseline_captures_leave_budget_for_degraded_hosts(self):
+        hosts = [f"192.0.2.{n}" for n in range(1, 4)]
+        monitor = pathprobe.PathMonitor(simulated(**{h: list(PATH) for h in hosts}), rate=0.1, burst=3)
+        for host in hosts:
+            monitor.note_latency(host, 20.0)
+        monitor.run_due(T0)
+        self.assertEqual(monitor.runs, 1)       # needs a full bucket, so only the first
+        degrade(monitor, HOST)
+        monitor.run_due(T0)
+        self.assertEqual(monitor.runs, 2)
+        self.assertIsNotNone(monitor.hosts[HOST].path)
+
+    def test_route_change_and_latency_shift(self):
+        transport = simulated()
+        monitor = pathprobe.PathMonitor(transport)
+        self.assertTrue(monitor.run(HOST, T0).first)
+        report = monitor.run(HOST, T0 + 1)
+        self.assertEqual((report.changed_hops, report.latency_shifts), ([], []))
+
+        transport.extra_ms = {"198.51.100.1": 40.0}
+        report = monitor.run(HOST, T0 + 2)
+        self.assertEqual([(ttl, hop) for ttl, hop, _, _ in report.latency_shifts],
+                         [(3, "198.51.100.1"), (4, HOST)])
+        self.assertAlmostEqual(report.latency_shifts[0][2], 15.0)
+        self.assertAlmostEqual(report.latency_shifts[0][3], 55.0)
+
+        transport.paths[HOST] = ["10.0.0.1", None, "203.0.113.1"]
+        report = monitor.run(HOST, T0 + 3)
+        self.assertEqual(report.changed_hops, [3])
+        self.assertNotIn((3, "198.51.100.1"), monitor.hosts[HOST].hop_baseline)
+
+    def test_longer_path_is_retraced_in_full(self):
+        transport = simulated()
+        monitor = pathprobe.PathMonitor(transport)
+        monitor.run(HOST, T0)
+        transport.paths[HOST] = PATH + [f"203.0.113.{n}" for n in range(1, 6)]
+        sent = transport.probes_sent
+        report = monitor.run(HOST, T0 + 1)
+        self.assertTrue(report.path.reached)
+        self.assertEqual(len(report.path.hops), 9)
+        self.assertEqual(transport.probes_sent - sent, 4 + pathprobe.HOP_MARGIN + pathprobe.MAX_HOPS)
+
+
+if __name__ == "__main__":
+    unittest.main()
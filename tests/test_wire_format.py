@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Wire Format Tests
+Round trips across every delta-of-delta bucket boundary
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wire_format  # noqa: E402
+
+# Both edges of every prefix bucket, and one step past each
+BOUNDARIES = (0, 1, -1, 63, 64, -64, -65, 255, 256, -256, -257, 2047, 2048, -2048, -2049, 10 ** 9, -10 ** 6)
+
+
+def timestamps_with_dod(dod: int):
+    """Four samples whose second delta-of-delta is dod"""
+    return [0, 1000, 2000 + dod, 3000 + dod]
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def test_dod_boundaries(self):
+        for dod in BOUNDARIES:
+            timestamps = timestamps_with_dod(dod)
+            frame = wire_format.encode_series(timestamps, [1.0] * len(timestamps))
+            decoded, _values = wire_format.decode_series(frame)
+            self.assertEqual(decoded, timestamps, f"dod {dod}")
+
+    def test_mixed_series(self):
+        timestamps = [1_700_000_000_000]
+        for dod in BOUNDARIES * 3:
+            timestamps.append(timestamps[-1] + 2000 + dod)
+        values = [i * 0.1 for i in range(len(timestamps))]
+        decoded_ts, decoded_values = wire_format.decode_series(wire_format.encode_series(timestamps, values))
+        self.assertEqual(decoded_ts, timestamps)
+        self.assertEqual(decoded_values, [round(v, 1) for v in values])
+
+    def test_legacy_frames(self):
+        # Version 1 stored +64/+256/+2048 as the top pattern of the smaller bucket
+        for dod, nbits, prefix in ((64, 7, 0b10), (256, 9, 0b110), (2048, 12, 0b1110)):
+            frame = self._legacy_frame(dod, nbits, prefix)
+            decoded, _values = wire_format.decode_series(frame)
+            self.assertEqual(decoded, timestamps_with_dod(dod)[:3], f"dod {dod}")
+
+    @staticmethod
+    def _legacy_frame(dod: int, nbits: int, prefix: int) -> bytes:
+        """[0, 1000, 2000 + dod] as version 1 wrote it"""
+        bits = wire_format.BitWriter()
+        bits.write(0, 64)
+        bits.write(wire_format._float_bits(0.0), 64)
+        bits.write(0b1111, 4)                   # first delta (1000) needs the 64-bit bucket
+        bits.write(1000, 64)
+        bits.write(0, 1)
+        bits.write(prefix, len(bin(prefix)) - 2)
+        bits.write(dod, nbits)
+        bits.write(0, 1)
+        payload = bits.getvalue()
+        out = bytearray(wire_format._HEADER.pack(wire_format.MAGIC, wire_format.LEGACY_VERSION,
+                                                 wire_format.DEFAULT_PRECISION))
+        wire_format.encode_varint(3, out)
+        wire_format.encode_varint(len(payload), out)
+        return bytes(out + payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Threat Log
+Shared event store that detectors report into and the threat view reads from
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+SEVERITY_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+SEVERITY_COLORS = {
+    'LOW': "#27ae60",
+    'MEDIUM': "#f39c12",
+    'HIGH': "#e67e22",
+    'CRITICAL': "#e74c3c",
+}
+ACTIVE_WINDOW = 3600    # events older than this no longer raise the threat level
+
+
+def severity_rank(severity: str) -> int:
+    return SEVERITY_LEVELS.index(severity) if severity in SEVERITY_LEVELS else 0
+
+
+class ThreatEvent:
+    """One detected condition; repeated reports with the same key update it"""
+
+    __slots__ = ("key", "source", "severity", "title", "detail", "first_seen", "last_seen", "count")
+
+    def __init__(self, key, source, severity, title, detail=""):
+        self.key = key
+        self.source = source
+        self.severity = severity
+        self.title = title
+        self.detail = detail
+        self.first_seen = self.last_seen = time.time()
+        self.count = 1
+
+
+class ThreatLog:
+    """Bounded, key-deduplicated event log with a derived threat level"""
+
+    def __init__(self, maxlen: int = 500, on_new: Optional[Callable[[ThreatEvent], None]] = None,
+                 on_report: Optional[Callable[[ThreatEvent], None]] = None,
+                 on_resolve: Optional[Callable[[str], None]] = None):
+        self.maxlen = maxlen
+        self.on_new = on_new
+        self.on_report = on_report
+        self.on_resolve = on_resolve
+        self._events: "OrderedDict[str, ThreatEvent]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def report(self, source: str, severity: str, title: str, detail: str = "",
+               key: Optional[str] = None) -> ThreatEvent:
+        """Record an event; on_new fires only for keys not already active"""
+        key = key or f"{source}:{title}"
+        with self._lock:
+            event = self._events.get(key)
+            is_new = event is None or time.time() - event.last_seen > ACTIVE_WINDOW
+            if is_new:
+                event = ThreatEvent(key, source, severity, title, detail)
+                self._events[key] = event
+            else:
+                event.last_seen = time.time()
+                event.count += 1
+                event.detail = detail or event.detail
+                event.title = title
+                if severity_rank(severity) > severity_rank(event.severity):
+                    event.severity = severity
+            self._events.move_to_end(key)
+            while len(self._events) > self.maxlen:
+                self._events.popitem(last=False)
+        if is_new and self.on_new is not None:
+            self.on_new(event)
+        if self.on_report is not None:
+            self.on_report(event)
+        return event
+
+    def resolve(self, key: str) -> bool:
+        """Drop an event whose condition has cleared"""
+        with self._lock:
+            removed = self._events.pop(key, None) is not None
+        if removed and self.on_resolve is not None:
+            self.on_resolve(key)
+        return removed
+
+    def recent(self, limit: int = 100) -> List[ThreatEvent]:
+        """Most recently updated events first"""
+        with self._lock:
+            events = list(self._events.values())
+        return events[::-1][:limit]
+
+    def level(self) -> str:
+        """Highest severity among events seen within the active window"""
+        cutoff = time.time() - ACTIVE_WINDOW
+        rank = 0
+        with self._lock:
+            for event in self._events.values():
+                if event.last_seen >= cutoff:
+                    rank = max(rank, severity_rank(event.severity))
+        return SEVERITY_LEVELS[rank]
+
+    def __len__(self):
+        return len(self._events)
+
+    def format_table(self, limit: int = 100) -> str:
+        """Plain-text event list for the threat view"""
+        events = self.recent(limit)
+        if not events:
+            return "No threats detected."
+        lines = [f"{'Last Seen':<10}{'Severity':<10}{'Source':<12}{'Count':>6}  Event"]
+        for event in events:
+            seen = time.strftime("%H:%M:%S", time.localtime(event.last_seen))
+            lines.append(f"{seen:<10}{event.severity:<10}{event.source[:11]:<12}{event.count:>6}  {event.title}")
+            if event.detail:
+                lines.append(f"{'':<38}{event.detail}")
+        return "\n".join(lines)
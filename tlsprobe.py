@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - TLS Probe
+Handshake timing with session resumption and cached certificate details
+"""
+
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+EXPIRY_WARNING_DAYS = 21
+EXPIRY_CRITICAL_DAYS = 7
+CERT_REFRESH_SECONDS = 6 * 3600     # re-read the chain on a full handshake at most this often
+X509_V_ERR_CERT_HAS_EXPIRED = 10
+DEFAULT_TIMEOUT = 5.0
+
+Target = Tuple[str, int]
+
+
+def _name_field(name, field: str = "commonName") -> str:
+    for rdn in name or ():
+        for key, value in rdn:
+            if key == field:
+                return value
+    return ""
+
+
+class CertInfo:
+    """Certificate and connection parameters captured on a full handshake"""
+
+    __slots__ = ("subject", "issuer", "not_after", "sans", "chain", "protocol", "cipher",
+                 "verified", "verify_code", "error", "fetched_at")
+
+    def __init__(self):
+        self.subject = ""
+        self.issuer = ""
+        self.not_after = 0.0
+        self.sans: List[str] = []
+        self.chain: List[str] = []
+        self.protocol = ""
+        self.cipher = ""
+        self.verified = True
+        self.verify_code = 0            # OpenSSL X509_V_ERR_* when verification failed
+        self.error = ""
+        self.fetched_at = time.time()
+
+    @property
+    def expired(self) -> bool:
+        return self.verify_code == X509_V_ERR_CERT_HAS_EXPIRED
+
+    @property
+    def days_left(self) -> float:
+        return (self.not_after - time.time()) / 86400 if self.not_after else float("inf")
+
+
+class TLSResult:
+    """Outcome of one probe"""
+
+    __slots__ = ("host", "port", "connect_seconds", "handshake_seconds", "resumed", "cert", "error")
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.connect_seconds = 0.0
+        self.handshake_seconds = 0.0
+        self.resumed = False
+        self.cert: Optional[CertInfo] = None
+        self.error = ""
+
+
+class TLSProbe:
+    """Probes HTTPS endpoints, resuming cached sessions to keep handshakes cheap"""
+
+    def __init__(self, recorder=None, timeout: float = DEFAULT_TIMEOUT):
+        self.recorder = recorder
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        self.sessions: Dict[Target, ssl.SSLSession] = {}
+        self.certs: Dict[Target, CertInfo] = {}
+        self.full_handshakes = 0
+        self.resumed_handshakes = 0
+        self._lock = threading.Lock()
+
+    def probe(self, host: str, port: int = 443) -> TLSResult:
+        """Connect, handshake (resuming if possible) and refresh certificate data"""
+        target = (host, port)
+        result = TLSResult(host, port)
+        session = self.sessions.get(target)
+        start = time.perf_counter()
+        try:
+            with socket.create_connection(target, timeout=self.timeout) as raw:
+                connected = time.perf_counter()
+                result.connect_seconds = connected - start
+                with self.context.wrap_socket(raw, server_hostname=host, session=session) as tls:
+                    result.handshake_seconds = time.perf_counter() - connected
+                    result.resumed = tls.session_reused
+
+                    cached = self.certs.get(target)
+                    if (not result.resumed or cached is None
+                            or time.time() - cached.fetched_at > CERT_REFRESH_SECONDS):
+                        cached = self._capture(tls)
+                    result.cert = cached
+
+                    # TLS 1.3 tickets arrive after the handshake; a tiny request collects them
+                    self._collect_ticket(tls, host)
+                    if tls.session is not None:
+                        self.sessions[target] = tls.session
+        except ssl.SSLCertVerificationError as e:
+            result.error = e.verify_message or str(e)
+            cert = CertInfo()
+            cert.verified = False
+            cert.verify_code = e.verify_code or 0
+            cert.error = result.error
+            result.cert = cert
+            self.sessions.pop(target, None)
+        except (OSError, ssl.SSLError) as e:
+            result.error = str(e)
+            self.sessions.pop(target, None)
+
+        if result.cert is not None:
+            with self._lock:
+                self.certs[target] = result.cert
+                if not result.error:
+                    if result.resumed:
+                        self.resumed_handshakes += 1
+                    else:
+                        self.full_handshakes += 1
+        if self.recorder is not None and not result.error:
+            self.recorder.record('tls_handshake', host, result.handshake_seconds)
+        return result
+
+    def _capture(self, tls: ssl.SSLSocket) -> CertInfo:
+        info = CertInfo()
+        cert = tls.getpeercert() or {}
+        info.subject = _name_field(cert.get('subject'))
+        info.issuer = _name_field(cert.get('issuer')) or _name_field(cert.get('issuer'), "organizationName")
+        if cert.get('notAfter'):
+            info.not_after = ssl.cert_time_to_seconds(cert['notAfter'])
+        info.sans = [value for kind, value in cert.get('subjectAltName', ()) if kind == "DNS"]
+        info.protocol = tls.version() or ""
+        cipher = tls.cipher()
+        info.cipher = cipher[0] if cipher else ""
+
+        # The public SSLSocket.get_verified_chain (3.13+) returns DER bytes; the underlying
+        # _ssl object has had it since 3.10 and returns certificates that decode themselves
+        try:
+            info.chain = [_name_field(c.get_info().get('subject')) for c in tls._sslobj.get_verified_chain()]
+        except (ssl.SSLError, AttributeError, ValueError):
+            info.chain = []
+        if not info.chain:
+            info.chain = [info.subject, info.issuer]
+        return info
+
+    def _collect_ticket(self, tls: ssl.SSLSocket, host: str):
+        if tls.version() != "TLSv1.3":
+            return
+        try:
+            tls.settimeout(min(self.timeout, 1.0))
+            tls.sendall(f"HEAD / HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("ascii"))
+            tls.recv(1024)
+        except (OSError, ssl.SSLError):
+            pass
+
+    def probe_many(self, targets: List[Target], workers: int = 16) -> List[TLSResult]:
+        """Probe many endpoints concurrently"""
+        if not targets:
+            return []
+        with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+            return list(pool.map(lambda t: self.probe(*t), targets))
+
+    def forget(self, host: str, port: int = 443):
+        """Drop cached state for an endpoint that is no longer monitored"""
+        with self._lock:
+            self.sessions.pop((host, port), None)
+            self.certs.pop((host, port), None)
+
+    def format_table(self) -> str:
+        """Certificate summary for the threat view"""
+        total = self.full_handshakes + self.resumed_handshakes
+        lines = [
+            f"TLS handshakes: {total} ({self.resumed_handshakes} resumed, "
+            f"{self.resumed_handshakes / total * 100 if total else 0:.0f}%)",
+            f"{'Host':<28}{'Expires In':>11}  {'Protocol':<9}{'Cipher':<32}Issuer",
+        ]
+        with self._lock:
+            items = sorted(self.certs.items(), key=lambda item: item[1].days_left)
+        for (host, port), cert in items:
+            name = host if port == 443 else f"{host}:{port}"
+            if not cert.verified:
+                state = "EXPIRED" if cert.expired else "INVALID"
+                lines.append(f"{name[:27]:<28}{state:>11}  {cert.error}")
+                continue
+            lines.append(f"{name[:27]:<28}{cert.days_left:>9.0f} d  {cert.protocol:<9}"
+                         f"{cert.cipher[:31]:<32}{cert.issuer}")
+        return "\n".join(lines)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+SecureNet Monitor Pro - Compact Sample Wire Format
+Delta-of-delta timestamps, Gorilla-style XOR floats and varint counters
+"""
+
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"SN"
+VERSION = 2
+LEGACY_VERSION = 1          # wrote +64/+256/+2048 delta-of-deltas as the top bucket pattern
+RAW_PRECISION = 0xFF        # values stored as raw IEEE-754 doubles
+DEFAULT_PRECISION = 1       # CPU/memory percentages carry one decimal
+DEFAULT_FRAME_SAMPLES = 720 # one frame per ~24 minutes at a 2s interval
+
+_HEADER = struct.Struct(">2sBB")
+
+
+# === VARINTS ===
+
+def zigzag(value: int) -> int:
+    """Map signed ints onto unsigned ints so small magnitudes stay small"""
+    return (value << 1) if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    """Inverse of zigzag()"""
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def encode_varint(value: int, out: bytearray):
+    """Append an unsigned LEB128 varint to out"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    """Read an unsigned varint from buf at pos, returning (value, new_pos)"""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise ValueError("truncated varint")
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_counters(counters: Dict[str, int]) -> bytes:
+    """Encode a name -> int mapping (e.g. stats) as zigzag varints"""
+    out = bytearray()
+    items = [(k, v) for k, v in counters.items() if isinstance(v, int) and not isinstance(v, bool)]
+    encode_varint(len(items), out)
+    for name, value in items:
+        raw = name.encode("utf-8")
+        encode_varint(len(raw), out)
+        out += raw
+        encode_varint(zigzag(value), out)
+    return bytes(out)
+
+
+def decode_counters(buf) -> Dict[str, int]:
+    """Decode the output of encode_counters()"""
+    mv = memoryview(buf)
+    count, pos = decode_varint(mv, 0)
+    counters = {}
+    for _ in range(count):
+        length, pos = decode_varint(mv, pos)
+        name = str(mv[pos:pos + length], "utf-8")
+        pos += length
+        value, pos = decode_varint(mv, pos)
+        counters[name] = unzigzag(value)
+    return counters
+
+
+# === BIT STREAMS ===
+
+class BitWriter:
+    """Append-only MSB-first bit buffer"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int):
+        """Write the low nbits of value"""
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self._nbits -= 8
+            self.buffer.append((self._acc >> self._nbits) & 0xFF)
+        self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self) -> bytes:
+        """Return the written bits, zero-padded to a whole byte"""
+        if self._nbits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._nbits)) & 0xFF])
+        return bytes(self.buffer)
+
+
+class BitReader:
+    """MSB-first bit reader over a memoryview (no copies)"""
+
+    def __init__(self, buf: memoryview):
+        self.buf = buf
+        self.pos = 0
+
+    def read(self, nbits: int) -> int:
+        """Read nbits as an unsigned int"""
+        value = 0
+        buf = self.buf
+        pos = self.pos
+        end = pos + nbits
+        if end > len(buf) * 8:
+            raise ValueError("truncated bit stream")
+        while pos < end:
+            byte = buf[pos >> 3]
+            offset = pos & 7
+            take = min(8 - offset, end - pos)
+            value = (value << take) | ((byte >> (8 - offset - take)) & ((1 << take) - 1))
+            pos += take
+        self.pos = pos
+        return value
+
+    def read_bit(self) -> int:
+        """Read a single bit"""
+        pos = self.pos
+        self.pos = pos + 1
+        return (self.buf[pos >> 3] >> (7 - (pos & 7))) & 1
+
+
+# === FLOAT HELPERS ===
+
+def _float_bits(value: float) -> int:
+    return struct.unpack(">Q", struct.pack(">d", value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return struct.unpack(">d", struct.pack(">Q", bits))[0]
+
+
+def _leading_zeros(value: int) -> int:
+    return 64 - value.bit_length()
+
+
+def _trailing_zeros(value: int) -> int:
+    return (value & -value).bit_length() - 1
+
+
+# === ENCODER ===
+
+class SeriesEncoder:
+    """Streaming encoder for one (timestamp_ms, value) series
+
+    Samples are packed into self-contained frames. With a fixed precision the
+    values are scaled to integers before XOR compression, which keeps the
+    meaningful XOR window to a handful of bits for percentage-style series.
+    """
+
+    def __init__(self, precision: Optional[int] = DEFAULT_PRECISION,
+                 frame_samples: int = DEFAULT_FRAME_SAMPLES):
+        self.precision = RAW_PRECISION if precision is None else precision
+        self.scale = 1.0 if precision is None else float(10 ** precision)
+        self.frame_samples = frame_samples
+        self._reset()
+
+    def _reset(self):
+        self._bits = BitWriter()
+        self._count = 0
+        self._prev_ts = 0
+        self._prev_delta = 0
+        self._prev_value = 0
+        self._prev_leading = -1
+        self._prev_trailing = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp_ms: int, value: float) -> Optional[bytes]:
+        """Add a sample; returns a finished frame when the frame is full"""
+        if self.precision != RAW_PRECISION:
+            value = float(round(value * self.scale))
+        bits = self._bits
+        vbits = _float_bits(value)
+
+        if self._count == 0:
+            bits.write(timestamp_ms & 0xFFFFFFFFFFFFFFFF, 64)
+            bits.write(vbits, 64)
+        else:
+            self._write_timestamp(timestamp_ms)
+            self._write_value(vbits)
+
+        self._prev_ts = timestamp_ms
+        self._prev_value = vbits
+        self._count += 1
+
+        if self._count >= self.frame_samples:
+            return self.flush()
+        return None
+
+    def _write_timestamp(self, timestamp_ms: int):
+        bits = self._bits
+        delta = timestamp_ms - self._prev_ts
+        dod = delta - self._prev_delta
+        self._prev_delta = delta
+
+        if dod == 0:
+            bits.write(0, 1)
+        elif -64 <= dod <= 63:
+            bits.write(0b10, 2)
+            bits.write(dod, 7)
+        elif -256 <= dod <= 255:
+            bits.write(0b110, 3)
+            bits.write(dod, 9)
+        elif -2048 <= dod <= 2047:
+            bits.write(0b1110, 4)
+            bits.write(dod, 12)
+        else:
+            bits.write(0b1111, 4)
+            bits.write(dod, 64)
+
+    def _write_value(self, vbits: int):
+        bits = self._bits
+        xor = vbits ^ self._prev_value
+        if xor == 0:
+            bits.write(0, 1)
+            return
+
+        bits.write(1, 1)
+        leading = min(_leading_zeros(xor), 31)
+        trailing = _trailing_zeros(xor)
+
+        if self._prev_leading >= 0 and leading >= self._prev_leading and trailing >= self._prev_trailing:
+            # Reuse the previous meaningful-bit window
+            bits.write(0, 1)
+            meaningful = 64 - self._prev_leading - self._prev_trailing
+            bits.write(xor >> self._prev_trailing, meaningful)
+        else:
+            bits.write(1, 1)
+            meaningful = 64 - leading - trailing
+            bits.write(leading, 5)
+            bits.write(meaningful & 0x3F, 6)  # 64 is stored as 0
+            bits.write(xor >> trailing, meaningful)
+            self._prev_leading = leading
+            self._prev_trailing = trailing
+
+    def flush(self) -> bytes:
+        """Close the current frame and return it (empty bytes if no samples)"""
+        if self._count == 0:
+            return b""
+        payload = self._bits.getvalue()
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.precision))
+        encode_varint(self._count, out)
+        encode_varint(len(payload), out)
+        out += payload
+        self._reset()
+        return bytes(out)
+
+
+def encode_series(timestamps, values, precision: Optional[int] = DEFAULT_PRECISION) -> bytes:
+    """Encode parallel timestamp/value sequences into concatenated frames"""
+    encoder = SeriesEncoder(precision)
+    chunks = []
+    for ts, value in zip(timestamps, values):
+        frame = encoder.append(int(ts), value)
+        if frame:
+            chunks.append(frame)
+    chunks.append(encoder.flush())
+    return b"".join(chunks)
+
+
+# === DECODER ===
+
+def read_frame_header(buf: memoryview, pos: int = 0) -> Tuple[int, int, int, int]:
+    """Parse a frame header, returning (precision, count, payload_start, payload_end)"""
+    if len(buf) - pos < _HEADER.size:
+        raise ValueError("truncated frame header")
+    magic, version, precision = _HEADER.unpack_from(buf, pos)
+    if magic != MAGIC or version not in (VERSION, LEGACY_VERSION):
+        raise ValueError("not a SecureNet sample frame")
+    count, pos = decode_varint(buf, pos + _HEADER.size)
+    length, pos = decode_varint(buf, pos)
+    if pos + length > len(buf):
+        raise ValueError("truncated frame payload")
+    return precision, count, pos, pos + length
+
+
+def decode_frame(buf, pos: int = 0) -> Iterator[Tuple[int, float]]:
+    """Yield (timestamp_ms, value) samples from the frame starting at pos"""
+    mv = memoryview(buf)
+    precision, count, start, end = read_frame_header(mv, pos)
+    legacy = mv[pos + 2] == LEGACY_VERSION
+    scale = 1.0 if precision == RAW_PRECISION else float(10 ** precision)
+    reader = BitReader(mv[start:end])
+
+    ts = reader.read(64)
+    if ts & (1 << 63):
+        ts -= 1 << 64
+    vbits = reader.read(64)
+    yield ts, _bits_float(vbits) / scale
+
+    delta = 0
+    leading = 0
+    trailing = 0
+    for _ in range(count - 1):
+        # Timestamp: delta-of-delta prefix code
+        if reader.read_bit() == 0:
+            dod = 0
+        elif reader.read_bit() == 0:
+            dod = _signed(reader.read(7), 7, legacy)
+        elif reader.read_bit() == 0:
+            dod = _signed(reader.read(9), 9, legacy)
+        elif reader.read_bit() == 0:
+            dod = _signed(reader.read(12), 12, legacy)
+        else:
+            dod = _signed(reader.read(64), 64)
+        delta += dod
+        ts += delta
+
+        # Value: XOR against previous
+        if reader.read_bit():
+            if reader.read_bit():
+                leading = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trailing = 64 - leading - meaningful
+            else:
+                meaningful = 64 - leading - trailing
+            vbits ^= reader.read(meaningful) << trailing
+        yield ts, _bits_float(vbits) / scale
+
+
+def _signed(value: int, nbits: int, legacy: bool = False) -> int:
+    if legacy and value == 1 << (nbits - 1):
+        return value            # version 1 never wrote the bucket's minimum, only max + 1
+    if value & (1 << (nbits - 1)):
+        return value - (1 << nbits)
+    return value
+
+
+def iter_frames(buf) -> Iterator[memoryview]:
+    """Split a buffer of concatenated frames into zero-copy frame views"""
+    mv = memoryview(buf)
+    pos = 0
+    while pos < len(mv):
+        _, _, _, end = read_frame_header(mv, pos)
+        yield mv[pos:end]
+        pos = end
+
+
+def decode_series(buf) -> Tuple[List[int], List[float]]:
+    """Decode concatenated frames into (timestamps, values) lists"""
+    timestamps, values = [], []
+    for frame in iter_frames(buf):
+        for ts, value in decode_frame(frame):
+            timestamps.append(ts)
+            values.append(value)
+    return timestamps, values
+
+
+class SeriesDecoder:
+    """Streaming decoder: feed arbitrary byte chunks, get samples back"""
+
+    def __init__(self):
+        self._pending = bytearray()
+
+    def feed(self, data) -> List[Tuple[int, float]]:
+        """Consume data and return every sample from frames now complete"""
+        self._pending += data
+        samples = []
+        consumed = 0
+        with memoryview(self._pending) as mv:
+            while consumed < len(mv):
+                try:
+                    _, _, _, end = read_frame_header(mv, consumed)
+                except ValueError as e:
+                    if str(e).startswith("truncated"):
+                        break
+                    raise
+                samples.extend(decode_frame(mv[consumed:end]))
+                consumed = end
+        del self._pending[:consumed]
+        return samples
+
+    @property
+    def buffered(self) -> int:
+        """Bytes waiting for the rest of their frame"""
+        return len(self._pending)